@@ -0,0 +1,82 @@
+"""Per-application decoding prompts (vocabulary hints for Whisper).
+
+Rules use the same syntax and matcher as the paste guard blocklist
+("=exact", "^prefix", globs, substrings, optional "name:"/"bundle_id:"
+qualifier) and are matched against the same foreground info. The first
+matching rule wins; "*" works as a catch-all default.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .paste_common import app_key, compile_rules, match_rules
+
+PromptRules = Union[Mapping[str, str], Sequence[str], str, None]
+
+
+def parse_app_prompts(value: PromptRules) -> List[Tuple[str, str]]:
+    """Normalize config into ordered (rule, prompt) pairs.
+
+    Accepts a mapping {rule: prompt}, a list of "rule: prompt" strings, or
+    one string of such entries separated by ";" (env form).
+    """
+    if not value:
+        return []
+    if isinstance(value, Mapping):
+        items = [(str(k), str(v)) for k, v in value.items() if v is not None]
+    else:
+        entries = value.split(";") if isinstance(value, str) else list(value)
+        items = []
+        for entry in entries:
+            if isinstance(entry, Mapping):
+                items.extend((str(k), str(v)) for k, v in entry.items())
+                continue
+            # "bundle_id:com.x: prompt" -> the separator is the first ": "
+            rule, sep, prompt = str(entry).partition(": ")
+            if sep:
+                items.append((rule, prompt))
+    out = []
+    for rule, prompt in items:
+        rule, prompt = rule.strip().lower(), prompt.strip()
+        if rule and prompt:
+            out.append((rule, prompt))
+    return out
+
+
+class AppPrompts:
+    """Maps the foreground app to its configured prompt, cached per app."""
+
+    def __init__(self, rules: PromptRules = None, *, cache_size: int = 64) -> None:
+        self.entries = parse_app_prompts(rules)
+        self._compiled = [
+            (compile_rules([rule]), prompt) for rule, prompt in self.entries
+        ]
+        self._cache: "OrderedDict[Tuple[Tuple[str, str], ...], Optional[str]]" = (
+            OrderedDict()
+        )
+        self._cache_size = max(1, int(cache_size))
+
+    @classmethod
+    def from_config(cls, cfg: Any) -> "AppPrompts":
+        return cls(getattr(cfg, "app_prompts", None))
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    def prompt_for(self, fg_info: Optional[Dict[str, str]]) -> Optional[str]:
+        if not self._compiled:
+            return None
+        key = app_key(fg_info)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        hit = None
+        for matchers, prompt in self._compiled:
+            # unknown foreground app: only a catch-all rule applies
+            if match_rules(matchers, key or (("name", ""),)):
+                hit = prompt
+                break
+        self._cache[key] = hit
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return hit
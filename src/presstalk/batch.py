@@ -0,0 +1,113 @@
+"""Headless batch transcription (`presstalk transcribe`).
+
+Each input is streamed through the same path as a live recording: a
+PCMCapture drains the source into `Controller.live_push`, and
+`Controller.release()` runs the engine's finalize (speech gate, long-form
+windows and all). Inputs run on a bounded thread pool sharing one engine,
+and results are yielded as they complete.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from .capture import PCMCapture, PCMSourceProtocol
+from .clock import SYSTEM_CLOCK, elapsed_s
+from .controller import AsrEngineProtocol, Controller
+from .ring_buffer import RingBuffer
+
+Result = Dict[str, Any]
+
+
+def transcribe_source(
+    engine: AsrEngineProtocol,
+    source: PCMSourceProtocol,
+    *,
+    sample_rate: int = 16000,
+    channels: int = 1,
+    language: str = "ja",
+    min_speech_ms: int = 0,
+    chunk_ms: int = 500,
+    timeout_s: float = 0.0,
+) -> Result:
+    """Transcribe one source to the end; `timeout_s` 0 scales with the audio."""
+    bps = sample_rate * channels * 2
+    ctl = Controller(
+        engine,
+        RingBuffer(1),
+        prebuffer_ms=0,
+        min_capture_ms=0,
+        bytes_per_second=bps,
+        language=language,
+        min_speech_ms=min_speech_ms,
+    )
+    pushed = [0]
+
+    def _push(b: bytes) -> None:
+        ctl.live_push(b)
+        pushed[0] += len(b)
+
+    cap = PCMCapture(
+        sample_rate=sample_rate, channels=channels, chunk_ms=chunk_ms, source=source
+    )
+    t0 = SYSTEM_CLOCK.now_ns()
+    ctl.press()
+    cap.start(_push)
+    cap.wait()
+    cap.stop()
+    audio_s = pushed[0] / float(bps)
+    if cap.error is not None and not pushed[0]:
+        ctl.release(skip_decode=True)
+        return {"audio_s": 0.0, "error": str(cap.error)}
+    t1 = SYSTEM_CLOCK.now_ns()
+    text = ctl.release(timeout_s=timeout_s or max(60.0, audio_s * 4.0))
+    t2 = SYSTEM_CLOCK.now_ns()
+    out: Result = {
+        "text": text,
+        "audio_s": round(audio_s, 3),
+        "read_s": elapsed_s(t0, t1),
+        "decode_s": elapsed_s(t1, t2),
+    }
+    if ctl.skip_reason:
+        out["skipped"] = ctl.skip_reason
+    if cap.error is not None:
+        out["error"] = str(cap.error)  # partial input was still transcribed
+    return out
+
+
+def transcribe_files(
+    paths: Sequence[str],
+    *,
+    engine: AsrEngineProtocol,
+    make_source: Callable[[str], PCMSourceProtocol],
+    jobs: int = 1,
+    **opts: Any,
+) -> Iterator[Result]:
+    """Yield one result per path (with "file"), in completion order."""
+
+    def _one(path: str) -> Result:
+        try:
+            res = transcribe_source(engine, make_source(path), **opts)
+        except Exception as e:
+            res = {"error": str(e)}
+        return {"file": path, **res}
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, int(jobs)), thread_name_prefix="pt-batch"
+    ) as pool:
+        futures = [pool.submit(_one, p) for p in paths]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def summarize(results: Sequence[Result], wall_s: Optional[float] = None) -> Result:
+    audio = sum(r.get("audio_s", 0.0) for r in results)
+    out: Result = {
+        "files": len(results),
+        "errors": sum(1 for r in results if r.get("error")),
+        "skipped": sum(1 for r in results if r.get("skipped")),
+        "audio_s": round(audio, 3),
+    }
+    if wall_s:
+        out["wall_s"] = round(wall_s, 3)
+        out["rtf"] = round(wall_s / audio, 4) if audio else None
+    return out
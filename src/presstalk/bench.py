@@ -0,0 +1,295 @@
+"""Micro-benchmarks for PressTalk hot paths (`presstalk bench`).
+
+Each suite returns a list of flat result dicts so they can be printed as
+``key=value`` lines or emitted as JSON lines.
+"""
+
+import json
+import math
+import time
+import wave
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .clock import Stopwatch
+
+Result = Dict[str, Any]
+
+# Common input device formats (rate, channels)
+_DEVICE_FORMATS: Tuple[Tuple[int, int], ...] = (
+    (48000, 2),
+    (48000, 1),
+    (44100, 2),
+    (44100, 1),
+)
+
+
+def _tone_pcm(rate: int, channels: int, seconds: float, freq: float = 440.0) -> bytes:
+    import numpy as np  # type: ignore
+
+    t = np.arange(int(rate * seconds), dtype=np.float64) / rate
+    x = (8000.0 * np.sin(2.0 * math.pi * freq * t)).astype(np.int16)
+    return np.repeat(x, channels).tobytes()
+
+
+def _load_wav_16k(path: str) -> bytes:
+    from .resample import resample_pcm
+
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+        rate, ch = w.getframerate(), w.getnchannels()
+        data = w.readframes(w.getnframes())
+    return resample_pcm(data, in_rate=rate, in_channels=ch)
+
+
+def _speechlike_pcm(seconds: float, rate: int = 16000) -> bytes:
+    """Syllable-rate bursts of harmonic tones; a stand-in when no WAV is given."""
+    import numpy as np  # type: ignore
+
+    t = np.arange(int(rate * seconds), dtype=np.float64) / rate
+    f0 = 140.0 + 40.0 * np.sin(2.0 * math.pi * 0.5 * t)
+    phase = 2.0 * math.pi * np.cumsum(f0) / rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    env = np.clip(np.sin(2.0 * math.pi * 4.0 * t), 0.0, None)
+    return (4000.0 * voice * env).astype(np.int16).tobytes()
+
+
+def bench_decode(
+    *,
+    seconds: float = 10.0,
+    model: str = "small",
+    language: str = "en",
+    profiles: Sequence[str] = (),
+    audio_path: Optional[str] = None,
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+    **_: Any,
+) -> List[Result]:
+    """Real-time factor of each decode profile (wall decode time / audio time)."""
+    from .constants import DECODE_PROFILE_CHOICES
+
+    try:
+        from .engine.fwhisper_backend import FasterWhisperBackend
+
+        backend = FasterWhisperBackend(
+            model=model, cpu_threads=cpu_threads, num_workers=num_workers
+        )
+    except Exception as e:
+        return [{"suite": "decode", "skipped": str(e)}]
+    pcm = _load_wav_16k(audio_path) if audio_path else _speechlike_pcm(seconds)
+    audio_s = len(pcm) / 32000.0
+    if audio_s <= 0:
+        return [{"suite": "decode", "skipped": "empty audio"}]
+    # warm-up: first call pays for allocator/kernel setup
+    backend.transcribe(pcm[:32000], sample_rate=16000, language=language, model=model)
+    out: List[Result] = []
+    for name in profiles or DECODE_PROFILE_CHOICES:
+        backend.set_profile(name)
+        c0 = time.process_time()
+        sw = Stopwatch()
+        text = backend.transcribe(
+            pcm, sample_rate=16000, language=language, model=model
+        )
+        wall = sw.elapsed_s()
+        cpu = time.process_time() - c0
+        out.append(
+            {
+                "suite": "decode",
+                "profile": name,
+                "model": model,
+                "audio_s": round(audio_s, 3),
+                "rtf": round(wall / audio_s, 4),
+                "cpu_ms_per_audio_s": round(cpu * 1000.0 / audio_s, 3),
+                "chars": len(text),
+            }
+        )
+    return out
+
+
+def bench_resample(
+    *,
+    seconds: float = 10.0,
+    chunk_ms: int = 20,
+    formats: Sequence[Tuple[int, int]] = _DEVICE_FORMATS,
+    **_: Any,
+) -> List[Result]:
+    """CPU cost of capture-path downmix+resample to 16 kHz mono, per audio second."""
+    from .resample import ASR_SAMPLE_RATE, PCMResampler
+
+    out: List[Result] = []
+    for rate, ch in formats:
+        pcm = _tone_pcm(rate, ch, seconds)
+        step = max(1, rate * chunk_ms // 1000) * ch * 2
+        rs = PCMResampler(in_rate=rate, in_channels=ch, out_rate=ASR_SAMPLE_RATE)
+        c0 = time.process_time()
+        sw = Stopwatch()
+        produced = 0
+        for i in range(0, len(pcm), step):
+            produced += len(rs.process(pcm[i : i + step]))
+        cpu = time.process_time() - c0
+        wall = sw.elapsed_s()
+        out.append(
+            {
+                "suite": "resample",
+                "input": f"{rate}Hz/{ch}ch",
+                "audio_s": round(seconds, 3),
+                "chunk_ms": chunk_ms,
+                "cpu_ms_per_audio_s": round(cpu * 1000.0 / seconds, 3),
+                "wall_ms_per_audio_s": round(wall * 1000.0 / seconds, 3),
+                "out_bytes": produced,
+            }
+        )
+    return out
+
+
+def bench_levels(
+    *, seconds: float = 10.0, chunk_ms: int = 20, **_: Any
+) -> List[Result]:
+    """CPU cost of the capture-thread level meter (RMS/peak/clipping), per audio second."""
+    from .levels import LevelMeter
+
+    rate = 16000
+    pcm = _tone_pcm(rate, 1, seconds)
+    step = max(1, rate * chunk_ms // 1000) * 2
+    meter = LevelMeter()
+    c0 = time.process_time()
+    for i in range(0, len(pcm), step):
+        meter.update(pcm[i : i + step])
+        meter.snapshot()
+    cpu = time.process_time() - c0
+    return [
+        {
+            "suite": "levels",
+            "audio_s": round(seconds, 3),
+            "chunk_ms": chunk_ms,
+            "cpu_ms_per_audio_s": round(cpu * 1000.0 / seconds, 3),
+        }
+    ]
+
+
+def bench_config(
+    *, iterations: int = 2000, config_path: Optional[str] = None, **_: Any
+) -> List[Result]:
+    """Config() construction time: parsing from scratch vs the resolved cache."""
+    from .config import Config, clear_config_cache
+
+    Config(config_path=config_path)  # imports (YAML, hotkey validator) off the clock
+    out: List[Result] = []
+    for mode, cold in (("cold", True), ("cached", False)):
+        clear_config_cache()
+        Config(config_path=config_path)
+        sw = Stopwatch()
+        for _ in range(iterations):
+            if cold:
+                clear_config_cache()
+            Config(config_path=config_path)
+        wall = sw.elapsed_ns() / 1e9
+        out.append(
+            {
+                "suite": "config",
+                "mode": mode,
+                "iterations": iterations,
+                "us_per_config": round(wall * 1e6 / iterations, 2),
+            }
+        )
+    return out
+
+
+def bench_pipeline(
+    *, seconds: float = 10.0, chunk_ms: int = 20, **_: Any
+) -> List[Result]:
+    """Capture → controller → orchestrator overhead per utterance, on a virtual clock.
+
+    The engine is the byte-counting dummy and every sleep (minimum hold,
+    idle polling) is virtual, so this measures only the pipeline's own
+    scheduling and bookkeeping.
+    """
+    import io
+
+    from .capture import PCMCapture
+    from .clock import VirtualClock
+    from .controller import Controller
+    from .engine.dummy_engine import DummyAsrEngine
+    from .orchestrator import Orchestrator
+    from .ring_buffer import RingBuffer
+    from .sources import RawPCMStdinSource
+
+    rate, utter_s = 16000, 2.0
+    pcm = _speechlike_pcm(utter_s, rate)
+    n = max(1, int(seconds / utter_s))
+    clock = VirtualClock()
+    ring = RingBuffer(rate * 2)
+    ctl = Controller(
+        DummyAsrEngine(),
+        ring,
+        prebuffer_ms=300,
+        min_capture_ms=1500,
+        bytes_per_second=rate * 2,
+        min_speech_ms=150,
+        clock=clock,
+    )
+    c0 = time.process_time()
+    sw = Stopwatch()
+    for _ in range(n):
+        cap = PCMCapture(
+            sample_rate=rate,
+            channels=1,
+            chunk_ms=chunk_ms,
+            source=RawPCMStdinSource(io.BytesIO(pcm)),
+            clock=clock,
+        )
+        orch = Orchestrator(
+            controller=ctl,
+            ring=ring,
+            capture=cap,
+            paste_fn=lambda t: True,
+            audio_feedback=False,
+            status_fn=lambda **kw: None,
+        )
+        orch.press()
+        cap.wait()
+        orch.release()
+    cpu = time.process_time() - c0
+    wall = sw.elapsed_s()
+    return [
+        {
+            "suite": "pipeline",
+            "utterances": n,
+            "chunk_ms": chunk_ms,
+            "cpu_ms_per_utterance": round(cpu * 1000.0 / n, 3),
+            "wall_ms_per_utterance": round(wall * 1000.0 / n, 3),
+            "cpu_ms_per_audio_s": round(cpu * 1000.0 / (n * utter_s), 3),
+        }
+    ]
+
+
+SUITES: Dict[str, Callable[..., List[Result]]] = {
+    "resample": bench_resample,
+    "decode": bench_decode,
+    "config": bench_config,
+    "levels": bench_levels,
+    "pipeline": bench_pipeline,
+}
+
+
+def format_result(res: Result) -> str:
+    return " ".join(f"{k}={v}" for k, v in res.items())
+
+
+def run_suites(
+    names: Sequence[str],
+    *,
+    as_json: bool = False,
+    context: Optional[Result] = None,
+    **opts: Any,
+) -> List[Result]:
+    """Run suites in order; `context` (e.g. the thread plan) is printed first."""
+    results: List[Result] = []
+    if context:
+        results.append(context)
+        print(json.dumps(context) if as_json else format_result(context), flush=True)
+    for name in names:
+        for res in SUITES[name](**opts):
+            results.append(res)
+            print(json.dumps(res) if as_json else format_result(res), flush=True)
+    return results
@@ -1,6 +1,8 @@
 import threading
-import time
-from typing import Callable, Optional
+from typing import Any, Callable, Optional, Tuple
+
+from .clock import SYSTEM_CLOCK, Clock
+from .levels import LevelMeter
 
 
 class PCMSourceProtocol:
@@ -17,6 +19,17 @@ class PCMCapture:
     - sample_rate/channels determine bytes_per_second (s16le)
     - chunk_ms controls nominal read size per iteration
     - source implements start/read/stop, making this unit-testable without devices
+    - meter (a LevelMeter) is updated with every chunk on the capture thread
+    - with `recover`, a source whose start() or read() raises (device
+      unplugged, selected device changed) is stopped and reopened with
+      exponential backoff between `backoff_s` bounds until capture is
+      stopped; `status_fn(**fields)` receives `device_state`
+      ("ok" | "lost" | "reconnecting") with `device`/`device_error`/
+      `device_retries`
+    - `error` keeps the last exception raised by the source (None if none);
+      `wait()` blocks until a finite source (file, pipe) has been drained
+    - idle polling and reconnect backoff sleep on `clock` (real time by
+      default), so tests can run them on a VirtualClock
     """
 
     def __init__(
@@ -26,11 +39,26 @@ class PCMCapture:
         channels: int,
         chunk_ms: int,
         source: PCMSourceProtocol,
+        meter: Optional[LevelMeter] = None,
+        recover: bool = False,
+        backoff_s: Tuple[float, float] = (0.2, 5.0),
+        status_fn: Optional[Callable[..., None]] = None,
+        clock: Optional[Clock] = None,
     ) -> None:
         self.sample_rate = int(sample_rate)
         self.channels = int(channels)
         self.chunk_ms = int(chunk_ms)
         self.source = source
+        self.meter = meter if meter is not None else LevelMeter()
+        self.recover = bool(recover)
+        lo, hi = backoff_s
+        self.backoff_s = (max(0.0, float(lo)), max(float(lo), float(hi)))
+        self.status_fn = status_fn
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.reconnects = 0
+        self.error: Optional[Exception] = None
+        self._retries = 0  # failed reopen attempts since the last good open
+        self._down = False
         self._thread: Optional[threading.Thread] = None
         self._stop = threading.Event()
         self._running = threading.Event()
@@ -41,44 +69,118 @@ class PCMCapture:
     def is_running(self) -> bool:
         return self._running.is_set()
 
+    def _status(self, **fields: Any) -> None:
+        if self.status_fn is None:
+            return
+        try:
+            self.status_fn(**fields)
+        except Exception:
+            pass
+
+    def _open(self) -> bool:
+        """Start the source; False if it failed and should be retried."""
+        try:
+            self.source.start()
+        except Exception as e:
+            self.error = e
+            if not self.recover:
+                return True  # keep reading; the source reports what it can
+            try:
+                self.source.stop()
+            except Exception:
+                pass
+            self._retries += 1
+            self._down = True
+            self._status(
+                device_state="reconnecting",
+                device_error=str(e),
+                device_retries=self._retries,
+            )
+            return False
+        if self._down:
+            self.reconnects += 1
+        self._retries = 0
+        self._down = False
+        self._status(
+            device_state="ok",
+            device=getattr(self.source, "device_name", None),
+            device_error=None,
+            device_retries=0,
+        )
+        return True
+
+    def _lost(self, err: Exception) -> None:
+        self._status(device_state="lost", device_error=str(err))
+        try:
+            self.source.stop()
+        except Exception:
+            pass
+        self._down = True
+
+    def _backoff(self) -> float:
+        lo, hi = self.backoff_s
+        # bounded exponent: a device can stay unplugged for hours
+        return min(hi, lo * (2 ** min(self._retries, 30)))
+
     def start(self, on_bytes: Callable[[bytes], None]) -> None:
         if self._thread is not None:
             return
         self._stop.clear()
+        self.error = None
 
         def _loop():
-            try:
-                self.source.start()
-            except Exception:
-                pass
+            opened = self._open()
             self._running.set()
             nbytes = max(1, int(self.bytes_per_second() * (self.chunk_ms / 1000.0)))
             try:
                 while not self._stop.is_set():
+                    if not opened:
+                        if self.clock.wait(self._stop, self._backoff()):
+                            break
+                        opened = self._open()
+                        continue
                     try:
                         data = self.source.read(nbytes)
-                    except Exception:
-                        break
+                    except Exception as e:
+                        self.error = e
+                        if not self.recover:
+                            break
+                        self._lost(e)
+                        opened = False
+                        continue
                     if data is None:
                         break
                     if not data:
-                        time.sleep(0.005)
+                        self.clock.sleep(0.005)
                         continue
+                    try:
+                        self.meter.update(data)
+                    except Exception:
+                        pass
                     try:
                         on_bytes(data)
                     except Exception:
                         # swallow callback errors
                         pass
             finally:
-                try:
-                    self.source.stop()
-                except Exception:
-                    pass
+                if opened:
+                    try:
+                        self.source.stop()
+                    except Exception:
+                        pass
                 self._running.clear()
 
         self._thread = threading.Thread(target=_loop, name="pcm-capture", daemon=True)
         self._thread.start()
 
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the capture loop to end by itself; False on timeout."""
+        t = self._thread
+        if t is not None:
+            t.join(timeout)
+            return not t.is_alive()
+        return True
+
     def stop(self) -> None:
         self._stop.set()
         t = self._thread
@@ -1,31 +1,144 @@
 import threading
+import time
 from collections import deque
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from .resample import PCMResampler
+
+# PortAudio enumerates devices only in Pa_Initialize, and sounddevice has no
+# public call to redo that. Its private _terminate()/_initialize() do, and
+# have kept their signatures across these releases; outside the range a
+# reopen skips the rescan rather than call internals that may have changed.
+_RESCAN_VERSIONS = ((0, 3), (1, 0))  # [first, last)
+
+
+def _can_rescan(sd) -> bool:
+    try:
+        version = tuple(int(p) for p in str(sd.__version__).split(".")[:2])
+    except Exception:
+        return False
+    first, last = _RESCAN_VERSIONS
+    return (
+        first <= version < last
+        and callable(getattr(sd, "_terminate", None))
+        and callable(getattr(sd, "_initialize", None))
+    )
+
+
+def _input_devices(sd) -> List[Dict[str, Any]]:
+    out = []
+    for idx, info in enumerate(sd.query_devices()):
+        if int(info.get("max_input_channels") or 0) > 0:
+            out.append({"index": idx, **dict(info)})
+    return out
+
+
+def resolve_input_device(sd, selector: str) -> Optional[int]:
+    """Device index for `selector` (an index or a case-insensitive name part).
+
+    None means the system default: an empty selector, or a device that is not
+    present right now (e.g. an unplugged headset).
+    """
+    sel = (selector or "").strip()
+    if not sel:
+        return None
+    devices = _input_devices(sd)
+    if sel.isdigit():
+        idx = int(sel)
+        return idx if any(d["index"] == idx for d in devices) else None
+    sel = sel.lower()
+    for d in devices:
+        if sel == str(d.get("name", "")).lower():
+            return d["index"]
+    for d in devices:
+        if sel in str(d.get("name", "")).lower():
+            return d["index"]
+    return None
+
+
+def list_input_devices() -> List[Dict[str, Any]]:
+    """Input devices as dicts (index, name, channels, rate, default)."""
+    try:
+        import sounddevice as sd  # type: ignore
+    except Exception as e:
+        raise RuntimeError("sounddevice is not installed") from e
+    try:
+        default = sd.query_devices(kind="input")["name"]
+    except Exception:
+        default = None
+    return [
+        {
+            "index": d["index"],
+            "name": d.get("name", ""),
+            "channels": int(d.get("max_input_channels") or 0),
+            "rate": int(float(d.get("default_samplerate") or 0)),
+            "default": d.get("name") == default,
+        }
+        for d in _input_devices(sd)
+    ]
 
 
 class SoundDeviceSource:
     """PCMSourceProtocol implementation using sounddevice (CoreAudio backend on macOS).
 
     - Lazily imports sounddevice.
-    - Captures mono s16 at given sample_rate.
+    - Opens the input device at its native rate/channels (or device_rate/
+      device_channels when given) and converts to `sample_rate`/`channels`
+      s16le on the reading thread, never inside the PortAudio callback.
     - Buffers data in a thread-safe deque for PCMCapture.read to consume.
+    - `device` selects the input by index or name part ("" = system default;
+      a missing device falls back to the default). read() raises once the
+      stream has died or delivered nothing for `stall_s`, so a recovering
+      PCMCapture reopens it; each reopen rescans the device list, picking up
+      a replugged headset or a new default device.
+    - Every `check_s`, read() also compares `device` with the selector the
+      stream was opened for and raises on a change, so setting `device`
+      (config reload) takes effect within `check_s`. PortAudio cannot see devices added or a default
+      changed after the last rescan without closing the stream, so while
+      the open stream keeps delivering, a late-plugged `device` or a new
+      system default is only picked up at the next reopen.
     """
 
+    # Cap on channels opened when using the device's native layout
+    _MAX_NATIVE_CHANNELS = 2
+
     def __init__(
         self,
         *,
         sample_rate: int = 16000,
         channels: int = 1,
-        frames_per_block: int = 320,
+        frames_per_block: Optional[int] = None,
+        device_rate: int = 0,
+        device_channels: int = 0,
+        block_ms: int = 20,
+        device: str = "",
+        stall_s: float = 2.0,
+        check_s: float = 2.0,
     ) -> None:
         self.sample_rate = int(sample_rate)
         self.channels = int(channels)
-        self.frames_per_block = int(frames_per_block)
+        self.frames_per_block = int(frames_per_block) if frames_per_block else 0
+        self.device_rate = int(device_rate or 0)
+        self.device_channels = int(device_channels or 0)
+        self.block_ms = max(1, int(block_ms))
+        self.device = str(device or "")
+        self.stall_s = float(stall_s)
+        self.check_s = max(0.0, float(check_s))
+        self.device_name: Optional[str] = None
+        self._device_index: Optional[int] = None
+        self._opened_for = self.device  # selector the stream was opened with
+        self._checked_at = 0.0
+        self._opened = 0
+        self._last_data = 0.0
+        self._finished = False
         self._sd = None
         self._stream = None
         self._buf = deque()
         self._lock = threading.Lock()
-        self._bytes_per_frame = self.channels * 2
+        self._resampler: Optional[PCMResampler] = None
+        # effective device format once started
+        self.stream_rate = self.sample_rate
+        self.stream_channels = self.channels
 
     def _ensure(self):
         if self._sd is not None:
@@ -36,37 +149,137 @@ class SoundDeviceSource:
             raise RuntimeError("sounddevice is not installed") from e
         self._sd = sd
 
+    def _native_format(self):
+        rate = self.device_rate
+        ch = self.device_channels
+        if rate and ch:
+            return rate, ch
+        try:
+            if self._device_index is not None:
+                info = self._sd.query_devices(self._device_index)
+            else:
+                info = self._sd.query_devices(kind="input")
+            native_rate = int(float(info.get("default_samplerate") or 0))
+            native_ch = int(info.get("max_input_channels") or 0)
+        except Exception:
+            native_rate, native_ch = 0, 0
+        rate = rate or native_rate or self.sample_rate
+        ch = ch or min(native_ch, self._MAX_NATIVE_CHANNELS) or self.channels
+        return rate, ch
+
+    def _rescan(self) -> None:
+        # PortAudio only sees devices present at initialisation
+        if not _can_rescan(self._sd):
+            return
+        try:
+            self._sd._terminate()
+            self._sd._initialize()
+        except Exception:
+            pass
+
     def start(self):
         self._ensure()
         sd = self._sd
+        if self._opened:
+            self._rescan()
+        self._opened += 1
+        self._opened_for = self.device
+        self._checked_at = time.monotonic()
+        try:
+            self._device_index = resolve_input_device(sd, self.device)
+        except Exception:
+            self._device_index = None
+        try:
+            if self._device_index is not None:
+                self.device_name = sd.query_devices(self._device_index)["name"]
+            else:
+                self.device_name = sd.query_devices(kind="input")["name"]
+        except Exception:
+            self.device_name = None
+        rate, ch = self._native_format()
+        self.stream_rate, self.stream_channels = rate, ch
+        if (rate, ch) != (self.sample_rate, self.channels):
+            self._resampler = PCMResampler(
+                in_rate=rate,
+                in_channels=ch,
+                out_rate=self.sample_rate,
+                out_channels=self.channels,
+            )
+        else:
+            self._resampler = None
 
         def _cb(indata, frames, time_info, status):
             # indata: float32 [-1,1] or int16 depending on dtype; request int16
             with self._lock:
                 self._buf.append(bytes(indata))
+                self._last_data = time.monotonic()
+
+        def _finished():
+            self._finished = True
 
+        with self._lock:
+            self._buf.clear()
+            self._last_data = time.monotonic()
+        self._finished = False
         self._stream = sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=self.channels,
+            device=self._device_index,
+            samplerate=rate,
+            channels=ch,
             dtype="int16",
-            blocksize=self.frames_per_block,
+            blocksize=self.frames_per_block or max(1, rate * self.block_ms // 1000),
             callback=_cb,
+            finished_callback=_finished,
         )
         self._stream.start()
 
     def read(self, nbytes: int) -> Optional[bytes]:
+        rs = self._resampler
+        # nbytes is in output format; scale to the device format
+        if rs is not None:
+            want = int(
+                nbytes
+                * (self.stream_rate * self.stream_channels)
+                / max(1, self.sample_rate * self.channels)
+            )
+        else:
+            want = nbytes
+        if self.check_s and self._stream is not None:
+            now = time.monotonic()
+            if now - self._checked_at >= self.check_s:
+                self._checked_at = now
+                self._check_device()
         with self._lock:
             if not self._buf:
+                self._check_alive()
                 return b""
             out = bytearray()
-            while self._buf and len(out) < nbytes:
+            while self._buf and len(out) < want:
                 out.extend(self._buf.popleft())
+        if rs is None:
             return bytes(out)
+        return rs.process(bytes(out))
+
+    def _check_alive(self) -> None:
+        if self._stream is None:
+            return
+        if self._finished:
+            raise RuntimeError(f"input stream closed ({self.device_name})")
+        if self.stall_s and time.monotonic() - self._last_data > self.stall_s:
+            raise RuntimeError(
+                f"no audio from {self.device_name} for {self.stall_s:.0f}s"
+            )
+
+    def _check_device(self) -> None:
+        if self.device != self._opened_for:
+            raise RuntimeError(f"input device changed to {self.device or 'default'!r}")
 
     def stop(self):
         if self._stream is not None:
+            stream, self._stream = self._stream, None
             try:
-                self._stream.stop()
-                self._stream.close()
-            finally:
-                self._stream = None
+                stream.stop()
+                stream.close()
+            except Exception:
+                pass
+        if self._resampler is not None:
+            self._resampler.reset()
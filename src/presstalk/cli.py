@@ -1,56 +1,247 @@
 import argparse
+import threading
 import time
 import os
 import sys
+from typing import Optional
 
 from . import __version__
-from .config import Config
+from .config import Config, default_config_paths
+from .config_watch import ConfigWatcher
 from .ring_buffer import RingBuffer
 from .controller import Controller
 from .capture import PCMCapture
+from .clock import Stopwatch
 from .orchestrator import Orchestrator
 from .beep import beep as system_beep
-from .paste import insert_text
+from .app_prompts import AppPrompts
+from .paste import get_frontmost_app, insert_text
+from .paste_common import PasteGuard
 from .hotkey import HotkeyHandler
 from .engine.dummy_engine import DummyAsrEngine
-from .constants import MODEL_CHOICES
-from .logger import get_logger, QUIET, INFO, DEBUG
+from .constants import DECODE_PROFILE_CHOICES, MODEL_CHOICES, UI_CONFIG_KEYS
+from .logger import get_logger, start_async_logging, stop_async_logging
+from .logger import QUIET, INFO, DEBUG
 from .logo import print_logo
+from .models import format_size
+from .status import StatusBoard, rss_bytes
 
 
-def _build_run_orchestrator(cfg: Config) -> Orchestrator:
-    # Ring for prebuffer
-    pre_bytes = int(cfg.bytes_per_second * (cfg.prebuffer_ms / 1000.0))
-    ring = RingBuffer(max(1, pre_bytes or 1))
+def _thread_plan(cfg: Config):
+    """Pin the process to cfg.cpu_affinity (if any) and resolve decoder threads."""
+    from .engine.cpu import apply_affinity, parse_cpu_list, resolve_threads
+
+    pinned = None
+    if cfg.cpu_affinity:
+        try:
+            cpus = parse_cpu_list(cfg.cpu_affinity)
+        except ValueError:
+            cpus = []
+            get_logger().info("[PT] Ignoring invalid cpu_affinity: %s", cfg.cpu_affinity)
+        if cpus:
+            pinned = apply_affinity(cpus)
+            if pinned is None:
+                get_logger().info("[PT] CPU affinity is not supported here; ignoring")
+    return resolve_threads(cfg.cpu_threads, cfg.decode_workers, pinned)
+
+
+def _model_progress(model: str, board: Optional[StatusBoard] = None):
+    """on_state callback for BackgroundBackend: log and publish load progress."""
+
+    sizes = {"model_bytes": None}
+
+    def _mem() -> str:
+        rss = rss_bytes()
+        parts = [f"RSS {format_size(rss)}" if rss else "RSS n/a"]
+        if sizes["model_bytes"]:
+            parts.append(f"model {format_size(sizes['model_bytes'])} on disk")
+        return ", ".join(parts)
+
+    def _on_state(state: str, info: dict) -> None:
+        elapsed = info.get("elapsed_s", 0.0)
+        if info.get("model_bytes"):
+            sizes["model_bytes"] = info["model_bytes"]
+        if board is not None:
+            board.update(
+                model=model,
+                model_state=state,
+                model_elapsed_s=elapsed,
+                model_error=info.get("error"),
+                model_bytes=sizes["model_bytes"],
+                rss_bytes=rss_bytes(),
+            )
+        verb = "Reloading" if info.get("reload") else "Loading"
+        if state == "loading":
+            if elapsed:
+                get_logger().info("[PT] %s ASR model (%s)... %.0fs", verb, model, elapsed)
+            else:
+                get_logger().info(
+                    "[PT] %s ASR model (%s) in background; "
+                    "recordings are kept until it is ready",
+                    verb,
+                    model,
+                )
+        elif state == "ready":
+            what = "reloaded" if info.get("reload") else "ready"
+            get_logger().info(
+                lambda: f"[PT] Model {what} ({model}, {elapsed:.1f}s; {_mem()})"
+            )
+        elif state == "unloaded":
+            mins = info.get("idle_s", 0) / 60.0
+            get_logger().info(
+                lambda: f"[PT] Model unloaded after {mins:.0f} min idle ({_mem()}); "
+                "it reloads on the next press"
+            )
+        else:
+            get_logger().info(
+                "[PT] Failed to load model '%s': %s; retrying on the next press "
+                "(in %.0fs or later)",
+                model,
+                info.get("error"),
+                info.get("retry_s", 0.0),
+            )
+
+    return _on_state
 
-    # Engine backend with progress display
+
+def _backend_factory(cfg: Config, plan):
+    """Deferred FasterWhisperBackend construction for BackgroundBackend."""
+    from .engine.fwhisper_backend import FasterWhisperBackend
+    from .models import store_dir
+
+    def factory():
+        return FasterWhisperBackend(
+            model=cfg.model,
+            cpu_threads=plan.cpu_threads,
+            num_workers=plan.num_workers,
+            long_form=cfg.long_form,
+            profile=cfg.decode_profile,
+            model_dir=store_dir(cfg.model_dir),
+            offline=cfg.offline,
+        )
+
+    return factory
+
+
+def _paste_fn(cfg: Config):
+    guard = PasteGuard.from_config(cfg)
+
+    def _paste(text: str) -> bool:
+        # the app frontmost now: the user may have switched since decoding
+        return insert_text(text, guard=guard, frontmost_getter=get_frontmost_app)
+
+    return _paste
+
+
+def _device_status(board: Optional[StatusBoard] = None):
+    """status_fn for PCMCapture: log input device loss/recovery and publish it."""
+    last = {"state": None}
+
+    def _update(**fields):
+        state = fields.get("device_state")
+        if board is not None:
+            board.update(**fields)
+        if state == "lost":
+            get_logger().info(
+                "[PT] Input device lost (%s); reconnecting...", fields.get("device_error")
+            )
+        elif state == "reconnecting":
+            get_logger().debug(
+                "[PT] Reopening input device failed: %s",
+                fields.get("device_error"),
+                retries=fields.get("device_retries"),
+            )
+        elif state == "ok" and last["state"] in ("lost", "reconnecting"):
+            get_logger().info("[PT] Input device reconnected: %s", fields.get("device"))
+        last["state"] = state
+
+    return _update
+
+
+def _prompt_fn(cfg: Config):
+    """Per-app prompt, looked up from the foreground app on the decode thread."""
+    prompts = AppPrompts.from_config(cfg)
+    if not prompts:
+        return None
+
+    def prompt_fn() -> Optional[str]:
+        return prompts.prompt_for(get_frontmost_app())
+
+    return prompt_fn
+
+
+def _build_engine(
+    cfg: Config, plan, board: Optional[StatusBoard] = None, *, partials: bool = True
+):
+    """FasterWhisperEngine over a background-loading backend (shared by run/transcribe)."""
     try:
-        from .engine.fwhisper_backend import FasterWhisperBackend
         from .engine.fwhisper_engine import FasterWhisperEngine
+        from .engine.loader import BackgroundBackend
     except Exception as e:
         raise RuntimeError(f"engine modules unavailable: {e}")
+    # fail fast on a missing package; the model itself loads in the background
+    import importlib.util
+
+    if importlib.util.find_spec("faster_whisper") is None:
+        raise RuntimeError("faster-whisper is not installed")
 
-    backend = FasterWhisperBackend(model=cfg.model, show_progress=True)
-    engine = FasterWhisperEngine(
+    get_logger().info(lambda: f"[PT] Threads: {plan.describe()}")
+    if cfg.long_form and plan.num_workers < 2:
+        get_logger().info(
+            "[PT] Long-form windows need decode_workers >= 2 (auto: 8+ cores); "
+            "recordings over 30 s are decoded in one sequential pass"
+        )
+    backend = BackgroundBackend(
+        _backend_factory(cfg, plan),
+        on_state=_model_progress(cfg.model, board),
+        idle_unload_s=cfg.idle_unload_min * 60,
+    ).start()
+    return FasterWhisperEngine(
         sample_rate=cfg.sample_rate,
         language=cfg.language,
         model=cfg.model,
         backend=backend,
+        channels=cfg.channels,
+        partial_interval_ms=cfg.partial_interval_ms if partials else 0,
+        on_partial=lambda _sid, text: get_logger().info("[PT] Partial: %s", text),
+        spill_bytes=cfg.session_spill_s * cfg.bytes_per_second,
+        max_bytes=cfg.session_max_s * cfg.bytes_per_second,
+        cap_policy=cfg.session_cap_policy,
     )
 
+
+def _build_run_orchestrator(
+    cfg: Config, board: Optional[StatusBoard] = None, plan=None
+) -> Orchestrator:
+    # Ring for prebuffer
+    pre_bytes = int(cfg.bytes_per_second * (cfg.prebuffer_ms / 1000.0))
+    ring = RingBuffer(max(1, pre_bytes or 1))
+
+    if plan is None:
+        plan = _thread_plan(cfg)
+    engine = _build_engine(cfg, plan, board)
+
     # Capture source (sounddevice)
     try:
         from .capture_sd import SoundDeviceSource
     except Exception as e:
         raise RuntimeError(f"capture module unavailable: {e}")
 
+    # Device opened at its native format; converted to cfg.sample_rate/channels
     source = SoundDeviceSource(
         sample_rate=cfg.sample_rate,
         channels=cfg.channels,
-        frames_per_block=max(160, int(cfg.sample_rate * cfg.channels * 0.02)),
+        device_rate=cfg.input_sample_rate,
+        device_channels=cfg.input_channels,
+        device=cfg.input_device,
     )
     capture = PCMCapture(
-        sample_rate=cfg.sample_rate, channels=cfg.channels, chunk_ms=20, source=source
+        sample_rate=cfg.sample_rate,
+        channels=cfg.channels,
+        chunk_ms=20,
+        source=source,
+        recover=True,
+        status_fn=_device_status(board),
     )
 
     controller = Controller(
@@ -60,21 +251,22 @@ def _build_run_orchestrator(cfg: Config) -> Orchestrator:
         min_capture_ms=cfg.min_capture_ms,
         bytes_per_second=cfg.bytes_per_second,
         language=cfg.language,
+        prompt_fn=_prompt_fn(cfg),
+        min_speech_ms=cfg.min_speech_ms,
     )
 
-    def _paste(text: str) -> bool:
-        return insert_text(
-            text, guard_enabled=cfg.paste_guard, blocklist=cfg.paste_blocklist
-        )
-
     orch = Orchestrator(
         controller=controller,
         ring=ring,
         capture=capture,
-        paste_fn=_paste,
+        paste_fn=_paste_fn(cfg),
         audio_feedback=getattr(cfg, "audio_feedback", True),
         beep_fn=system_beep,
+        status_fn=board.update if board is not None else None,
+        silence_floor_db=cfg.silence_floor_db,
     )
+    if board is not None:
+        board.update(state="idle")
     return orch
 
 
@@ -113,22 +305,46 @@ class _StatusOrch:
 
         get_logger().info("[PT] Finalizing...")
         try:
-            import time as _t
-
-            _t0 = _t.time()
+            backend = self._o.controller.engine.backend
+            if getattr(backend, "state", None) == "loading":
+                get_logger().info("[PT] Model still loading; transcribing when ready...")
+        except Exception:
+            pass
+        try:
+            sw = Stopwatch()
             text = self._o.release()
-            eng_time = _t.time() - _t0
+            eng_time = sw.elapsed_s()
             st = self._o.stats()
             try:
                 approx_sec = st["bytes"] / max(1, st["bytes_per_second"]) if st else 0
             except Exception:
                 approx_sec = 0
             get_logger().info(
-                f"[PT] Stats: bytes={st.get('bytes', 0)} duration={st.get('duration_s', 0):.2f}s (~{approx_sec:.2f}s audio)"
+                "[PT] Stats:",
+                bytes=st.get("bytes", 0),
+                duration_s=float(st.get("duration_s", 0)),
+                audio_s=float(approx_sec),
+                peak_db=st.get("peak_db"),
+                clipped=st.get("clipped", 0),
             )
-            get_logger().info(f"[PT] Engine: {eng_time:.2f}s")
+            skipped = st.get("decode_skipped")
+            if skipped == "no_signal":
+                get_logger().info(
+                    "[PT] No signal above %s dBFS; skipped the decode "
+                    "(is the microphone muted?)",
+                    getattr(self._o, "silence_floor_db", None),
+                    skipped_total=st.get("decodes_skipped", 0),
+                )
+            elif skipped:
+                get_logger().info(
+                    "[PT] No speech detected; skipped the decode",
+                    skipped_total=st.get("decodes_skipped", 0),
+                )
+            elif st.get("clipped"):
+                get_logger().info("[PT] Input clipped; lower the microphone gain")
+            get_logger().info("[PT] Engine:", seconds=eng_time)
             if text:
-                get_logger().info("[PT] Final: " + text)
+                get_logger().info("[PT] Final: %s", text)
             else:
                 get_logger().info("[PT] No transcription produced.")
             return text
@@ -136,6 +352,169 @@ class _StatusOrch:
             self.is_finalizing = False
 
 
+# Config keys applied to a running `run` (the model reloads only when `model`
+# changes; the other backend keys take effect on the next model load)
+_LIVE_KEYS = (
+    "language",
+    "prebuffer_ms",
+    "min_capture_ms",
+    "min_speech_ms",
+    "partial_interval_ms",
+    "session_spill_s",
+    "session_max_s",
+    "session_cap_policy",
+    "audio_feedback",
+    "input_device",
+    "silence_floor_db",
+    "paste_guard",
+    "paste_blocklist",
+    "app_prompts",
+    "mode",
+    "hotkey",
+    "decode_profile",
+    "model",
+    "long_form",
+    "model_dir",
+    "offline",
+)
+_BACKEND_KEYS = ("model", "decode_profile", "long_form", "model_dir", "offline")
+_RESTART_KEYS = (
+    "sample_rate",
+    "channels",
+    "input_sample_rate",
+    "input_channels",
+    "cpu_threads",
+    "decode_workers",
+    "cpu_affinity",
+    "idle_unload_min",
+    "log_file",
+    "log_max_mb",
+)
+
+
+class _RunReloader:
+    """Applies config file edits to a running orchestrator between utterances.
+
+    `rebind(mode, hotkey)` swaps the hotkey listener and may raise ValueError
+    for an invalid hotkey, in which case the previous binding is kept.
+    """
+
+    def __init__(
+        self,
+        orch: Orchestrator,
+        cfg: Config,
+        args,
+        *,
+        plan=None,
+        board: Optional[StatusBoard] = None,
+        rebind=None,
+    ) -> None:
+        self.orch = orch
+        self.cfg = cfg
+        self._args = args
+        self._plan = plan
+        self._board = board
+        self._rebind = rebind
+        self._lock = threading.Lock()
+
+    def reload(self) -> list:
+        try:
+            new = _load_run_config(self._args)
+        except Exception as e:
+            get_logger().info("[PT] Config reload failed: %s", e)
+            return []
+        return self.apply(new)
+
+    def apply(self, new: Config) -> list:
+        with self._lock:
+            old = self.cfg
+            changed = [
+                k
+                for k in _LIVE_KEYS + _RESTART_KEYS
+                if getattr(old, k, None) != getattr(new, k, None)
+            ]
+            if not changed:
+                return []
+            # never swap components under an utterance in flight
+            with self.orch.idle():
+                return self._apply(old, new, changed)
+
+    def _apply(self, old: Config, new: Config, changed: list) -> list:
+        if "mode" in changed or "hotkey" in changed:
+            try:
+                if self._rebind is not None:
+                    self._rebind(new.mode, new.hotkey)
+            except ValueError as e:
+                get_logger().info("[PT] Keeping previous hotkey: %s", e)
+                new.mode, new.hotkey = old.mode, old.hotkey
+                changed = [k for k in changed if k not in ("mode", "hotkey")]
+        self._apply_controller(old, new, changed)
+        self._apply_backend(old, new, changed)
+        if "audio_feedback" in changed:
+            self.orch.audio_feedback = new.audio_feedback
+        if "silence_floor_db" in changed:
+            self.orch.silence_floor_db = new.silence_floor_db
+        if "input_device" in changed:
+            # the source notices within its check_s and reopens
+            source = getattr(self.orch.capture, "source", None)
+            if hasattr(source, "device"):
+                source.device = new.input_device
+        if "paste_guard" in changed or "paste_blocklist" in changed:
+            self.orch.paste_fn = _paste_fn(new)
+        self.cfg = new
+        live = [k for k in changed if k in _LIVE_KEYS]
+        later = [k for k in changed if k in _RESTART_KEYS]
+        if live:
+            get_logger().info("[PT] Config reloaded: %s", ", ".join(live))
+        if later:
+            get_logger().info("[PT] Restart to apply: %s", ", ".join(later))
+        return changed
+
+    def _apply_controller(self, old: Config, new: Config, changed: list) -> None:
+        ctl = self.orch.controller
+        eng = ctl.engine
+        if "language" in changed:
+            ctl.language = new.language
+        if "min_capture_ms" in changed:
+            ctl.min_capture_ms = new.min_capture_ms
+        if "min_speech_ms" in changed:
+            ctl.min_speech_ms = new.min_speech_ms
+        if "prebuffer_ms" in changed:
+            ctl.prebuffer_ms = new.prebuffer_ms
+            pre_bytes = int(new.bytes_per_second * (new.prebuffer_ms / 1000.0))
+            ring = RingBuffer(max(1, pre_bytes or 1))
+            self.orch.ring = ctl.ring = ring
+        if "app_prompts" in changed:
+            ctl.prompt_fn = _prompt_fn(new)
+        if "partial_interval_ms" in changed:
+            eng.partial_interval_ms = max(0, int(new.partial_interval_ms))
+        bps = new.bytes_per_second
+        if "session_spill_s" in changed:
+            eng.spill_bytes = max(0, new.session_spill_s * bps)
+        if "session_max_s" in changed:
+            eng.max_bytes = max(0, new.session_max_s * bps)
+        if "session_cap_policy" in changed:
+            eng.cap_policy = new.session_cap_policy
+
+    def _apply_backend(self, old: Config, new: Config, changed: list) -> None:
+        if not any(k in changed for k in _BACKEND_KEYS):
+            return
+        eng = self.orch.controller.engine
+        backend = eng.backend
+        if not hasattr(backend, "swap") or self._plan is None:
+            get_logger().info("[PT] Restart to apply the model settings")
+            return
+        reload = new.model != old.model
+        backend.swap(
+            _backend_factory(new, self._plan),
+            reload=reload,
+            on_state=_model_progress(new.model, self._board) if reload else None,
+        )
+        eng.model = new.model
+        if not reload and "decode_profile" in changed and backend.is_ready():
+            backend.set_profile(new.decode_profile)
+
+
 class _DummySource:
     def __init__(self, chunks, delay_s=0.0):
         self._chunks = list(chunks)
@@ -175,6 +554,33 @@ def build_parser() -> argparse.ArgumentParser:
     sim.add_argument(
         "--delay-ms", type=int, default=50, help="Delay between chunks (ms)"
     )
+    sim.add_argument(
+        "--audio",
+        default=None,
+        help="Replay this recording (WAV, or anything ffmpeg decodes) instead of --chunks",
+    )
+    sim.add_argument(
+        "--utterance",
+        action="append",
+        default=None,
+        metavar="START-END",
+        help="Press/release at these seconds into --audio (repeatable; default: 0-)",
+    )
+    sim.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay speed for --audio (1 = real time, 0 = as fast as possible)",
+    )
+    sim.add_argument(
+        "--engine",
+        choices=["dummy", "whisper"],
+        default="dummy",
+        help="ASR engine for --audio (default: dummy, reports byte counts)",
+    )
+    sim.add_argument(
+        "--json", action="store_true", help="Print one JSON object per utterance"
+    )
 
     runp = sub.add_parser("run", help="Run local PTT (global hotkey by default)")
     runp.add_argument("--config", help="Path to YAML config (presstalk.yaml)")
@@ -195,6 +601,11 @@ def build_parser() -> argparse.ArgumentParser:
         default="INFO",
         help="Logging level",
     )
+    runp.add_argument(
+        "--log-file",
+        default=None,
+        help="Also write JSON-lines log events to this file (rotated)",
+    )
     runp.add_argument("--language", default=None, help="Override language (e.g., ja)")
     runp.add_argument("--model", default=None, help="Override model (e.g., small)")
     runp.add_argument(
@@ -209,6 +620,64 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Minimum capture ms (e.g., 1800)",
     )
+    runp.add_argument(
+        "--partial-interval-ms",
+        type=int,
+        default=None,
+        help="Show live partial text every N ms while recording (0=off)",
+    )
+    runp.add_argument(
+        "--offline",
+        action="store_true",
+        help="Load the model only from the local model store (no downloads)",
+    )
+    runp.add_argument(
+        "--input-device",
+        default=None,
+        help="Input device index or name part (see `presstalk devices`)",
+    )
+    sub.add_parser("devices", help="List audio input devices")
+    # transcribe subcommand
+    trp = sub.add_parser(
+        "transcribe", help="Transcribe audio files (or - for raw PCM on stdin) to JSON lines"
+    )
+    trp.add_argument(
+        "files",
+        nargs="+",
+        metavar="FILE",
+        help="16-bit WAV, anything ffmpeg decodes, or - for raw s16le on stdin",
+    )
+    trp.add_argument("--config", help="Path to YAML config (presstalk.yaml)")
+    trp.add_argument("--language", default=None, help="Override language (e.g., ja)")
+    trp.add_argument("--model", default=None, help="Override model (e.g., small)")
+    trp.add_argument(
+        "--offline",
+        action="store_true",
+        help="Load the model only from the local model store (no downloads)",
+    )
+    trp.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="Files decoded in parallel (default: decode_workers, auto-sized)",
+    )
+    trp.add_argument(
+        "-o", "--output", default=None, help="Write JSON lines here (default: stdout)"
+    )
+    trp.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg executable")
+    trp.add_argument(
+        "--input-rate", type=int, default=0, help="Sample rate of raw PCM on stdin"
+    )
+    trp.add_argument(
+        "--input-channels", type=int, default=0, help="Channels of raw PCM on stdin"
+    )
+    trp.add_argument(
+        "--timeout",
+        type=float,
+        default=0.0,
+        help="Decode timeout per file in seconds (default: scales with length)",
+    )
     # config subcommand
     cfgp = sub.add_parser("config", help="Interactive configuration editor")
     cfgp.add_argument("--config", help="Path to YAML config (presstalk.yaml)")
@@ -219,6 +688,57 @@ def build_parser() -> argparse.ArgumentParser:
         "--web", action="store_true", help="Open web-based configuration UI (localhost)"
     )
     cfgp.add_argument("--port", type=int, default=8765, help="Port for --web (default: 8765)")
+    # bench subcommand
+    from .bench import SUITES
+
+    benchp = sub.add_parser("bench", help="Run micro-benchmarks of hot paths")
+    benchp.add_argument(
+        "suites",
+        nargs="*",
+        metavar="suite",
+        help=f"Suites to run (default: all): {', '.join(sorted(SUITES))}",
+    )
+    benchp.add_argument(
+        "--seconds", type=float, default=10.0, help="Audio seconds per measurement"
+    )
+    benchp.add_argument("--json", action="store_true", help="Emit JSON lines")
+    benchp.add_argument(
+        "--config", help="Path to YAML config (thread settings)", default=None
+    )
+    benchp.add_argument(
+        "--audio", default=None, help="16-bit WAV to decode (decode suite)"
+    )
+    # models subcommand
+    modelsp = sub.add_parser(
+        "models", help="List, prefetch, verify or prune locally stored models"
+    )
+    modelsp.add_argument(
+        "action",
+        nargs="?",
+        default="list",
+        choices=["list", "prefetch", "verify", "prune"],
+        help="Action (default: list)",
+    )
+    modelsp.add_argument(
+        "names",
+        nargs="*",
+        metavar="model",
+        help="Models to act on (default: configured model; prune: required)",
+    )
+    modelsp.add_argument("--config", help="Path to YAML config (presstalk.yaml)")
+    modelsp.add_argument(
+        "--all",
+        action="store_true",
+        help="prune: every stored model except the configured one",
+    )
+    modelsp.add_argument(
+        "--yes",
+        action="store_true",
+        help="prune: delete (without it, prune only lists what it would remove)",
+    )
+    modelsp.add_argument(
+        "--dry-run", action="store_true", help="prune: only list (the default)"
+    )
     return parser
 
 
@@ -236,11 +756,49 @@ def _find_repo_config(explicit: str | None) -> str | None:
     return None
 
 
+def _overlay_run_args(cfg: Config, args) -> Config:
+    """Apply `run` command-line overrides; they win over every config reload."""
+    for k in ("language", "model"):
+        v = getattr(args, k, None)
+        if v:
+            setattr(cfg, k, v)
+    if getattr(args, "offline", False):
+        cfg.offline = True
+    if getattr(args, "prebuffer_ms", None) is not None:
+        cfg.prebuffer_ms = int(args.prebuffer_ms)
+    if getattr(args, "min_capture_ms", None) is not None:
+        cfg.min_capture_ms = int(args.min_capture_ms)
+    if getattr(args, "partial_interval_ms", None) is not None:
+        cfg.partial_interval_ms = max(0, int(args.partial_interval_ms))
+    if getattr(args, "input_device", None) is not None:
+        cfg.input_device = str(args.input_device).strip()
+    cfg.mode = getattr(args, "mode", None) or cfg.mode or "hold"
+    cfg.hotkey = getattr(args, "hotkey", None) or cfg.hotkey or "ctrl+space"
+    return cfg
+
+
+def _load_run_config(args) -> Config:
+    cfg_path = _find_repo_config(getattr(args, "config", None))
+    return _overlay_run_args(Config(config_path=cfg_path), args)
+
+
+def _config_watch_paths(args) -> list:
+    """Files whose edits `run` picks up: --config, else every default location."""
+    explicit = getattr(args, "config", None)
+    if explicit:
+        return [explicit]
+    pkg_dir = os.path.dirname(__file__)
+    repo_yaml = os.path.abspath(os.path.join(pkg_dir, "..", "..", "presstalk.yaml"))
+    return [repo_yaml] + default_config_paths()
+
+
 def _run_simulate(args) -> int:
     cfg_path = _find_repo_config(getattr(args, "config", None))
     cfg = Config(config_path=cfg_path)
     if getattr(cfg, "show_logo", True):
         print_logo(use_color=True, style=getattr(cfg, "logo_style", "simple"))
+    if getattr(args, "audio", None):
+        return _simulate_audio(args, cfg)
     bps = cfg.bytes_per_second
     pre_bytes = int(bps * (cfg.prebuffer_ms / 1000.0))
     ring = RingBuffer(max(1, pre_bytes or 1))
@@ -276,48 +834,151 @@ def _run_simulate(args) -> int:
     return 0
 
 
+def _simulate_audio(args, cfg: Config) -> int:
+    """Replay a recording through capture → ring/controller → engine on a script."""
+    import json
+
+    from .simulate import ReplaySource, parse_utterance, replay, utterance_marks
+    from .sources import open_source
+
+    bps = cfg.bytes_per_second
+    try:
+        utterances = [parse_utterance(s) for s in (args.utterance or ["0-"])]
+        marks = utterance_marks(utterances, bytes_per_second=bps, channels=cfg.channels)
+    except ValueError as e:
+        print(f"Invalid --utterance: {e}")
+        return 2
+    speed = max(0.0, float(getattr(args, "speed", 1.0)))
+    if args.engine == "whisper":
+        try:
+            eng = _build_engine(cfg, _thread_plan(cfg), partials=False)
+        except Exception as e:
+            print(f"Failed to initialize: {e}")
+            return 1
+        # keep the model load out of the first utterance's latency
+        wait_ready = getattr(eng.backend, "wait_ready", None)
+        if wait_ready is not None:
+            wait_ready()
+    else:
+        eng = DummyAsrEngine()
+    pre_bytes = int(bps * (cfg.prebuffer_ms / 1000.0))
+    ring = RingBuffer(max(1, pre_bytes or 1))
+    ctl = Controller(
+        eng,
+        ring,
+        prebuffer_ms=cfg.prebuffer_ms,
+        # the minimum hold is wall time; scale it with the replay
+        min_capture_ms=int(cfg.min_capture_ms / speed) if speed else 0,
+        bytes_per_second=bps,
+        language=cfg.language,
+        min_speech_ms=cfg.min_speech_ms,
+    )
+    src = ReplaySource(
+        open_source(args.audio, sample_rate=cfg.sample_rate, channels=cfg.channels),
+        bytes_per_second=bps,
+        speed=speed,
+        marks=marks,
+    )
+    cap = PCMCapture(
+        sample_rate=cfg.sample_rate, channels=cfg.channels, chunk_ms=20, source=src
+    )
+    events = []
+
+    def _status(**fields):
+        if "last_utterance" in fields:
+            events.append(fields["last_utterance"])
+
+    orch = Orchestrator(
+        controller=ctl,
+        ring=ring,
+        capture=cap,
+        paste_fn=lambda t: True,
+        audio_feedback=False,
+        status_fn=_status,
+        silence_floor_db=cfg.silence_floor_db,
+    )
+    results = replay(orch, src, utterances, events=events)
+    for i, res in enumerate(results, 1):
+        if args.json:
+            print(json.dumps(res, ensure_ascii=False))
+        else:
+            print(
+                f"[{i}] {res['press_s']:.2f}-{res['release_s']:.2f}s"
+                f" audio={res['audio_s']:.2f}s decode={res['decode_ms']:.1f}ms"
+                f" total={res['total_ms']:.1f}ms"
+                + (f" skipped={res['skipped']}" if res.get("skipped") else "")
+                + f": {res['text']}"
+            )
+    if cap.error is not None:
+        print(f"Replay failed: {cap.error}")
+        return 1
+    if len(results) < len(utterances):
+        print(f"Replay ended after {len(results)} of {len(utterances)} utterances")
+        return 1
+    return 0
+
+
 def _run_ptt(args) -> int:
-    cfg_path = _find_repo_config(getattr(args, "config", None))
-    cfg = Config(config_path=cfg_path)
+    cfg = _load_run_config(args)
     if getattr(cfg, "show_logo", True):
         print_logo(use_color=True, style=getattr(cfg, "logo_style", "simple"))
-    # overlay CLI options
-    for k in ("language", "model"):
-        v = getattr(args, k, None)
-        if v:
-            setattr(cfg, k, v)
-    if getattr(args, "prebuffer_ms", None) is not None:
-        cfg.prebuffer_ms = int(args.prebuffer_ms)
-    if getattr(args, "min_capture_ms", None) is not None:
-        cfg.min_capture_ms = int(args.min_capture_ms)
-    effective_mode = getattr(args, "mode", None) or getattr(cfg, "mode", None) or "hold"
-    effective_hotkey = (
-        getattr(args, "hotkey", None) or getattr(cfg, "hotkey", None) or "ctrl+space"
-    )
+    lvl = {"QUIET": QUIET, "INFO": INFO, "DEBUG": DEBUG}[
+        getattr(args, "log_level", "INFO")
+    ]
+    get_logger().set_level(lvl)
+    # log output leaves the capture/hotkey threads via a writer thread
+    log_file = getattr(args, "log_file", None) or cfg.log_file
+    try:
+        sink = start_async_logging(
+            jsonl_path=log_file, max_bytes=cfg.log_max_mb * 1024 * 1024
+        )
+    except OSError as e:
+        print(f"Cannot open log file {log_file}: {e}")
+        sink = start_async_logging()
     try:
-        orch = _build_run_orchestrator(cfg)
+        return _serve_ptt(args, cfg)
+    finally:
+        stop_async_logging(sink)
+
+
+def _serve_ptt(args, cfg: Config) -> int:
+    effective_mode = cfg.mode
+    effective_hotkey = cfg.hotkey
+    board = StatusBoard()
+    try:
+        plan = _thread_plan(cfg)
+        orch = _build_run_orchestrator(cfg, board, plan)
     except Exception as e:
         print(f"Error initializing: {e}")
         print("- Ensure 'sounddevice', 'numpy', and 'faster-whisper' are installed.")
         return 1
-    # logger
-    lvl = {"QUIET": QUIET, "INFO": INFO, "DEBUG": DEBUG}[
-        getattr(args, "log_level", "INFO")
-    ]
-    get_logger().set_level(lvl)
     if not getattr(args, "console", False):
         try:
             from .hotkey_pynput import GlobalHotkeyRunner
         except Exception as e:
             print(f"Global hotkey not available: {e}")
+            board.close()
             return 1
-        orch = _StatusOrch(orch)
-        runner = GlobalHotkeyRunner(
-            orch, mode=effective_mode, key_name=effective_hotkey
+        inner, orch = orch, _StatusOrch(orch)
+        runners = [
+            GlobalHotkeyRunner(orch, mode=effective_mode, key_name=effective_hotkey)
+        ]
+        runners[0].start()
+
+        def _rebind(mode: str, hotkey: str) -> None:
+            new = GlobalHotkeyRunner(orch, mode=mode, key_name=hotkey)
+            runners[0].stop()
+            new.start()
+            runners[0] = new
+            get_logger().info("[PT] Hotkey: %s (%s)", hotkey, mode)
+
+        reloader = _RunReloader(
+            inner, cfg, args, plan=plan, board=board, rebind=_rebind
         )
-        runner.start()
+        watcher = ConfigWatcher(_config_watch_paths(args), reloader.reload).start()
+        get_logger().debug("[PT] Watching config (%s)", watcher.backend)
         get_logger().info(
-            f"✓ Ready for voice input (press {effective_hotkey} to start)"
+            "✓ Ready for voice input (press %s to start)", effective_hotkey
         )
         try:
             while True:
@@ -325,11 +986,22 @@ def _run_ptt(args) -> int:
         except KeyboardInterrupt:
             pass
         finally:
-            runner.stop()
+            watcher.stop()
+            runners[0].stop()
+            board.close()
         return 0
     # console mode
-    orch = _StatusOrch(orch)
+    inner, orch = orch, _StatusOrch(orch)
     hk = HotkeyHandler(orch, mode=effective_mode)
+
+    def _set_mode(mode: str, _hotkey: str) -> None:
+        if mode != hk.mode:
+            hk.mode = mode
+            keys = "'p'/'r'" if mode == "hold" else "'t'"
+            get_logger().info("[PT] Mode: %s (use %s+Enter)", mode, keys)
+
+    reloader = _RunReloader(inner, cfg, args, plan=plan, board=board, rebind=_set_mode)
+    watcher = ConfigWatcher(_config_watch_paths(args), reloader.reload).start()
     get_logger().info("✓ Ready for voice input (console mode). Commands:")
     if effective_mode == "hold":
         get_logger().info(
@@ -350,7 +1022,7 @@ def _run_ptt(args) -> int:
                 except Exception:
                     pass
                 break
-            if effective_mode == "hold":
+            if hk.mode == "hold":
                 if cmd == "p":
                     hk.handle_key_down()
                 elif cmd == "r":
@@ -361,6 +1033,9 @@ def _run_ptt(args) -> int:
                     hk.handle_key_up()
     except KeyboardInterrupt:
         pass
+    finally:
+        watcher.stop()
+        board.close()
     return 0
 
 
@@ -463,6 +1138,7 @@ def _run_config(args) -> int:
         print(f"Current hotkey: {cfg.hotkey}")
         print(f"Current language: {cfg.language}")
         print(f"Current model: {cfg.model}")
+        print(f"Decode profile: {cfg.decode_profile}")
         print(f"Audio feedback: {getattr(cfg, 'audio_feedback', True)}")
         return 0
 
@@ -819,6 +1495,23 @@ def _run_config(args) -> int:
                 else:
                     print("Invalid model; keeping current.")
 
+    def edit_profile() -> None:
+        cur = cfg.decode_profile
+        options = list(DECODE_PROFILE_CHOICES)
+        esc, p = _read_line_with_esc(
+            f"Decode profile ({'/'.join(options)}) [{cur}] (ESC to cancel, Enter to keep): "
+        )
+        p = p.strip().lower()
+        if esc or p == "esc":
+            return
+        if p.isdigit() and 1 <= int(p) <= len(options):
+            p = options[int(p) - 1]
+        if p:
+            if p in options:
+                cfg.decode_profile = p
+            else:
+                print("Invalid profile; keeping current.")
+
     def edit_audio() -> None:
         cur = bool(getattr(cfg, "audio_feedback", True))
         esc, ans = _read_line_with_esc(
@@ -845,14 +1538,8 @@ def _run_config(args) -> int:
         if esc or ans in ("n", "no"):
             print("Canceled. Not saved.")
             return 1
-        data = {
-            "language": cfg.language,
-            "model": cfg.model,
-            "hotkey": cfg.hotkey,
-            "audio_feedback": bool(getattr(cfg, "audio_feedback", True)),
-        }
         # Preserve comments when possible
-        _write_yaml_preserve_comments(path, data)
+        _write_yaml_preserve_comments(path, cfg.to_dict(*UI_CONFIG_KEYS))
         print(f"Configuration saved to {path}")
         return 0
 
@@ -1025,15 +1712,16 @@ def _run_config(args) -> int:
             print_logo(use_color=True, style=logo_style)
         while True:
             print("PressTalk Configuration")
-            print("- Type 1-6 then Enter to select. Ctrl+C to cancel.")
+            print("- Type 1-7 then Enter to select. Ctrl+C to cancel.")
             print("- In editors: press Enter with no input to keep current value.")
             print(f"  1) Hotkey: {cfg.hotkey}")
             print(f"  2) Language: {cfg.language}")
             print(f"  3) Model: {cfg.model}")
             print(f"  4) Audio feedback: {getattr(cfg, 'audio_feedback', True)}")
-            print("  5) Save changes")
-            print("  6) Quit (discard)")
-            sel = input("Select [1-6]: ").strip()
+            print(f"  5) Decode profile: {cfg.decode_profile}")
+            print("  6) Save changes")
+            print("  7) Quit (discard)")
+            sel = input("Select [1-7]: ").strip()
             if sel == "1":
                 _edit_hotkey_list()
             elif sel == "2":
@@ -1043,11 +1731,13 @@ def _run_config(args) -> int:
             elif sel == "4":
                 edit_audio()
             elif sel == "5":
+                edit_profile()
+            elif sel == "6":
                 rc = save_and_exit()
                 if rc == 0:
                     return 0
                 # else back to menu
-            elif sel == "6":
+            elif sel == "7":
                 print("Aborted. No changes saved.")
                 return 0
             else:
@@ -1059,6 +1749,7 @@ def _run_config(args) -> int:
             ("Language", edit_language),
             ("Model", edit_model),
             ("Audio feedback", edit_audio),
+            ("Decode profile", edit_profile),
             ("Save changes", None),
             ("Quit (discard)", None),
         ]
@@ -1086,13 +1777,14 @@ def _run_config(args) -> int:
                     1: cfg.language,
                     2: cfg.model,
                     3: str(getattr(cfg, "audio_feedback", True)),
+                    4: cfg.decode_profile,
                 }.get(i - 1, "")
                 if value:
                     print(f" {pointer} {i}) {label}: {value}")
                 else:
                     print(f" {pointer} {i}) {label}")
             print(
-                "Use ↑/↓ or j/k to navigate, Enter to select, digits 1-6 for shortcut, q to quit."
+                "Use ↑/↓ or j/k to navigate, Enter to select, digits 1-7 for shortcut, q to quit."
             )
             try:
                 sys.stdout.flush()
@@ -1170,16 +1862,184 @@ def _run_config(args) -> int:
             elif sel == 4:
                 edit_audio()
             elif sel == 5:
+                edit_profile()
+            elif sel == 6:
                 rc = save_and_exit()
                 if rc == 0:
                     return 0
                 # else back to menu
-            elif sel == 6:
+            elif sel == 7:
                 print("Aborted. No changes saved.")
                 return 0
             idx = min(idx, len(items) - 1)
 
 
+def _run_bench(args) -> int:
+    from .bench import SUITES, run_suites
+
+    names = list(getattr(args, "suites", None) or sorted(SUITES))
+    unknown = [n for n in names if n not in SUITES]
+    if unknown:
+        print(f"Unknown suite(s): {', '.join(unknown)}")
+        return 2
+    cfg_path = _find_repo_config(getattr(args, "config", None))
+    cfg = Config(config_path=cfg_path)
+    plan = _thread_plan(cfg)
+    try:
+        run_suites(
+            names,
+            as_json=bool(getattr(args, "json", False)),
+            context={"suite": "env", **plan.as_dict()},
+            seconds=float(getattr(args, "seconds", 10.0) or 10.0),
+            model=cfg.model,
+            language=cfg.language,
+            audio_path=getattr(args, "audio", None),
+            cpu_threads=plan.cpu_threads,
+            num_workers=plan.num_workers,
+            config_path=cfg_path,
+        )
+    except Exception as e:
+        print(f"Benchmark failed: {e}")
+        return 1
+    return 0
+
+
+def _run_models(args) -> int:
+    from . import models as store
+
+    cfg = Config(config_path=_find_repo_config(getattr(args, "config", None)))
+    root = store.store_dir(cfg.model_dir)
+    action = getattr(args, "action", None) or "list"
+    names = list(getattr(args, "names", None) or [])
+    if action == "list":
+        rows = store.list_models(root, names or MODEL_CHOICES)
+        print(f"Model store: {root}")
+        for r in rows:
+            size = store.format_size(r["size"]) if r["size"] else "-"
+            mark = " *" if r["name"] == cfg.model else ""
+            print(f"  {r['name']:<12} {r['status']:<10} {size:>9}{mark}")
+        total = sum(r["size"] for r in rows)
+        print(f"Total: {store.format_size(total)} (* = configured model)")
+        return 0
+    if action == "prefetch":
+        if cfg.offline:
+            print("Offline mode is set; cannot download models")
+            return 1
+        for name in names or [cfg.model]:
+            print(f"Fetching {name}...", end="", flush=True)
+            try:
+                path = store.prefetch_model(name, root)
+            except Exception as e:
+                print(f" FAILED: {e}")
+                return 1
+            print(f" {store.format_size(store.dir_size(path))} in {path}")
+        return 0
+    if action == "verify":
+        rc = 0
+        for name in names or [cfg.model]:
+            problems = store.verify_model(store.model_path(name, root))
+            print(f"{name}: {'OK' if not problems else '; '.join(problems)}")
+            rc = rc or (1 if problems else 0)
+        return rc
+    if not names and not getattr(args, "all", False):
+        print("Name the models to prune, or pass --all for every model but the configured one")
+        return 2
+    dry = bool(getattr(args, "dry_run", False)) or not getattr(args, "yes", False)
+    doomed = store.prune_models(root, names=names, keep=[cfg.model], dry_run=True)
+    if not doomed:
+        print("Nothing to prune")
+        return 0
+    freed = sum(store.dir_size(p) for p in doomed)
+    if not dry:
+        store.prune_models(root, names=names, keep=[cfg.model])
+    for path in doomed:
+        print(("Would remove " if dry else "Removed ") + path)
+    print(f"{'Would free' if dry else 'Freed'} {store.format_size(freed)}")
+    if dry:
+        print("Re-run with --yes to delete")
+    return 0
+
+
+def _run_transcribe(args) -> int:
+    import json
+
+    from .batch import summarize, transcribe_files
+    from .sources import open_source
+
+    files = list(args.files)
+    if files.count("-") > 1:
+        print("stdin (-) can only be given once", file=sys.stderr)
+        return 2
+    cfg = _load_run_config(args)
+    if getattr(args, "jobs", 0):
+        cfg.decode_workers = max(1, int(args.jobs))
+    # stdout carries the results; progress goes to stderr
+    logger = get_logger()
+    prev_sink = logger.sink
+    logger.set_sink(lambda lvl, msg: print(msg, file=sys.stderr, flush=True))
+    out = None
+    try:
+        plan = _thread_plan(cfg)
+        try:
+            engine = _build_engine(cfg, plan, partials=False)
+        except Exception as e:
+            print(f"Failed to initialize: {e}", file=sys.stderr)
+            return 1
+
+        def make_source(path: str):
+            return open_source(
+                path,
+                sample_rate=cfg.sample_rate,
+                channels=cfg.channels,
+                ffmpeg=args.ffmpeg,
+                input_rate=args.input_rate,
+                input_channels=args.input_channels,
+            )
+
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        sw = Stopwatch()
+        results = []
+        for res in transcribe_files(
+            files,
+            engine=engine,
+            make_source=make_source,
+            jobs=plan.num_workers,
+            sample_rate=cfg.sample_rate,
+            channels=cfg.channels,
+            language=cfg.language,
+            min_speech_ms=cfg.min_speech_ms,
+            timeout_s=float(args.timeout or 0.0),
+        ):
+            results.append(res)
+            out.write(json.dumps(res, ensure_ascii=False) + "\n")
+            out.flush()
+        summary = summarize(results, sw.elapsed_s())
+        logger.info("[PT] Transcribed:", **summary)
+        return 1 if summary["errors"] else 0
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+        logger.set_sink(prev_sink)
+
+
+def _run_devices(args) -> int:
+    from .capture_sd import list_input_devices
+
+    try:
+        devices = list_input_devices()
+    except Exception as e:
+        print(f"Cannot list input devices: {e}")
+        return 1
+    if not devices:
+        print("No input devices found")
+        return 1
+    for d in devices:
+        mark = " *" if d["default"] else ""
+        print(f"  {d['index']:>3}  {d['name']} ({d['channels']}ch, {d['rate']} Hz){mark}")
+    print("(* = system default; set input_device to an index or name part)")
+    return 0
+
+
 def main():
     parser = build_parser()
     args = parser.parse_args()
@@ -1194,5 +2054,13 @@ def main():
         return _run_ptt(args)
     if args.cmd == "config":
         return _run_config(args)
+    if args.cmd == "bench":
+        return _run_bench(args)
+    if args.cmd == "models":
+        return _run_models(args)
+    if args.cmd == "devices":
+        return _run_devices(args)
+    if args.cmd == "transcribe":
+        return _run_transcribe(args)
     parser.print_help()
     return 0
@@ -0,0 +1,140 @@
+"""Time sources and duration helpers.
+
+presstalk never measures a duration with `time.time()`. Wall-clock time
+jumps with NTP and manual clock changes, and on some platforms it is
+coarse. Two clocks are used instead:
+
+- `now()`: `time.monotonic()` seconds, for deadlines and intervals
+  (timeouts, throttles, idle timers);
+- `now_ns()`: `time.perf_counter_ns()`, the highest-resolution monotonic
+  counter, for measured durations. Every latency presstalk reports is
+  the difference of two `now_ns()` readings, converted with
+  `elapsed_ms()`/`elapsed_s()` (microsecond precision) or a `Stopwatch`.
+
+`PCMCapture`, `Controller` and `Orchestrator` take a `clock` and use it
+for every timestamp, sleep and timed wait, instead of calling the `time`
+module directly. `SYSTEM_CLOCK` is real time. `VirtualClock` is for tests
+and benchmarks. Time only moves when something sleeps on it or calls
+`advance()`, so minimum-hold, backoff and latency logic runs in
+microseconds and gives the same numbers on every run.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class Clock:
+    """Real time: monotonic `now()`, high-resolution `now_ns()`; sleeps block."""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def now_ns(self) -> int:
+        return time.perf_counter_ns()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        """`event.wait(timeout)` measured on this clock."""
+        return event.wait(timeout)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+def elapsed_ms(start_ns: int, end_ns: int) -> float:
+    """Milliseconds between two `now_ns()` readings, to the microsecond."""
+    return round((end_ns - start_ns) / 1e6, 3)
+
+
+def elapsed_s(start_ns: int, end_ns: int) -> float:
+    """Seconds between two `now_ns()` readings, to the microsecond."""
+    return round((end_ns - start_ns) / 1e9, 6)
+
+
+class Stopwatch:
+    """Measures from construction (or `restart()`) on `clock`'s `now_ns()`."""
+
+    def __init__(self, clock: Optional[Clock] = None) -> None:
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.start_ns = self.clock.now_ns()
+
+    def restart(self) -> None:
+        self.start_ns = self.clock.now_ns()
+
+    def elapsed_ns(self) -> int:
+        return self.clock.now_ns() - self.start_ns
+
+    def elapsed_ms(self) -> float:
+        return elapsed_ms(self.start_ns, self.clock.now_ns())
+
+    def elapsed_s(self) -> float:
+        return elapsed_s(self.start_ns, self.clock.now_ns())
+
+
+class VirtualClock(Clock):
+    """Manually driven time.
+
+    With `auto_advance` (the default) `sleep(s)` moves time forward by `s`
+    and returns at once, so single-threaded code under test never blocks.
+    Without it, sleepers block until another thread calls `advance()` past
+    their deadline, for stepping concurrent code through a schedule.
+    `sleeps` records every requested sleep. `now()` and `now_ns()` read
+    the same integer-nanosecond timeline, so durations come out exact.
+    """
+
+    def __init__(self, start: float = 0.0, *, auto_advance: bool = True) -> None:
+        self._ns = _to_ns(start)
+        self.auto_advance = bool(auto_advance)
+        self.sleeps = []
+        self._cond = threading.Condition()
+
+    def now(self) -> float:
+        with self._cond:
+            return self._ns / 1e9
+
+    def now_ns(self) -> int:
+        with self._cond:
+            return self._ns
+
+    def advance(self, seconds: float) -> float:
+        """Move time forward, waking sleepers whose deadline has passed."""
+        with self._cond:
+            self._ns += _to_ns(seconds)
+            self._cond.notify_all()
+            return self._ns / 1e9
+
+    def sleep(self, seconds: float) -> None:
+        seconds = max(0.0, float(seconds))
+        with self._cond:
+            self.sleeps.append(seconds)
+            if self.auto_advance:
+                self._ns += _to_ns(seconds)
+                self._cond.notify_all()
+                return
+            deadline = self._ns + _to_ns(seconds)
+            while self._ns < deadline:
+                self._cond.wait()
+        # let the threads the sleep was yielding to run
+        time.sleep(0)
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        if event.is_set() or timeout is None:
+            return event.wait(timeout)
+        with self._cond:
+            if self.auto_advance:
+                self._ns += _to_ns(timeout)
+                self._cond.notify_all()
+                return event.is_set()
+            deadline = self._ns + _to_ns(timeout)
+            # Event.set() cannot notify this condition; poll it in real time
+            while self._ns < deadline and not event.is_set():
+                self._cond.wait(0.001)
+        return event.is_set()
+
+
+def _to_ns(seconds: float) -> int:
+    return max(0, int(round(float(seconds) * 1e9)))
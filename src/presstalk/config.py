@@ -1,8 +1,10 @@
+import copy
 import os
+import threading
 from dataclasses import dataclass
 import sys
-from typing import Optional, Any, Dict
-from .constants import is_env_enabled
+from typing import Optional, Any, Callable, Dict, List, Tuple
+from .constants import DECODE_PROFILE_CHOICES, DEFAULT_DECODE_PROFILE, is_env_enabled
 
 try:
     import yaml  # type: ignore
@@ -10,15 +12,279 @@ except Exception:  # fallback if PyYAML missing
     yaml = None
 
 
+def default_config_paths() -> List[str]:
+    """YAML files read, in order, when no explicit config path is given."""
+    xdg = os.getenv("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
+    return [
+        os.path.join(xdg, "presstalk", "config.yaml"),
+        # legacy home
+        os.path.expanduser("~/.presstalk.yaml"),
+    ]
+
+
+# ---- Field schema ----
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """How one Config field is loaded, coerced and serialised.
+
+    `coerce` turns a YAML or env value into the field's type and raises
+    TypeError/ValueError to reject it (the lower layer's value is kept).
+    `validate` normalises the merged value; a rejected value falls back to
+    the default. `env_coerce` overrides `coerce` for the env var.
+    """
+
+    name: str
+    default: Any
+    coerce: Callable[[Any], Any]
+    env: Optional[str] = None
+    env_coerce: Optional[Callable[[str], Any]] = None
+    validate: Optional[Callable[[Any], Any]] = None
+
+    def default_value(self) -> Any:
+        return self.default() if callable(self.default) else self.default
+
+    def finish(self, value: Any, fallback: Any) -> Any:
+        if self.validate is None:
+            return value
+        try:
+            return self.validate(value)
+        except (TypeError, ValueError):
+            return fallback
+
+
+def _text(v: Any) -> str:
+    if v is None or isinstance(v, (list, dict)):
+        raise TypeError("expected a scalar")
+    return str(v)
+
+
+def _flag(v: Any) -> bool:
+    return is_env_enabled(v) if isinstance(v, str) else bool(v)
+
+
+def _raw(v: Any) -> Any:
+    return v
+
+
+def _nonempty(v: str) -> str:
+    if not v:
+        raise ValueError("empty")
+    return v
+
+
+def _nonneg(v: int) -> int:
+    return max(0, int(v))
+
+
+def _positive(v: int) -> int:
+    if int(v) <= 0:
+        raise ValueError("must be > 0")
+    return int(v)
+
+
+def _dbfs(v: float) -> float:
+    if float(v) > 0:
+        raise ValueError("must be <= 0 dBFS")
+    return float(v)
+
+
+def _stripped(v: Any) -> str:
+    return "" if v is None else str(v).strip()
+
+
+def _cpu_list(v: Any) -> str:
+    # YAML may give [0, 1, 2]; stored as "0,1,2"
+    if isinstance(v, (list, tuple)):
+        v = ",".join(str(c) for c in v)
+    return _stripped(v)
+
+
+def _choice(*choices: str) -> Callable[[Any], str]:
+    def check(v: Any) -> str:
+        v = str(v).strip().lower()
+        if v not in choices:
+            raise ValueError(f"not one of {choices}")
+        return v
+
+    return check
+
+
+def _hotkey(v: str) -> str:
+    try:
+        from .hotkey_pynput import normalize_hotkey, validate_hotkey
+    except Exception:
+        return v  # best-effort: leave as-is if validation unavailable
+    norm = normalize_hotkey(v)
+    if not validate_hotkey(norm):
+        raise ValueError(f"invalid hotkey: {v}")
+    return norm
+
+
+def _default_blocklist() -> str:
+    # OS-specific default paste guard blocklist
+    if os.name == "nt" or sys.platform == "win32":
+        return "cmd.exe,powershell.exe,pwsh.exe,WindowsTerminal.exe,wt.exe,conhost.exe"
+    if sys.platform.startswith("linux"):
+        return (
+            "gnome-terminal,org.gnome.Terminal,konsole,xterm,alacritty,kitty,"
+            "wezterm,terminator,tilix,xfce4-terminal,lxterminal,io.elementary.terminal"
+        )
+    return "Terminal,iTerm2,com.apple.Terminal,com.googlecode.iterm2"
+
+
+# Precedence per field: explicit constructor argument > env > YAML > default.
+# The YAML key is the field name.
+FIELDS: Tuple[FieldSpec, ...] = (
+    # Core
+    FieldSpec("language", "ja", _text, "PT_LANGUAGE", validate=_nonempty),
+    FieldSpec("sample_rate", 16000, int, "PT_SAMPLE_RATE", validate=_positive),
+    FieldSpec("channels", 1, int, "PT_CHANNELS", validate=_positive),
+    FieldSpec("input_sample_rate", 0, int, "PT_INPUT_SAMPLE_RATE", validate=_nonneg),
+    FieldSpec("input_channels", 0, int, "PT_INPUT_CHANNELS", validate=_nonneg),
+    FieldSpec("input_device", "", _stripped, "PT_INPUT_DEVICE"),
+    FieldSpec("prebuffer_ms", 1000, int, "PT_PREBUFFER_MS"),
+    FieldSpec("min_capture_ms", 1800, int, "PT_MIN_CAPTURE_MS"),
+    FieldSpec("min_speech_ms", 150, int, "PT_MIN_SPEECH_MS", validate=_nonneg),
+    FieldSpec("model", "small", _text, "PT_MODEL", validate=_nonempty),
+    FieldSpec(
+        "decode_profile",
+        DEFAULT_DECODE_PROFILE,
+        _text,
+        "PT_DECODE_PROFILE",
+        validate=_choice(*DECODE_PROFILE_CHOICES),
+    ),
+    FieldSpec(
+        "partial_interval_ms", 0, int, "PT_PARTIAL_INTERVAL_MS", validate=_nonneg
+    ),
+    FieldSpec("long_form", True, _flag, "PT_LONG_FORM"),
+    FieldSpec("cpu_threads", 0, int, "PT_CPU_THREADS", validate=_nonneg),
+    FieldSpec("decode_workers", 0, int, "PT_DECODE_WORKERS", validate=_nonneg),
+    FieldSpec("cpu_affinity", "", _cpu_list, "PT_CPU_AFFINITY"),
+    FieldSpec("session_spill_s", 120, int, "PT_SESSION_SPILL_S", validate=_nonneg),
+    FieldSpec("session_max_s", 1800, int, "PT_SESSION_MAX_S", validate=_nonneg),
+    FieldSpec(
+        "session_cap_policy",
+        "truncate",
+        _text,
+        "PT_SESSION_CAP_POLICY",
+        validate=_choice("truncate", "window"),
+    ),
+    FieldSpec("model_dir", "", _stripped, "PT_MODEL_DIR"),
+    FieldSpec("offline", False, _flag, "PT_OFFLINE"),
+    FieldSpec("idle_unload_min", 0, int, "PT_IDLE_UNLOAD_MIN", validate=_nonneg),
+    FieldSpec(
+        "silence_floor_db", -60.0, float, "PT_SILENCE_FLOOR_DB", validate=_dbfs
+    ),
+    # UI
+    FieldSpec("mode", "hold", _text),
+    FieldSpec("hotkey", "ctrl+space", _text, validate=_hotkey),
+    FieldSpec("audio_feedback", True, _flag),
+    # Paste
+    FieldSpec("paste_guard", True, _flag, "PT_PASTE_GUARD"),
+    FieldSpec("paste_blocklist", _default_blocklist, _raw, "PT_PASTE_BLOCKLIST"),
+    FieldSpec("app_prompts", dict, lambda v: v or {}, "PT_APP_PROMPTS"),
+    # UI misc
+    FieldSpec(
+        "show_logo",
+        True,
+        _flag,
+        "PT_NO_LOGO",
+        env_coerce=lambda v: not is_env_enabled(v),
+    ),
+    FieldSpec("logo_style", "standard", _text, "PT_LOGO_STYLE", validate=_nonempty),
+    # Logging
+    FieldSpec("log_file", "", _stripped, "PT_LOG_FILE"),
+    FieldSpec("log_max_mb", 5, int, "PT_LOG_MAX_MB", validate=_nonneg),
+)
+FIELD_MAP: Dict[str, FieldSpec] = {f.name: f for f in FIELDS}
+
+
+def _resolve(
+    defaults: Dict[str, Any], yaml_data: Dict[str, Any], env_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Merge the layers field by field in one pass over the schema."""
+    vals: Dict[str, Any] = {}
+    for spec in FIELDS:
+        name = spec.name
+        default = defaults[name] if name in defaults else spec.default_value()
+        val = default
+        if name in yaml_data:
+            try:
+                val = spec.coerce(yaml_data[name])
+            except (TypeError, ValueError):
+                pass
+        if name in env_data:
+            val = env_data[name]
+        vals[name] = spec.finish(val, default)
+    return vals
+
+
+# ---- Resolved-value cache ----
+
+# Resolved values per (config file stamps, PT_* env, platform); Config()
+# then only stats the candidate files instead of reading and parsing them.
+_CACHE_MAX = 16
+_cache: Dict[tuple, Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_key(path: Optional[str]) -> tuple:
+    stamps = []
+    for p in [path] if path else default_config_paths():
+        try:
+            st = os.stat(p)
+            stamps.append((p, st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append((p, None, None))
+    env = tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith("PT_")))
+    return tuple(stamps), hash(env), sys.platform, os.name
+
+
+def clear_config_cache() -> None:
+    """Forget resolved configs (e.g. after writing a file within one mtime tick)."""
+    with _cache_lock:
+        _cache.clear()
+
+
 @dataclass
 class Config:
     # Core
     language: Optional[str] = None
     sample_rate: Optional[int] = None
     channels: Optional[int] = None
+    # Input device format; 0 = device native (converted to sample_rate/channels)
+    input_sample_rate: Optional[int] = None
+    input_channels: Optional[int] = None
+    # Input device by index or name part ("" = system default)
+    input_device: Optional[str] = None
     prebuffer_ms: Optional[int] = None
     min_capture_ms: Optional[int] = None
+    # Skip the decode when a recording has less speech than this (0 = off)
+    min_speech_ms: Optional[int] = None
     model: Optional[str] = None
+    decode_profile: Optional[str] = None  # 'fastest' | 'balanced' | 'accurate'
+    partial_interval_ms: Optional[int] = None  # 0 disables live partials
+    # Long-form: decode >30 s audio as parallel windows (needs 2+ decode
+    # workers; with one, Whisper's own sequential sliding window is used)
+    long_form: Optional[bool] = None
+    # Decoder CPU budget: ctranslate2 intra-op threads and inter-op workers
+    # (0 = auto from core count); optional affinity like "0-3,6"
+    cpu_threads: Optional[int] = None
+    decode_workers: Optional[int] = None
+    cpu_affinity: Optional[str] = None
+    # Session audio: spill to disk after N s; hard cap of N s (0 = unlimited)
+    session_spill_s: Optional[int] = None
+    session_max_s: Optional[int] = None
+    session_cap_policy: Optional[str] = None  # 'truncate' | 'window'
+    # Model store ("" = ~/.local/share/presstalk/models); offline loads only from it
+    model_dir: Optional[str] = None
+    offline: Optional[bool] = None
+    # Release the model after N minutes without a press (0 = keep loaded)
+    idle_unload_min: Optional[int] = None
+    # Skip the decode when a recording's peak stays below this (-90 = never)
+    silence_floor_db: Optional[float] = None
     # UI
     mode: Optional[str] = None
     hotkey: Optional[str] = None
@@ -26,94 +292,45 @@ class Config:
     # Paste
     paste_guard: Optional[bool] = None
     paste_blocklist: Optional[Any] = None
+    # Per-app initial prompts: {rule: prompt} or ["rule: prompt", ...]
+    app_prompts: Optional[Any] = None
     # UI misc
     show_logo: Optional[bool] = None
     logo_style: Optional[str] = None  # 'simple' (default) or 'standard'
+    # JSON-lines event log ("" = off), rotated at log_max_mb (0 = never)
+    log_file: Optional[str] = None
+    log_max_mb: Optional[int] = None
     # Source
     config_path: Optional[str] = None
 
     def __post_init__(self):
-        data = self._load_yaml(self.config_path)
-        defaults = self._get_defaults()
-        envs = self._load_env()
-        self._apply_overrides(defaults, data or {}, envs)
+        key = _cache_key(self.config_path)
+        with _cache_lock:
+            vals = _cache.get(key)
+        if vals is None:
+            vals = _resolve(
+                self._get_defaults(),
+                self._load_yaml(self.config_path) or {},
+                self._load_env(),
+            )
+            with _cache_lock:
+                if len(_cache) >= _CACHE_MAX:
+                    _cache.clear()
+                _cache[key] = vals
+        self._assign(vals)
 
     def _get_defaults(self) -> Dict[str, Any]:
-        lang = "ja"
-        sr = 16000
-        ch = 1
-        pre = 1000
-        mincap = 1800
-        mdl = "small"
-        mde = "hold"
-        hk = "ctrl+space"
-        pguard = True
-        afeedback = True
-        # OS-specific default paste guard blocklist
-        if os.name == "nt" or sys.platform == "win32":  # type: ignore[name-defined]
-            pblock = (
-                "cmd.exe,powershell.exe,pwsh.exe,WindowsTerminal.exe,wt.exe,conhost.exe"
-            )
-        elif sys.platform.startswith("linux"):
-            pblock = (
-                "gnome-terminal,org.gnome.Terminal,konsole,xterm,alacritty,kitty,"
-                "wezterm,terminator,tilix,xfce4-terminal,lxterminal,io.elementary.terminal"
-            )
-        else:
-            pblock = "Terminal,iTerm2,com.apple.Terminal,com.googlecode.iterm2"
-        slog = True
-        lstyle = "standard"
-        return {
-            "language": lang,
-            "sample_rate": sr,
-            "channels": ch,
-            "prebuffer_ms": pre,
-            "min_capture_ms": mincap,
-            "model": mdl,
-            "mode": mde,
-            "hotkey": hk,
-            "audio_feedback": afeedback,
-            "paste_guard": pguard,
-            "paste_blocklist": pblock,
-            "show_logo": slog,
-            "logo_style": lstyle,
-        }
+        return {spec.name: spec.default_value() for spec in FIELDS}
 
     def _load_env(self) -> Dict[str, Any]:
         out: Dict[str, Any] = {}
-        if (v := os.getenv("PT_LANGUAGE")) is not None:
-            out["language"] = v
-        if (v := os.getenv("PT_SAMPLE_RATE")) is not None:
+        for spec in FIELDS:
+            if spec.env is None or (v := os.getenv(spec.env)) is None:
+                continue
             try:
-                out["sample_rate"] = int(v)
-            except Exception:
+                out[spec.name] = (spec.env_coerce or spec.coerce)(v)
+            except (TypeError, ValueError):
                 pass
-        if (v := os.getenv("PT_CHANNELS")) is not None:
-            try:
-                out["channels"] = int(v)
-            except Exception:
-                pass
-        if (v := os.getenv("PT_PREBUFFER_MS")) is not None:
-            try:
-                out["prebuffer_ms"] = int(v)
-            except Exception:
-                pass
-        if (v := os.getenv("PT_MIN_CAPTURE_MS")) is not None:
-            try:
-                out["min_capture_ms"] = int(v)
-            except Exception:
-                pass
-        if (v := os.getenv("PT_MODEL")) is not None:
-            out["model"] = v
-        # paste guard envs
-        if (v := os.getenv("PT_PASTE_GUARD")) is not None:
-            out["paste_guard"] = is_env_enabled(v)
-        if (v := os.getenv("PT_PASTE_BLOCKLIST")) is not None:
-            out["paste_blocklist"] = v
-        if (v := os.getenv("PT_NO_LOGO")) is not None:
-            out["show_logo"] = not is_env_enabled(v)
-        if (v := os.getenv("PT_LOGO_STYLE")) is not None:
-            out["logo_style"] = v
         return out
 
     def _apply_overrides(
@@ -122,86 +339,26 @@ class Config:
         yaml_data: Dict[str, Any],
         env_data: Dict[str, Any],
     ) -> None:
-        # Start from defaults
-        vals: Dict[str, Any] = dict(defaults)
-        # YAML overlay with basic typing coercion where used previously
-        if yaml_data:
+        self._assign(_resolve(defaults, yaml_data or {}, env_data))
 
-            def pick_int(name, cur):
-                try:
-                    return int(yaml_data.get(name, cur))
-                except Exception:
-                    return cur
-
-            vals["language"] = yaml_data.get("language", vals["language"])
-            vals["sample_rate"] = pick_int("sample_rate", vals["sample_rate"])
-            vals["channels"] = pick_int("channels", vals["channels"])
-            vals["prebuffer_ms"] = pick_int("prebuffer_ms", vals["prebuffer_ms"])
-            vals["min_capture_ms"] = pick_int("min_capture_ms", vals["min_capture_ms"])
-            vals["model"] = yaml_data.get("model", vals["model"])
-            vals["mode"] = yaml_data.get("mode", vals["mode"])
-            vals["hotkey"] = yaml_data.get("hotkey", vals["hotkey"])
-            if "audio_feedback" in yaml_data:
+    def _assign(self, vals: Dict[str, Any]) -> None:
+        # fields set explicitly by the caller win, but are still normalised
+        for spec in FIELDS:
+            val = vals[spec.name]
+            cur = getattr(self, spec.name)
+            if cur is not None:
                 try:
-                    vals["audio_feedback"] = bool(yaml_data.get("audio_feedback"))
-                except Exception:
+                    val = spec.finish(spec.coerce(cur), val)
+                except (TypeError, ValueError):
                     pass
-            if "paste_guard" in yaml_data:
-                try:
-                    vals["paste_guard"] = bool(yaml_data.get("paste_guard"))
-                except Exception:
-                    pass
-            if "paste_blocklist" in yaml_data:
-                vals["paste_blocklist"] = yaml_data.get(
-                    "paste_blocklist", vals["paste_blocklist"]
-                )
-            if "show_logo" in yaml_data:
-                try:
-                    vals["show_logo"] = bool(yaml_data.get("show_logo"))
-                except Exception:
-                    pass
-            if "logo_style" in yaml_data:
-                try:
-                    ls = str(yaml_data.get("logo_style"))
-                    vals["logo_style"] = ls or vals["logo_style"]
-                except Exception:
-                    pass
-        # ENV overlay
-        for k, v in env_data.items():
-            vals[k] = v
-        # Assign to self when not explicitly set
-        self.language = self.language or vals["language"]
-        self.sample_rate = int(self.sample_rate or vals["sample_rate"])
-        self.channels = int(self.channels or vals["channels"])
-        self.prebuffer_ms = int(self.prebuffer_ms or vals["prebuffer_ms"])
-        self.min_capture_ms = int(self.min_capture_ms or vals["min_capture_ms"])
-        self.model = self.model or vals["model"]
-        self.mode = self.mode or vals["mode"]
-        self.hotkey = self.hotkey or vals["hotkey"]
-        if self.audio_feedback is None:
-            self.audio_feedback = bool(vals.get("audio_feedback", True))
-        # Normalize and validate hotkey specification
-        try:
-            from .hotkey_pynput import normalize_hotkey, validate_hotkey
-
-            if self.hotkey:
-                norm = normalize_hotkey(self.hotkey)
-                if validate_hotkey(norm):
-                    self.hotkey = norm
-                else:
-                    # fallback to safe default
-                    self.hotkey = vals["hotkey"]
-        except Exception:
-            # best-effort: leave as-is if validation unavailable
-            pass
-        if self.paste_guard is None:
-            self.paste_guard = vals["paste_guard"]
-        if self.paste_blocklist is None:
-            self.paste_blocklist = vals["paste_blocklist"]
-        if self.show_logo is None:
-            self.show_logo = vals["show_logo"]
-        if self.logo_style is None:
-            self.logo_style = vals["logo_style"]
+            elif isinstance(val, (dict, list)):
+                val = copy.deepcopy(val)  # cached values are shared
+            setattr(self, spec.name, val)
+
+    def to_dict(self, *names: str) -> Dict[str, Any]:
+        """YAML-ready values of `names` (all schema fields if none given)."""
+        keys = names or tuple(FIELD_MAP)
+        return {k: getattr(self, k) for k in keys}
 
     @property
     def bytes_per_second(self) -> int:
@@ -297,13 +454,7 @@ class Config:
             found = try_read(path)
             return found or {}
         # search defaults (do not auto-read CWD here; CLI may pass it explicitly)
-        candidates = []
-        # XDG
-        xdg = os.getenv("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
-        candidates.append(os.path.join(xdg, "presstalk", "config.yaml"))
-        # legacy home
-        candidates.append(os.path.expanduser("~/.presstalk.yaml"))
-        for p in candidates:
+        for p in default_config_paths():
             data = try_read(p)
             if data:
                 return data
@@ -0,0 +1,162 @@
+"""Watch the YAML config so `presstalk run` can apply edits live.
+
+On Linux the parent directories are watched with inotify (via libc, no extra
+dependency), so a save is noticed immediately; elsewhere, or if inotify is
+unavailable, the files' mtime/size are polled. Either way a change is only
+reported once the file has stopped changing for `debounce_s`, so a writer
+that truncates and rewrites in place is never seen half-written.
+"""
+
+import os
+import select
+import sys
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_INOTIFY_MASK = 0x08 | 0x40 | 0x80 | 0x100 | 0x200
+
+Stamp = Tuple[Optional[Tuple[int, int]], ...]
+
+
+def _inotify_open(dirs: Iterable[str]) -> Optional[int]:
+    """Non-blocking inotify fd watching `dirs`, or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        added = 0
+        for d in dirs:
+            if libc.inotify_add_watch(fd, os.fsencode(d), _INOTIFY_MASK) >= 0:
+                added += 1
+        if not added:
+            os.close(fd)
+            return None
+        return fd
+    except Exception:
+        return None
+
+
+class ConfigWatcher:
+    """Calls `on_change()` on a daemon thread whenever a watched file changes.
+
+    Missing files are fine: creating one counts as a change. `backend` is
+    "inotify" or "poll" once started.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        on_change: Callable[[], None],
+        *,
+        poll_s: float = 1.0,
+        debounce_s: float = 0.2,
+        use_inotify: bool = True,
+    ) -> None:
+        self.paths: List[str] = [os.path.abspath(p) for p in paths if p]
+        self._on_change = on_change
+        self._poll_s = max(0.01, float(poll_s))
+        self._debounce_s = max(0.0, float(debounce_s))
+        self._use_inotify = use_inotify
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._fd: Optional[int] = None
+        # self-pipe so stop() can interrupt select()
+        self._wake: Optional[Tuple[int, int]] = None
+        self._last: Stamp = ()
+        self.backend = "poll"
+
+    def start(self) -> "ConfigWatcher":
+        if self._use_inotify:
+            dirs = sorted({os.path.dirname(p) for p in self.paths})
+            self._fd = _inotify_open(d for d in dirs if os.path.isdir(d))
+        self.backend = "inotify" if self._fd is not None else "poll"
+        if self._fd is not None:
+            self._wake = os.pipe()
+        # taken here so an edit made right after start() is not missed
+        self._last = self.stamp()
+        self._thread = threading.Thread(
+            target=self._run, name="pt-config-watch", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._wake is not None:
+            os.write(self._wake[1], b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        fds = [self._fd] + list(self._wake or ())
+        self._fd = self._wake = None
+        for fd in fds:
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def stamp(self) -> Stamp:
+        out = []
+        for p in self.paths:
+            try:
+                st = os.stat(p)
+                out.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    def _wait(self) -> None:
+        # inotify only shortens the wait; the stamp comparison decides
+        fd, wake = self._fd, self._wake
+        if fd is None or wake is None:
+            self._stop.wait(self._poll_s)
+            return
+        try:
+            ready, _, _ = select.select([fd, wake[0]], [], [], self._poll_s)
+        except (OSError, ValueError):
+            self._stop.wait(self._poll_s)
+            return
+        if fd in ready:
+            self._drain()
+
+    def _drain(self) -> None:
+        fd = self._fd
+        if fd is None:
+            return
+        try:
+            while os.read(fd, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _run(self) -> None:
+        last = self._last
+        while not self._stop.is_set():
+            self._wait()
+            if self._stop.is_set():
+                return
+            cur = self.stamp()
+            if cur == last:
+                continue
+            # wait for the writer to finish
+            while not self._stop.wait(self._debounce_s):
+                settled = self.stamp()
+                if settled == cur:
+                    break
+                cur = settled
+            if self._stop.is_set():
+                return
+            self._drain()
+            last = cur
+            try:
+                self._on_change()
+            except Exception:
+                pass
@@ -6,6 +6,19 @@ FALSY_VALUES: Tuple[str, ...] = ("0", "false")
 # Supported Faster-Whisper model choices (used by CLI and Web UI)
 MODEL_CHOICES: Tuple[str, ...] = ("tiny", "base", "small", "medium", "large")
 
+# Decode profiles (latency vs accuracy); see engine/profiles.py
+DECODE_PROFILE_CHOICES: Tuple[str, ...] = ("fastest", "balanced", "accurate")
+DEFAULT_DECODE_PROFILE = "balanced"
+
+# Config keys edited by `presstalk config` and the web UI
+UI_CONFIG_KEYS: Tuple[str, ...] = (
+    "language",
+    "model",
+    "decode_profile",
+    "hotkey",
+    "audio_feedback",
+)
+
 # Representative language choices for UI menus (server accepts free-form)
 LANG_CHOICES: Tuple[str, ...] = (
     "en",
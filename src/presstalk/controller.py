@@ -1,17 +1,32 @@
-import time
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
+from .clock import SYSTEM_CLOCK, Clock
+from .levels import SpeechDetector
 from .ring_buffer import RingBuffer
 
 
 class AsrEngineProtocol:
-    def start_session(self, language: str = "ja") -> str: ...
+    def start_session(self, language: str = "ja", prompt=None) -> str: ...
     def push_audio(self, session_id: str, pcm_bytes: bytes) -> None: ...
     def finalize(self, session_id: str, timeout_s: float = 10.0) -> str: ...
     def close_session(self, session_id: str) -> None: ...
+    def partials(self, session_id: str) -> Iterator[str]: ...
 
 
 class Controller:
+    """Press/release state machine around one engine session.
+
+    With `min_speech_ms > 0` the pushed audio is run through an energy VAD
+    and a release with less speech than that (an accidental tap, room
+    noise) returns "" without decoding. `decodes_skipped` counts skipped
+    decodes and `skip_reason` tells why the last one was skipped
+    ("no_signal" or "no_speech"; None if it was decoded).
+
+    The press time and the `min_capture_ms` hold are measured with
+    `clock.now_ns()` and slept on `clock` (real time by default; a
+    VirtualClock in tests).
+    """
+
     def __init__(
         self,
         engine: AsrEngineProtocol,
@@ -21,16 +36,26 @@ class Controller:
         min_capture_ms: int = 1500,
         bytes_per_second: int = 32000,
         language: str = "ja",
+        prompt_fn: Optional[Callable[[], Optional[str]]] = None,
+        min_speech_ms: int = 0,
+        clock: Optional[Clock] = None,
     ) -> None:
         self.engine = engine
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
         self.ring = ring
         self.prebuffer_ms = int(prebuffer_ms)
         self.min_capture_ms = int(min_capture_ms)
         self.bytes_per_second = int(bytes_per_second)
         self.language = language
+        # resolved lazily by the engine (e.g. foreground-app prompt lookup)
+        self.prompt_fn = prompt_fn
         self._session: Optional[str] = None
-        self._press_at: float = 0.0
+        self._press_ns: int = 0
         self._recording: bool = False
+        self.min_speech_ms = int(min_speech_ms)
+        self.decodes_skipped = 0
+        self.skip_reason: Optional[str] = None
+        self._speech: Optional[SpeechDetector] = None
 
     def is_recording(self) -> bool:
         return self._recording
@@ -38,22 +63,44 @@ class Controller:
     def press(self) -> None:
         if self._recording:
             return
-        self._session = self.engine.start_session(language=self.language)
+        if self.prompt_fn is not None:
+            self._session = self.engine.start_session(
+                language=self.language, prompt=self.prompt_fn
+            )
+        else:
+            self._session = self.engine.start_session(language=self.language)
+        self.skip_reason = None
+        if self.min_speech_ms > 0:
+            self._speech = SpeechDetector(bytes_per_second=self.bytes_per_second)
+        else:
+            self._speech = None
         n = int(self.bytes_per_second * (self.prebuffer_ms / 1000.0))
         if n > 0:
             pre = self.ring.snapshot_tail(n)
             if pre:
                 self.engine.push_audio(self._session, pre)
-        self._press_at = time.time()
+                if self._speech is not None:
+                    self._speech.update(pre)
+        self._press_ns = self.clock.now_ns()
         self._recording = True
 
-    def release(self, *, timeout_s: float = 10.0) -> str:
+    def release(self, *, timeout_s: float = 10.0, skip_decode: bool = False) -> str:
+        """End the session and return its transcript.
+
+        With `skip_decode` the session is closed without running the engine
+        (e.g. the input had no signal) and "" is returned at once.
+        """
         if not self._recording or not self._session:
             return ""
+        if skip_decode:
+            return self._skip("no_signal")
         # respect minimum capture if needed (best-effort)
-        held_ms = int((time.time() - self._press_at) * 1000)
+        held_ms = (self.clock.now_ns() - self._press_ns) / 1e6
         if held_ms < self.min_capture_ms:
-            time.sleep((self.min_capture_ms - held_ms) / 1000.0)
+            self.clock.sleep((self.min_capture_ms - held_ms) / 1000.0)
+        speech = self._speech
+        if speech is not None and speech.speech_ms() < self.min_speech_ms:
+            return self._skip("no_speech")
 
         text = self.engine.finalize(self._session, timeout_s=timeout_s)
         self.engine.close_session(self._session)
@@ -61,6 +108,26 @@ class Controller:
         self._recording = False
         return text
 
+    def _skip(self, reason: str) -> str:
+        self.engine.close_session(self._session)
+        self._session = None
+        self._recording = False
+        self.decodes_skipped += 1
+        self.skip_reason = reason
+        return ""
+
+    def speech_ms(self) -> Optional[float]:
+        """Speech detected in the current/last session (None if the gate is off)."""
+        return self._speech.speech_ms() if self._speech is not None else None
+
+    def partials(self) -> Iterator[str]:
+        """Iterate partial hypotheses of the active session (if the engine streams them)."""
+        sid = self._session
+        fn = getattr(self.engine, "partials", None)
+        if not self._recording or not sid or fn is None:
+            return iter(())
+        return fn(sid)
+
     def live_push(self, pcm_bytes: bytes) -> None:
         """Push live PCM to the engine if a session is active."""
         if not self._recording or not self._session:
@@ -68,3 +135,5 @@ class Controller:
         if not pcm_bytes:
             return
         self.engine.push_audio(self._session, pcm_bytes)
+        if self._speech is not None:
+            self._speech.update(pcm_bytes)
@@ -0,0 +1,120 @@
+"""CPU budget for decoding: ctranslate2 threads, workers and affinity.
+
+`resolve_threads` turns the configured values (0 = auto) into a ThreadPlan
+sized from the cores the process may run on. Auto leaves about a quarter of
+those cores to foreground apps. `apply_affinity` pins the process where the
+OS supports it (Linux natively; Windows through psutil when installed).
+"""
+
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+
+@dataclass
+class ThreadPlan:
+    cpu_threads: int  # intra-op threads per worker (ctranslate2 cpu_threads)
+    num_workers: int  # inter-op workers / concurrent decodes (num_workers)
+    affinity: Optional[List[int]] = None  # pinned CPUs; None = unrestricted
+
+    def describe(self) -> str:
+        aff = format_cpu_list(self.affinity) if self.affinity else "all"
+        return (
+            f"cpu_threads={self.cpu_threads} num_workers={self.num_workers} "
+            f"affinity={aff}"
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "cpu_threads": self.cpu_threads,
+            "num_workers": self.num_workers,
+            "affinity": format_cpu_list(self.affinity) if self.affinity else "all",
+        }
+
+
+def parse_cpu_list(spec) -> List[int]:
+    """Parse '0-3,6' (or a list of ints) into a sorted CPU list."""
+    if not spec:
+        return []
+    if isinstance(spec, (list, tuple)):
+        return sorted({int(c) for c in spec})
+    cpus = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            a, b = part.split("-", 1)
+            lo, hi = int(a), int(b)
+            if hi < lo:
+                raise ValueError(f"bad CPU range: {part}")
+            cpus.update(range(lo, hi + 1))
+        else:
+            cpus.add(int(part))
+    if any(c < 0 for c in cpus):
+        raise ValueError("CPU ids must be >= 0")
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus: Sequence[int]) -> str:
+    out: List[str] = []
+    cpus = sorted(cpus)
+    i = 0
+    while i < len(cpus):
+        j = i
+        while j + 1 < len(cpus) and cpus[j + 1] == cpus[j] + 1:
+            j += 1
+        out.append(str(cpus[i]) if i == j else f"{cpus[i]}-{cpus[j]}")
+        i = j + 1
+    return ",".join(out)
+
+
+def available_cpus() -> List[int]:
+    try:
+        return sorted(os.sched_getaffinity(0))  # type: ignore[attr-defined]
+    except Exception:
+        return list(range(os.cpu_count() or 1))
+
+
+def resolve_threads(
+    cpu_threads: int = 0,
+    num_workers: int = 0,
+    affinity: Optional[Sequence[int]] = None,
+) -> ThreadPlan:
+    """Fill in auto (0) values from the number of usable cores."""
+    cores = len(affinity) if affinity else len(available_cpus())
+    cores = max(1, cores)
+    budget = max(1, cores - cores // 4)
+    workers = int(num_workers) if num_workers and num_workers > 0 else 0
+    if not workers:
+        workers = max(1, min(4, cores // 4))
+    threads = int(cpu_threads) if cpu_threads and cpu_threads > 0 else 0
+    if not threads:
+        threads = max(1, budget // workers)
+    return ThreadPlan(
+        cpu_threads=threads,
+        num_workers=workers,
+        affinity=sorted(affinity) if affinity else None,
+    )
+
+
+def apply_affinity(cpus: Sequence[int]) -> Optional[List[int]]:
+    """Pin this process to `cpus`; returns the effective set or None if unsupported."""
+    if not cpus:
+        return None
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, set(cpus))  # type: ignore[attr-defined]
+            return sorted(os.sched_getaffinity(0))  # type: ignore[attr-defined]
+        except Exception:
+            return None
+    try:
+        import psutil  # type: ignore
+    except Exception:
+        return None  # macOS has no affinity API; Windows needs psutil
+    try:
+        proc = psutil.Process()
+        proc.cpu_affinity(list(cpus))
+        return sorted(proc.cpu_affinity())
+    except Exception:
+        return None
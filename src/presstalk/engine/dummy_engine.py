@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Iterator, Optional
 
 
 class DummyAsrEngine:
@@ -6,7 +6,7 @@ class DummyAsrEngine:
         self._bufs: Dict[str, bytearray] = {}
         self._seq = 0
 
-    def start_session(self, language: str = "ja") -> str:
+    def start_session(self, language: str = "ja", prompt: Optional[str] = None) -> str:
         sid = f"s{self._seq}"
         self._seq += 1
         self._bufs[sid] = bytearray()
@@ -24,5 +24,8 @@ class DummyAsrEngine:
         total = len(buf) if buf is not None else 0
         return f"bytes={total}"
 
+    def partials(self, session_id: str) -> Iterator[str]:
+        return iter(())
+
     def close_session(self, session_id: str) -> None:
         self._bufs.pop(session_id, None)
@@ -1,4 +1,11 @@
-from typing import Optional
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+
+from .longform import WHISPER_WINDOW_S, merge_texts, plan_windows
+from .profiles import decode_options
 
 
 class FasterWhisperBackend:
@@ -6,23 +13,67 @@ class FasterWhisperBackend:
 
     Note: This module loads models during initialization for better user experience.
     It expects 16kHz mono PCM s16le bytes and returns a concatenated text.
+
+    With `num_workers > 1` and `long_form` enabled, audio longer than one
+    Whisper window is split at pauses into overlapping windows that are
+    decoded concurrently (ctranslate2 runs one replica per worker) and
+    merged with overlap deduplication. With a single worker the windows
+    would run one after another, which costs the same as Whisper's own
+    sequential 30 s sliding plus the overlap, so the audio is decoded in
+    one pass instead.
+
+    `profile` selects the decode options (see engine/profiles.py); an
+    explicit `beam_size` overrides the profile's beam width.
+
+    A per-call `prompt` becomes Whisper's initial prompt; its token ids are
+    cached so a repeated prompt is only tokenized once.
+
+    With `model_dir` set, an intact copy in that model store (see
+    presstalk/models.py) is loaded instead of the hub name; `offline` makes
+    a model missing from the store an error rather than a download.
+
+    `unload()` releases the model; the next `transcribe()` loads it again.
     """
 
+    _PROMPT_CACHE_MAX = 32
+
     def __init__(
         self,
         *,
         model: str = "small",
         device: Optional[str] = None,
         compute_type: Optional[str] = None,
-        beam_size: int = 1,
+        beam_size: Optional[int] = None,
+        profile: Optional[str] = None,
         show_progress: bool = False,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        long_form: bool = True,
+        window_s: float = 28.0,
+        overlap_s: float = 1.0,
+        model_dir: Optional[str] = None,
+        offline: bool = False,
     ) -> None:
         self._model_name = model
+        self._model_dir = model_dir
+        self._offline = bool(offline)
         self._device = device
         self._compute_type = compute_type
-        self._beam_size = int(beam_size)
+        self._beam_size = int(beam_size) if beam_size else None
+        self.set_profile(profile)
         self._show_progress = show_progress
+        self._cpu_threads = max(0, int(cpu_threads))
+        self._num_workers = max(1, int(num_workers))
+        self._long_form = bool(long_form)
+        self._window_s = min(float(window_s), WHISPER_WINDOW_S)
+        self._overlap_s = max(0.0, float(overlap_s))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._prompt_tokens: "OrderedDict[str, List[int]]" = OrderedDict()
+        # decode pool threads share the cache
+        self._prompt_lock = threading.Lock()
         self._model = None
+        self._source: Optional[str] = None
+        self._model_bytes: Optional[int] = None
 
         # Load model during initialization instead of lazy loading
         self._ensure_model()
@@ -42,7 +93,22 @@ class FasterWhisperBackend:
                 print(" FAILED")
             raise RuntimeError("faster-whisper is not installed") from e
 
+        source = self._model_name
+        if self._model_dir is not None or self._offline:
+            from ..models import resolve_model
+
+            try:
+                source = resolve_model(
+                    self._model_name, self._model_dir, offline=self._offline
+                )
+            except RuntimeError:
+                if self._show_progress:
+                    print(" FAILED")
+                raise
+
         kwargs = {}
+        if self._offline:
+            kwargs["local_files_only"] = True
         if self._device:
             kwargs["device"] = self._device
         if self._compute_type:
@@ -50,9 +116,14 @@ class FasterWhisperBackend:
         else:
             # Default to float32 to avoid ctranslate2 warnings about float16 conversion
             kwargs["compute_type"] = "float32"
+        if self._cpu_threads > 0:
+            kwargs["cpu_threads"] = self._cpu_threads
+        if self._num_workers > 1:
+            kwargs["num_workers"] = self._num_workers
 
+        self._source = source
         try:
-            self._model = WhisperModel(self._model_name, **kwargs)
+            self._model = WhisperModel(source, **kwargs)
             if self._show_progress:
                 print(" Ready!")
         except Exception as e:
@@ -60,12 +131,69 @@ class FasterWhisperBackend:
                 print(" FAILED")
             raise RuntimeError(f"Failed to load model '{self._model_name}': {e}") from e
 
+    def unload(self) -> None:
+        """Drop the model (and what depends on it) so its memory can be freed."""
+        self._model = None
+        self._prompt_tokens.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def model_bytes(self) -> Optional[int]:
+        """On-disk size of the loaded model directory, if it can be located."""
+        if self._model_bytes is None and self._source:
+            from ..models import dir_size
+
+            path = self._source
+            if not os.path.isdir(path):
+                try:
+                    from faster_whisper.utils import download_model  # type: ignore
+
+                    path = download_model(path, local_files_only=True)
+                except Exception:
+                    return None
+            self._model_bytes = dir_size(path)
+        return self._model_bytes
+
+    def set_profile(self, profile: Optional[str]) -> None:
+        self.profile = profile
+        self._decode_opts = decode_options(profile, beam_size=self._beam_size)
+
+    def _initial_prompt(self, prompt: Optional[str]) -> Union[str, List[int], None]:
+        if not prompt:
+            return None
+        with self._prompt_lock:
+            toks = self._prompt_tokens.get(prompt)
+            if toks is not None:
+                self._prompt_tokens.move_to_end(prompt)
+                return toks
+        try:
+            # same leading space faster-whisper adds before encoding a str prompt
+            toks = self._model.hf_tokenizer.encode(
+                " " + prompt.strip(), add_special_tokens=False
+            ).ids
+        except Exception:
+            return prompt  # let faster-whisper tokenize it
+        toks = list(toks)
+        with self._prompt_lock:
+            self._prompt_tokens[prompt] = toks
+            if len(self._prompt_tokens) > self._PROMPT_CACHE_MAX:
+                self._prompt_tokens.popitem(last=False)
+        return toks
+
     def transcribe(
-        self, pcm_bytes: bytes, *, sample_rate: int, language: str, model: str
+        self,
+        pcm_bytes: bytes,
+        *,
+        sample_rate: int,
+        language: str,
+        model: str,
+        prompt: Optional[str] = None,
     ) -> str:
         if not pcm_bytes:
             return ""
-        # Model is already loaded during initialization
+        # Loaded during initialization; only reloads after unload()
+        self._ensure_model()
         try:
             import numpy as np  # type: ignore
         except Exception as e:
@@ -73,12 +201,41 @@ class FasterWhisperBackend:
 
         # Convert s16le bytes to float32 mono in [-1,1]
         audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-        # Faster-Whisper handles resampling internally if needed, but we feed 16k ideally.
-        segments, info = self._model.transcribe(
-            audio,
-            language=language,
-            beam_size=self._beam_size,
+        if (
+            self._long_form
+            and self._num_workers > 1
+            and len(audio) > WHISPER_WINDOW_S * sample_rate
+        ):
+            return self._transcribe_long(audio, sample_rate, language, prompt)
+        return self._transcribe_one(audio, language, prompt)
+
+    def _transcribe_long(
+        self, audio, sample_rate: int, language: str, prompt: Optional[str] = None
+    ) -> str:
+        windows = plan_windows(
+            audio, sample_rate, window_s=self._window_s, overlap_s=self._overlap_s
+        )
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._num_workers, thread_name_prefix="pt-longform"
+            )
+        texts = list(
+            self._pool.map(
+                lambda w: self._transcribe_one(audio[w[0] : w[1]], language, prompt),
+                windows,
+            )
         )
+        return merge_texts(texts, language=language)
+
+    def _transcribe_one(
+        self, audio, language: str, prompt: Optional[str] = None
+    ) -> str:
+        opts = self._decode_opts
+        initial = self._initial_prompt(prompt)
+        if initial is not None:
+            opts = dict(opts, initial_prompt=initial)
+        # Faster-Whisper handles resampling internally if needed, but we feed 16k ideally.
+        segments, info = self._model.transcribe(audio, language=language, **opts)
         texts = []
         for seg in segments:
             # seg.text usually includes a leading space
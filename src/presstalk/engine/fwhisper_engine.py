@@ -1,5 +1,19 @@
-from typing import Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from ..clock import SYSTEM_CLOCK, elapsed_s
+from ..resample import ASR_SAMPLE_RATE, resample_pcm
+from ..session_buffer import SessionBuffer
+from .longform import joiner_for
+
+CAP_POLICIES = ("truncate", "window")
+
+# A session prompt, or a callable resolving it on first decode
+Prompt = Union[str, Callable[[], Optional[str]], None]
 
 
 class FasterWhisperEngine:
@@ -7,24 +21,94 @@ class FasterWhisperEngine:
 
     The backend must provide: transcribe(pcm_bytes, sample_rate, language, model) -> str
     This keeps tests lightweight and decoupled from the heavy dependency.
+    Session audio in any other format than 16 kHz mono is converted before
+    it reaches the backend.
+
+    When partial_interval_ms > 0, each session re-decodes its newest
+    `partial_window_s` of audio in the background at that cadence and
+    publishes changed hypotheses through `on_partial(session_id, text)` and
+    `partials(session_id)`. Partial decoding is throttled to at most
+    `partial_duty` of wall time. finalize stops it and waits for a partial
+    decode already in flight before the final decode starts, so the two
+    never run together; that wait is at most one trailing-window decode.
+
+    Session audio spills to a temp file past `spill_bytes` and is decoded
+    from an mmap. `max_bytes` caps a session: with cap_policy "truncate" only
+    the newest `max_bytes` are kept; with "window" each full window is
+    decoded in the background and finalize joins the window transcripts.
+
+    `start_session(prompt=...)` attaches an initial prompt to the session.
+    A callable prompt is resolved once, off the caller's thread, when the
+    session is first decoded.
+
+    A backend that loads in the background (see engine/loader.py) exposes
+    `is_ready()`/`wait_ready()`: sessions buffer audio as usual, partials
+    are skipped until it is ready, and finalize waits for the load out of
+    its `timeout_s` budget, returning "" if the model is not ready in
+    time. `touch()` is called on every new session so
+    an idle-unloaded model starts reloading at press time.
     """
 
-    def __init__(self, *, sample_rate: int, language: str, model: str, backend) -> None:
+    _PARTIAL_QUEUE_MAX = 32
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int,
+        language: str,
+        model: str,
+        backend,
+        channels: int = 1,
+        partial_interval_ms: int = 0,
+        on_partial: Optional[Callable[[str, str], None]] = None,
+        partial_duty: float = 0.5,
+        spill_bytes: int = 0,
+        max_bytes: int = 0,
+        cap_policy: str = "truncate",
+        partial_window_s: float = 10.0,
+    ) -> None:
+        if cap_policy not in CAP_POLICIES:
+            raise ValueError(f"cap_policy must be one of {CAP_POLICIES}")
         self.sample_rate = int(sample_rate)
         self.language = language
         self.model = model
         self.backend = backend
-        self._bufs: Dict[str, bytearray] = {}
-        self._seq = 0
+        self.channels = max(1, int(channels))
+        self.partial_interval_ms = max(0, int(partial_interval_ms))
+        self.on_partial = on_partial
+        self.partial_duty = min(1.0, max(0.05, float(partial_duty)))
+        frame = 2 * self.channels
+        window = int(max(0.5, float(partial_window_s)) * self.sample_rate) * frame
+        self.partial_window_bytes = window
+        self.spill_bytes = max(0, int(spill_bytes))
+        self.max_bytes = max(0, int(max_bytes))
+        self.cap_policy = cap_policy
+        self._bufs: Dict[str, SessionBuffer] = {}
+        self._windows: Dict[str, List[Tuple[Future, SessionBuffer]]] = {}
+        self._window_pool: Optional[ThreadPoolExecutor] = None
+        self._prompts: Dict[str, Prompt] = {}
+        self._prompt_lock = threading.Lock()
+        self._seq = itertools.count()  # next() is atomic; sessions may start concurrently
+        self._partial_q: Dict[str, "queue.Queue[Optional[str]]"] = {}
+        self._partial_stop: Dict[str, threading.Event] = {}
+        self._partial_threads: Dict[str, threading.Thread] = {}
 
-    def start_session(self, language: Optional[str] = None) -> str:
-        sid = f"fw{self._seq}"
-        self._seq += 1
-        self._bufs[sid] = bytearray()
+    def start_session(
+        self, language: Optional[str] = None, prompt: Prompt = None
+    ) -> str:
+        touch = getattr(self.backend, "touch", None)
+        if touch is not None:
+            touch()
+        sid = f"fw{next(self._seq)}"
+        self._bufs[sid] = self._new_buffer()
+        if prompt:
+            self._prompts[sid] = prompt
         # allow override language per-session if provided
         if language is not None:
             # set per-instance language for simplicity; production could store per-session opts
             self.language = language
+        if self.partial_interval_ms > 0:
+            self._start_partials(sid)
         return sid
 
     def push_audio(self, session_id: str, pcm_bytes: bytes) -> None:
@@ -33,28 +117,217 @@ class FasterWhisperEngine:
             return
         if pcm_bytes:
             buf.extend(pcm_bytes)
+            if (
+                self.cap_policy == "window"
+                and self.max_bytes
+                and len(buf) >= self.max_bytes
+            ):
+                self._roll_window(session_id)
+
+    def partials(self, session_id: str) -> Iterator[str]:
+        """Yield partial hypotheses for a session until it is finalized/closed."""
+        q = self._partial_q.get(session_id)
+        if q is None:
+            return
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            yield item
 
     def finalize(self, session_id: str, timeout_s: float = 10.0) -> str:
+        # the final decode must not queue behind a partial on the same model;
+        # time spent waiting for it comes out of the decode budget
+        t0 = time.monotonic()
+        self._stop_partials(session_id, join_s=timeout_s)
+        budget = max(0.0, timeout_s - (time.monotonic() - t0))
         buf = self._bufs.get(session_id)
         if buf is None:
             return ""
+        deadline = time.monotonic() + budget
+        if not self._await_backend(budget):
+            return ""
+        texts = [
+            self._window_result(fut, deadline)
+            for fut, _ in self._windows.get(session_id, ())
+        ]
         try:
             with ThreadPoolExecutor(max_workers=1) as ex:
-                fut = ex.submit(
-                    self.backend.transcribe,
-                    bytes(buf),
-                    sample_rate=self.sample_rate,
-                    language=self.language,
-                    model=self.model,
-                )
+                fut = ex.submit(self._decode_session, session_id, buf)
                 try:
-                    return fut.result(timeout=timeout_s)
+                    texts.append(
+                        fut.result(timeout=max(0.0, deadline - time.monotonic()))
+                    )
                 except FutureTimeout:
-                    return ""
+                    pass
                 except Exception:
-                    return ""
+                    pass
         except Exception:
-            return ""
+            pass
+        if len(texts) <= 1:
+            return texts[0] if texts else ""
+        return joiner_for(self.language).join(
+            t.strip() for t in texts if t and t.strip()
+        )
+
+    def _await_backend(self, timeout_s: float) -> bool:
+        """Wait up to `timeout_s` for a background load; False if not ready."""
+        wait = getattr(self.backend, "wait_ready", None)
+        return wait is None or bool(wait(timeout_s))
+
+    def _backend_ready(self) -> bool:
+        ready = getattr(self.backend, "is_ready", None)
+        return ready is None or bool(ready())
+
+    def _decode(self, pcm: bytes, prompt: Optional[str] = None) -> str:
+        sr = self.sample_rate
+        if (sr, self.channels) != (ASR_SAMPLE_RATE, 1):
+            pcm = resample_pcm(pcm, in_rate=sr, in_channels=self.channels)
+            sr = ASR_SAMPLE_RATE
+        # only pass prompt when set; keeps prompt-unaware backends working
+        extra = {"prompt": prompt} if prompt else {}
+        return self.backend.transcribe(
+            pcm, sample_rate=sr, language=self.language, model=self.model, **extra
+        )
+
+    def _decode_session(
+        self, sid: str, buf: SessionBuffer, tail_bytes: int = 0
+    ) -> str:
+        prompt = self._session_prompt(sid)
+        with buf.view() as pcm:
+            if tail_bytes and len(pcm) > tail_bytes:
+                pcm = pcm[-tail_bytes:]  # both lengths are whole frames
+            return self._decode(pcm, prompt)
+
+    def _session_prompt(self, sid: str) -> Optional[str]:
+        p = self._prompts.get(sid)
+        if not callable(p):
+            return p
+        with self._prompt_lock:
+            p = self._prompts.get(sid)
+            if callable(p):
+                try:
+                    p = p() or None
+                except Exception:
+                    p = None
+                if sid in self._prompts:
+                    self._prompts[sid] = p
+        return p
 
     def close_session(self, session_id: str) -> None:
-        self._bufs.pop(session_id, None)
+        self._stop_partials(session_id)
+        self._partial_q.pop(session_id, None)
+        self._prompts.pop(session_id, None)
+        for fut, wbuf in self._windows.pop(session_id, ()):
+            if fut.cancel():
+                wbuf.close()
+        buf = self._bufs.pop(session_id, None)
+        if buf is not None:
+            buf.close()
+
+    # ---- session storage ----
+
+    def _new_buffer(self) -> SessionBuffer:
+        return SessionBuffer(
+            spill_bytes=self.spill_bytes,
+            max_bytes=self.max_bytes if self.cap_policy == "truncate" else 0,
+            align=2 * self.channels,
+        )
+
+    def _roll_window(self, sid: str) -> None:
+        """Hand the full window to the background decoder and start a new one."""
+        full = self._bufs[sid]
+        self._bufs[sid] = self._new_buffer()
+        if self._window_pool is None:
+            self._window_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pt-window"
+            )
+
+        def _run() -> str:
+            try:
+                return self._decode_session(sid, full)
+            finally:
+                full.close()
+
+        fut = self._window_pool.submit(_run)
+        self._windows.setdefault(sid, []).append((fut, full))
+
+    @staticmethod
+    def _window_result(fut: Future, deadline: float) -> str:
+        try:
+            return fut.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception:
+            return ""
+
+    # ---- partial hypotheses ----
+
+    def _start_partials(self, sid: str) -> None:
+        self._partial_q[sid] = queue.Queue(maxsize=self._PARTIAL_QUEUE_MAX)
+        stop = threading.Event()
+        self._partial_stop[sid] = stop
+        t = threading.Thread(
+            target=self._partial_loop, args=(sid, stop), name="pt-partial", daemon=True
+        )
+        self._partial_threads[sid] = t
+        t.start()
+
+    def _stop_partials(self, sid: str, join_s: float = 0.0) -> None:
+        """Stop the session's partial loop; with `join_s`, wait for a decode in flight."""
+        stop = self._partial_stop.pop(sid, None)
+        t = self._partial_threads.pop(sid, None)
+        if stop is None:
+            return
+        stop.set()
+        self._publish(sid, None)
+        if join_s > 0 and t is not None and t is not threading.current_thread():
+            t.join(join_s)
+
+    def _publish(self, sid: str, item: Optional[str]) -> None:
+        q = self._partial_q.get(sid)
+        if q is None:
+            return
+        # keep the newest items; drop the oldest when no consumer keeps up
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _partial_loop(self, sid: str, stop: threading.Event) -> None:
+        interval = self.partial_interval_ms / 1000.0
+        delay = interval
+        last_len = 0
+        last_text = ""
+        while not stop.wait(delay):
+            buf = self._bufs.get(sid)
+            if buf is None:
+                return
+            n = len(buf)
+            if n == last_len or not self._backend_ready():
+                delay = interval
+                continue
+            if stop.is_set():
+                return
+            t0 = SYSTEM_CLOCK.now_ns()
+            try:
+                text = self._decode_session(sid, buf, self.partial_window_bytes)
+            except Exception:
+                text = ""
+            spent = elapsed_s(t0, SYSTEM_CLOCK.now_ns())
+            last_len = n
+            if stop.is_set():
+                return  # finalize started; a stale partial is useless now
+            if text and text != last_text:
+                last_text = text
+                self._publish(sid, text)
+                if self.on_partial is not None:
+                    try:
+                        self.on_partial(sid, text)
+                    except Exception:
+                        pass
+            # duty-cycle throttle: idle long enough that decoding uses <= partial_duty
+            delay = max(interval, spent * (1.0 - self.partial_duty) / self.partial_duty)
@@ -0,0 +1,283 @@
+"""Background model loading with a readiness gate and idle unload.
+
+`BackgroundBackend` builds the real backend on a daemon thread so capture
+and the hotkey can go live immediately. Sessions keep buffering audio while
+the model loads; `transcribe()` blocks until it is ready, and the engine
+waits on `wait_ready()` before starting its finalize timeout.
+
+With `idle_unload_s > 0` the model is dropped after that long without use
+and rebuilt in the background on the next `touch()` (a new session), so a
+press made while it reloads is buffered exactly like one made at startup.
+A failed load is retried the same way: the next `touch()` after a backoff
+(`retry_s`, doubling per consecutive failure up to `retry_max_s`) starts a
+fresh load, so a transient error does not need a restart.
+`swap()` replaces the factory when the configuration changes, reloading
+only when asked to (a different model).
+"""
+
+import gc
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..clock import SYSTEM_CLOCK, elapsed_s
+
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+UNLOADED = "unloaded"
+
+# on_state(state, info): info carries "elapsed_s", "reload" (not the first
+# load) and, depending on the state, "error" and "retry_s", "model_bytes" or
+# "idle_s"
+StateCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class BackgroundBackend:
+    """Backend proxy that loads `factory()` off the caller's thread.
+
+    `on_state` is called with "loading" when a load starts and again every
+    `progress_s` while it runs, then once with "ready" or "failed", and with
+    "unloaded" when an idle model is released.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        *,
+        on_state: Optional[StateCallback] = None,
+        progress_s: float = 5.0,
+        idle_unload_s: float = 0.0,
+        retry_s: float = 5.0,
+        retry_max_s: float = 300.0,
+    ) -> None:
+        self._factory = factory
+        self._on_state = on_state
+        self._progress_s = max(0.05, float(progress_s))
+        self._idle_s = max(0.0, float(idle_unload_s))
+        self._retry_s = max(0.0, float(retry_s))
+        self._retry_max_s = max(self._retry_s, float(retry_max_s))
+        self._failures = 0
+        self._retry_at = 0.0  # monotonic time after which a failed load reruns
+        self._backend: Any = None
+        self._done = threading.Event()
+        # guards state transitions; on_state runs under it so events stay ordered
+        self._lock = threading.RLock()
+        self._busy = 0
+        self._last_used = time.monotonic()
+        self._loads = 0
+        # bumped by swap() so a superseded load discards its result
+        self._gen = 0
+        self._t0 = 0  # now_ns() at load start
+        self.state = LOADING
+        self.error: Optional[str] = None
+        self.load_s: Optional[float] = None
+
+    def start(self) -> "BackgroundBackend":
+        with self._lock:
+            self._start_load()
+        if self._idle_s > 0:
+            threading.Thread(
+                target=self._idle_loop, name="pt-model-idle", daemon=True
+            ).start()
+        return self
+
+    def is_ready(self) -> bool:
+        return self.state == READY
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the load settles; True only if the model is usable."""
+        with self._lock:
+            self._reload_if_due()
+        self._done.wait(timeout)
+        return self.is_ready()
+
+    def touch(self) -> None:
+        """Mark activity; reloads an unloaded model or retries a failed one."""
+        with self._lock:
+            self._last_used = time.monotonic()
+            self._reload_if_due()
+
+    def swap(
+        self,
+        factory: Callable[[], Any],
+        *,
+        reload: bool = True,
+        on_state: Optional[StateCallback] = None,
+    ) -> None:
+        """Use `factory` from now on; with `reload`, replace the loaded model.
+
+        A decode already running keeps the old model until it returns; the
+        old model is released once it is no longer busy.
+        """
+        with self._lock:
+            self._factory = factory
+            if on_state is not None:
+                self._on_state = on_state
+            if not reload:
+                return
+            old, self._backend = self._backend, None
+            busy = self._busy
+            self._gen += 1
+            self._failures = 0
+            self._start_load()
+        unload = getattr(old, "unload", None)
+        if unload is not None and not busy:
+            try:
+                unload()
+            except Exception:
+                pass
+        del old
+        gc.collect()
+
+    def elapsed_s(self) -> float:
+        if self.load_s is not None:
+            return self.load_s
+        return elapsed_s(self._t0, SYSTEM_CLOCK.now_ns()) if self._t0 else 0.0
+
+    def transcribe(self, pcm_bytes: bytes, **kwargs: Any) -> str:
+        backend = self._acquire(busy=True)
+        try:
+            return backend.transcribe(pcm_bytes, **kwargs)
+        finally:
+            with self._lock:
+                self._busy -= 1
+                self._last_used = time.monotonic()
+
+    def __getattr__(self, name: str) -> Any:
+        # only reached for attributes not defined here (e.g. set_profile)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._acquire(), name)
+
+    def _acquire(self, busy: bool = False) -> Any:
+        while True:
+            with self._lock:
+                self._reload_if_due()
+                if self._done.is_set():
+                    if self._backend is None:
+                        raise RuntimeError(f"model failed to load: {self.error}")
+                    if busy:
+                        self._busy += 1
+                    return self._backend
+            self._done.wait()
+
+    # ---- loading ----
+
+    def _reload_if_due(self) -> None:
+        # caller holds self._lock
+        if self.state == UNLOADED:
+            self._start_load()
+        elif self.state == FAILED and time.monotonic() >= self._retry_at:
+            self._start_load()
+
+    def _start_load(self) -> None:
+        # caller holds self._lock
+        self._done.clear()
+        self.state = LOADING
+        self.error = None
+        self.load_s = None
+        self._t0 = SYSTEM_CLOCK.now_ns()
+        self._loads += 1
+        self._emit(LOADING)
+        threading.Thread(
+            target=self._load,
+            args=(self._gen, self._factory),
+            name="pt-model-load",
+            daemon=True,
+        ).start()
+        if self._on_state is not None:
+            threading.Thread(
+                target=self._ticker,
+                args=(self._gen,),
+                name="pt-model-progress",
+                daemon=True,
+            ).start()
+
+    def _load(self, gen: int, factory: Callable[[], Any]) -> None:
+        try:
+            backend = factory()
+            error = None
+        except Exception as e:
+            backend = None
+            error = str(e) or e.__class__.__name__
+        load_s = elapsed_s(self._t0, SYSTEM_CLOCK.now_ns())
+        extra: Dict[str, Any] = {}
+        size = getattr(backend, "model_bytes", None)
+        if size is not None:
+            try:
+                extra["model_bytes"] = size()
+            except Exception:
+                pass
+        with self._lock:
+            if gen != self._gen:
+                return  # superseded by swap(); its own load reports
+            self._backend = backend
+            self.error = error
+            self.load_s = load_s
+            self.state = READY if backend is not None else FAILED
+            self._last_used = time.monotonic()
+            if backend is None:
+                self._failures += 1
+                backoff = min(
+                    self._retry_max_s, self._retry_s * 2 ** (self._failures - 1)
+                )
+                self._retry_at = self._last_used + backoff
+                extra["retry_s"] = backoff
+            else:
+                self._failures = 0
+            self._done.set()
+            self._emit(self.state, **extra)
+
+    def _ticker(self, gen: int) -> None:
+        while not self._done.wait(self._progress_s) and gen == self._gen:
+            with self._lock:
+                # the load may have settled while we waited for the lock
+                if not self._done.is_set() and gen == self._gen:
+                    self._emit(LOADING)
+
+    # ---- idle unload ----
+
+    def _idle_loop(self) -> None:
+        check_s = min(30.0, max(0.01, self._idle_s / 4))
+        while True:
+            time.sleep(check_s)
+            self._maybe_unload()
+
+    def _maybe_unload(self) -> bool:
+        with self._lock:
+            idle = time.monotonic() - self._last_used
+            if self.state != READY or self._busy or idle < self._idle_s:
+                return False
+            backend, self._backend = self._backend, None
+            self.state = UNLOADED
+            self.load_s = None
+            self._t0 = 0
+            self._done.clear()
+        unload = getattr(backend, "unload", None)
+        if unload is not None:
+            try:
+                unload()
+            except Exception:
+                pass
+        del backend
+        gc.collect()
+        with self._lock:
+            if self.state == UNLOADED:
+                self._emit(UNLOADED, idle_s=round(idle, 1))
+        return True
+
+    def _emit(self, state: str, **extra: Any) -> None:
+        if self._on_state is None:
+            return
+        info: Dict[str, Any] = {
+            "elapsed_s": round(self.elapsed_s(), 1),
+            "reload": self._loads > 1,
+            **extra,
+        }
+        if state == FAILED:
+            info["error"] = self.error
+        try:
+            self._on_state(state, info)
+        except Exception:
+            pass
@@ -0,0 +1,103 @@
+"""Long-form helpers: split audio at pauses and merge overlapping transcripts.
+
+Whisper decodes 30 s at a time and slides sequentially over longer input.
+`plan_windows` cuts long audio into independent windows that end in the
+quietest stretch near the window limit, each starting a little before the
+previous cut, so the windows can be decoded in parallel. `merge_texts`
+joins the window transcripts and drops words repeated by the overlap.
+"""
+
+import unicodedata
+from typing import List, Sequence, Tuple
+
+# Languages whose transcripts are not space-delimited
+NO_SPACE_LANGS = ("ja", "zh", "th")
+
+# Whisper's native window
+WHISPER_WINDOW_S = 30.0
+
+
+def joiner_for(language: str) -> str:
+    return "" if (language or "").lower() in NO_SPACE_LANGS else " "
+
+
+def plan_windows(
+    audio,
+    sample_rate: int,
+    *,
+    window_s: float = 28.0,
+    overlap_s: float = 1.0,
+    search_s: float = 8.0,
+    frame_ms: int = 20,
+    pause_ms: int = 300,
+) -> List[Tuple[int, int]]:
+    """Return (start, end) sample ranges covering `audio`.
+
+    Each window is at most `window_s` long. Its end is placed at the
+    lowest-energy `pause_ms` stretch within the last `search_s` seconds, and
+    the next window starts `overlap_s` before that cut.
+    """
+    import numpy as np  # type: ignore
+
+    n = len(audio)
+    max_len = int(window_s * sample_rate)
+    if n <= max_len:
+        return [(0, n)]
+    overlap = int(overlap_s * sample_rate)
+    frame = max(1, sample_rate * frame_ms // 1000)
+    # per-frame energy, smoothed over pause_ms so a cut lands inside a pause
+    # rather than on one quiet frame between syllables
+    n_frames = n // frame
+    x = np.asarray(audio[: n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+    energy = np.einsum("ij,ij->i", x, x)
+    k = max(1, pause_ms // frame_ms)
+    smooth = np.convolve(energy, np.ones(k, dtype=np.float32) / k, mode="same")
+    search = max(frame, min(int(search_s * sample_rate), max_len - overlap - frame))
+
+    out: List[Tuple[int, int]] = []
+    start = 0
+    while n - start > max_len:
+        hi = (start + max_len) // frame
+        lo = max(start // frame + 1, (start + max_len - search) // frame)
+        cut = (lo + int(np.argmin(smooth[lo:hi]))) * frame if hi > lo else hi * frame
+        out.append((start, cut))
+        start = max(start + frame, cut - overlap)
+    out.append((start, n))
+    return out
+
+
+def _norm(unit: str) -> str:
+    return "".join(
+        c for c in unit.casefold() if not unicodedata.category(c).startswith("P")
+    )
+
+
+def _overlap_len(prev: Sequence[str], nxt: Sequence[str], lo: int, hi: int) -> int:
+    hi = min(hi, len(prev), len(nxt))
+    a = [_norm(u) for u in prev[-hi:]] if hi else []
+    b = [_norm(u) for u in nxt[:hi]]
+    for k in range(hi, lo - 1, -1):
+        if a[len(a) - k :] == b[:k] and any(b[:k]):
+            return k
+    return 0
+
+
+def merge_texts(
+    texts: Sequence[str], *, language: str = "", max_overlap: int = 12
+) -> str:
+    """Join window transcripts, dropping the longest repeated overlap."""
+    sep = joiner_for(language)
+    merged: List[str] = []
+    for text in texts:
+        text = (text or "").strip()
+        if not text:
+            continue
+        if sep:
+            units = text.split()
+            k = _overlap_len(merged, units, 1, max_overlap)
+        else:
+            # character overlap; require 2+ chars to avoid eating particles
+            units = list(text)
+            k = _overlap_len(merged, units, 2, max_overlap * 3)
+        merged.extend(units[k:])
+    return sep.join(merged)
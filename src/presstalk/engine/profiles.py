@@ -0,0 +1,49 @@
+"""Named decode profiles mapping to faster-whisper `transcribe()` options.
+
+faster-whisper's defaults favour long-form accuracy: a 6-step temperature
+fallback (each step is a full re-decode), conditioning on previous text
+and timestamp tokens. Push-to-talk dictation is short, so the faster
+profiles drop the work that rarely pays off for it.
+"""
+
+from typing import Any, Dict, Optional
+
+from ..constants import DEFAULT_DECODE_PROFILE
+
+DECODE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Greedy, single pass: no fallback re-decodes, no timestamp tokens
+    "fastest": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+    },
+    # Greedy with one fallback step for garbled/looping output
+    "balanced": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": (0.0, 0.4),
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+    },
+    # Beam search with faster-whisper's full fallback schedule
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "without_timestamps": False,
+    },
+}
+
+
+def decode_options(
+    profile: Optional[str] = None, *, beam_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Return transcribe() kwargs for `profile` (unknown names use the default)."""
+    name = (profile or DEFAULT_DECODE_PROFILE).strip().lower()
+    opts = dict(DECODE_PROFILES.get(name, DECODE_PROFILES[DEFAULT_DECODE_PROFILE]))
+    if beam_size:
+        opts["beam_size"] = int(beam_size)
+    return opts
@@ -0,0 +1,213 @@
+"""Input level statistics for s16le PCM, computed on the capture thread.
+
+Each chunk is read through a zero-copy NumPy view of the bytes: the mean
+square is one einsum accumulated in int64 (exact, no widened copy of the
+chunk), the peak is a min/max pass, and clipped samples are only counted
+when the peak reaches full scale. Results go into a `LevelMeter`, which
+keeps a short rolling window for the live meter and running totals for the
+current recording.
+
+`SpeechDetector` estimates how much of a recording is speech from 10 ms
+frame energies, so the controller can skip decoding taps and room noise.
+"""
+
+import math
+import sys
+from array import array
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy is a runtime dependency
+    np = None  # type: ignore
+
+# Input level floor reported for digital silence
+LEVEL_FLOOR_DB = -90.0
+# |sample| at or above this counts as clipped
+CLIP_LEVEL = 32767
+_FULL_SCALE = 32768.0
+
+
+class ChunkLevels(NamedTuple):
+    samples: int
+    mean_square: float
+    peak: int
+    clipped: int
+
+
+def chunk_levels(pcm: bytes) -> ChunkLevels:
+    """Sample count, mean square, peak |sample| and clipped samples of s16le PCM."""
+    n = len(pcm) // 2
+    if n == 0:
+        return ChunkLevels(0, 0.0, 0, 0)
+    if np is not None:
+        x = np.frombuffer(pcm, dtype="<i2", count=n)
+        ms = float(np.einsum("i,i->", x, x, dtype=np.int64)) / n
+        peak = max(int(x.max()), -int(x.min()))
+        clipped = 0
+        if peak >= CLIP_LEVEL:
+            clipped = int(np.count_nonzero(x >= CLIP_LEVEL))
+            clipped += int(np.count_nonzero(x <= -CLIP_LEVEL))
+        return ChunkLevels(n, ms, peak, clipped)
+    samples = array("h")
+    samples.frombytes(pcm[: n * 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    peak = max(abs(s) for s in samples)
+    clipped = (
+        sum(1 for s in samples if abs(s) >= CLIP_LEVEL) if peak >= CLIP_LEVEL else 0
+    )
+    return ChunkLevels(n, sum(s * s for s in samples) / n, peak, clipped)
+
+
+def to_dbfs(amplitude: float) -> float:
+    """Amplitude (in s16 units) as dBFS, floored at LEVEL_FLOOR_DB."""
+    if amplitude <= 0:
+        return LEVEL_FLOOR_DB
+    return max(LEVEL_FLOOR_DB, round(20.0 * math.log10(amplitude / _FULL_SCALE), 1))
+
+
+def level_dbfs(pcm: bytes) -> float:
+    """RMS level of s16le PCM in dBFS."""
+    lv = chunk_levels(pcm)
+    return to_dbfs(math.sqrt(lv.mean_square))
+
+
+class LevelMeter:
+    """Rolling input level, peak and clipping statistics.
+
+    `update()` is called by the capture thread only; readers get plain
+    values from `snapshot()` (the last `window` chunks) and `session()`
+    (everything since `reset()`). State is replaced, never mutated in
+    place, so readers need no lock.
+    """
+
+    def __init__(self, *, window: int = 10) -> None:
+        self._recent: "deque[ChunkLevels]" = deque(maxlen=max(1, int(window)))
+        self._session = (
+            0,
+            0.0,
+            0,
+            0,
+            0,
+        )  # samples, sum of squares, peak, clipped, chunks
+        self._last: Optional[ChunkLevels] = None
+
+    def reset(self) -> None:
+        """Start a new session (e.g. on hotkey press)."""
+        self._session = (0, 0.0, 0, 0, 0)
+
+    def update(self, pcm: bytes) -> ChunkLevels:
+        lv = chunk_levels(pcm)
+        if lv.samples:
+            self._recent.append(lv)
+            self._last = lv
+            n, sq, peak, clipped, chunks = self._session
+            self._session = (
+                n + lv.samples,
+                sq + lv.mean_square * lv.samples,
+                max(peak, lv.peak),
+                clipped + lv.clipped,
+                chunks + 1,
+            )
+        return lv
+
+    def snapshot(self) -> Dict[str, float]:
+        """Live meter values: last chunk level, rolling peak, clipping flag."""
+        recent = list(self._recent)
+        last = self._last
+        return {
+            "level_db": (
+                to_dbfs(math.sqrt(last.mean_square)) if last else LEVEL_FLOOR_DB
+            ),
+            "peak_db": to_dbfs(max((c.peak for c in recent), default=0)),
+            "clipping": any(c.clipped for c in recent),
+        }
+
+    def session(self) -> Dict[str, float]:
+        """Totals since reset(): RMS/peak level, clipped samples, chunks."""
+        n, sq, peak, clipped, chunks = self._session
+        return {
+            "rms_db": to_dbfs(math.sqrt(sq / n)) if n else LEVEL_FLOOR_DB,
+            "peak_db": to_dbfs(peak),
+            "clipped": clipped,
+            "chunks": chunks,
+        }
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if np is not None:
+        return float(np.percentile(np.asarray(values), q))
+    ordered = sorted(values)
+    return ordered[int(round(q / 100.0 * (len(ordered) - 1)))]
+
+
+class SpeechDetector:
+    """Energy VAD: milliseconds of a recording that stand out from its noise.
+
+    Frame energies are collected as audio arrives (`update`, on the capture
+    thread). `speech_ms()` takes the 10th percentile of the frame levels as
+    the noise floor and counts frames at least `margin_db` above it and
+    above `floor_db`. Silence and steady noise (fans, hum) have almost no
+    such frames; speech has syllables well above the pauses between them.
+    A recording with no pauses has no quiet frames to set the floor, so
+    frames at or above `voiced_db` count as speech regardless.
+    """
+
+    def __init__(
+        self,
+        *,
+        bytes_per_second: int = 32000,
+        frame_ms: int = 10,
+        margin_db: float = 10.0,
+        floor_db: float = -55.0,
+        voiced_db: float = -35.0,
+    ) -> None:
+        self.frame_ms = int(frame_ms)
+        self._frame = max(2, int(bytes_per_second * frame_ms / 1000) // 2 * 2)
+        self.margin_db = float(margin_db)
+        self.floor_db = float(floor_db)
+        self.voiced_db = float(voiced_db)
+        self.reset()
+
+    def reset(self) -> None:
+        self._levels: List[float] = []
+        self._tail = b""
+
+    def update(self, pcm: bytes) -> None:
+        if self._tail:
+            pcm = self._tail + pcm
+        n = len(pcm) // self._frame
+        self._tail = pcm[n * self._frame :]
+        if n == 0:
+            return
+        fs = self._frame // 2
+        if np is not None:
+            x = np.frombuffer(pcm, dtype="<i2", count=n * fs).reshape(n, fs)
+            e = np.einsum("ij,ij->i", x, x, dtype=np.int64) / (fs * _FULL_SCALE**2)
+            self._levels.extend((10.0 * np.log10(np.maximum(e, 1e-10))).tolist())
+            return
+        for i in range(n):
+            ms = chunk_levels(pcm[i * self._frame : (i + 1) * self._frame])
+            e = ms.mean_square / _FULL_SCALE**2
+            self._levels.append(10.0 * math.log10(max(e, 1e-10)))
+
+    def frames(self) -> int:
+        return len(self._levels)
+
+    def noise_db(self) -> float:
+        levels = self._levels
+        return _percentile(levels, 10.0) if levels else LEVEL_FLOOR_DB
+
+    def speech_ms(self) -> float:
+        levels = list(self._levels)
+        if not levels:
+            return 0.0
+        threshold = max(self.floor_db, _percentile(levels, 10.0) + self.margin_db)
+        threshold = min(threshold, self.voiced_db)
+        if np is not None:
+            voiced = int(np.count_nonzero(np.asarray(levels) >= threshold))
+        else:
+            voiced = sum(1 for v in levels if v >= threshold)
+        return float(voiced * self.frame_ms)
@@ -1,4 +1,10 @@
-from typing import Callable
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
 
 
 QUIET = 0
@@ -6,7 +12,56 @@ INFO = 1
 DEBUG = 2
 
 
+class Event(NamedTuple):
+    """One log call, captured as-is; formatting is deferred to the sink."""
+
+    ts: float
+    level: str
+    msg: Any  # str (optionally %-formatted with args) or a zero-arg callable
+    args: Tuple[Any, ...]
+    fields: Dict[str, Any]
+    thread: str
+
+    def message(self) -> str:
+        msg = self.msg() if callable(self.msg) else str(self.msg)
+        if self.args:
+            try:
+                msg = msg % self.args
+            except (TypeError, ValueError):
+                msg = " ".join([msg, *map(str, self.args)])
+        return msg
+
+    def text(self) -> str:
+        """Console form: the message followed by key=value fields."""
+        if not self.fields:
+            return self.message()
+        kv = " ".join(f"{k}={_fmt(v)}" for k, v in self.fields.items())
+        return f"{self.message()} {kv}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ts": round(self.ts, 6),
+            "level": self.level,
+            "thread": self.thread,
+            "msg": self.message(),
+            **self.fields,
+        }
+
+
+def _fmt(v: Any) -> str:
+    return f"{v:.2f}" if isinstance(v, float) else str(v)
+
+
 class Logger:
+    """Level-filtered logger.
+
+    `info(msg, *args, **fields)` formats nothing unless the level is
+    enabled: `msg` may use %-style `args` or be a callable returning the
+    text, and `fields` are kept as structured key/values. A plain sink is
+    called with (level, text); a sink with `structured = True` (e.g.
+    AsyncSink) receives the unformatted Event instead.
+    """
+
     def __init__(
         self, level: int = INFO, sink: Callable[[str, str], None] = None
     ) -> None:
@@ -19,13 +74,168 @@ class Logger:
     def set_sink(self, sink: Callable[[str, str], None]) -> None:
         self.sink = sink
 
-    def info(self, msg: str) -> None:
+    def enabled(self, level: int) -> bool:
+        return self.level >= level
+
+    def info(self, msg: Any, *args: Any, **fields: Any) -> None:
         if self.level >= INFO:
-            self.sink("INFO", msg)
+            self._emit("INFO", msg, args, fields)
 
-    def debug(self, msg: str) -> None:
+    def debug(self, msg: Any, *args: Any, **fields: Any) -> None:
         if self.level >= DEBUG:
-            self.sink("DEBUG", msg)
+            self._emit("DEBUG", msg, args, fields)
+
+    def _emit(self, lvl: str, msg: Any, args: tuple, fields: dict) -> None:
+        event = Event(
+            time.time(), lvl, msg, args, fields, threading.current_thread().name
+        )
+        sink = self.sink
+        if getattr(sink, "structured", False):
+            sink(event)
+        else:
+            sink(lvl, event.text())
+
+
+# ---- async output ----
+
+
+class ConsoleHandler:
+    """Writes each event's text form to a stream (stdout by default)."""
+
+    def __init__(self, stream=None) -> None:
+        self._stream = stream
+
+    def __call__(self, event: Event) -> None:
+        stream = self._stream or sys.stdout
+        stream.write(event.text() + "\n")
+        stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlFileHandler:
+    """Appends events as JSON lines, rotating `path` -> `path.1` ... at max_bytes."""
+
+    def __init__(self, path: str, *, max_bytes: int = 5 << 20, backups: int = 3):
+        self.path = path
+        self.max_bytes = max(0, int(max_bytes))
+        self.backups = max(0, int(backups))
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._f = open(path, "ab")
+        self._size = self._f.tell()
+
+    def __call__(self, event: Event) -> None:
+        line = json.dumps(event.as_dict(), ensure_ascii=False, default=str) + "\n"
+        data = line.encode("utf-8")
+        if self.max_bytes and self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._f.write(data)
+        self._f.flush()
+        self._size += len(data)
+
+    def _rotate(self) -> None:
+        self._f.close()
+        if self.backups:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._f = open(self.path, "wb")
+        self._size = 0
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class AsyncSink:
+    """Structured sink that hands events to a writer thread.
+
+    Callers only enqueue (never block: when the queue is full the event is
+    counted in `dropped`), so logging adds no I/O latency to the capture or
+    hotkey threads. Formatting and writing happen on the writer thread.
+    """
+
+    structured = True
+    _STOP = object()
+
+    def __init__(self, *handlers: Callable[[Event], None], maxsize: int = 10000):
+        self.handlers = list(handlers)
+        self.dropped = 0
+        self.previous: Optional[Callable[[str, str], None]] = None
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize)
+        self._thread = threading.Thread(
+            target=self._run, name="pt-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, event: Event) -> None:
+        try:
+            self._q.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until everything queued so far is written."""
+        done = threading.Event()
+        try:
+            self._q.put(done.set, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 2.0) -> None:
+        try:
+            self._q.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        for h in self.handlers:
+            close = getattr(h, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    def _run(self) -> None:
+        while True:
+            item = self._q.get()
+            if item is self._STOP:
+                return
+            if not isinstance(item, Event):
+                item()  # flush marker
+                continue
+            for h in self.handlers:
+                try:
+                    h(item)
+                except Exception:
+                    pass
+
+
+def start_async_logging(
+    *, console: bool = True, jsonl_path: str = "", max_bytes: int = 5 << 20
+) -> AsyncSink:
+    """Route the global logger through an AsyncSink (undo with stop_async_logging)."""
+    handlers: list = []
+    if console:
+        handlers.append(ConsoleHandler())
+    if jsonl_path:
+        handlers.append(JsonlFileHandler(jsonl_path, max_bytes=max_bytes))
+    sink = AsyncSink(*handlers)
+    sink.previous = get_logger().sink
+    get_logger().set_sink(sink)
+    return sink
+
+
+def stop_async_logging(sink: AsyncSink) -> None:
+    """Drain and close `sink`, restoring the sink it replaced."""
+    logger = get_logger()
+    if logger.sink is sink:
+        logger.set_sink(getattr(sink, "previous", None) or Logger().sink)
+    sink.close()
 
 
 _global = Logger()
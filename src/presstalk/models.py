@@ -0,0 +1,272 @@
+"""Managed local store of faster-whisper models.
+
+Each model lives in `<store>/<name>/` next to a manifest recording the size
+and SHA-256 of every file, written once the download completed. Downloads
+go to a `.partial` sibling first and are renamed into place, so a store
+entry is either complete or absent. With `offline` set the backend loads
+only from here and never reaches out to the Hugging Face hub.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .logger import get_logger
+
+MANIFEST = "presstalk-manifest.json"
+# A CTranslate2 Whisper model is unusable without these
+REQUIRED_FILES = ("model.bin", "config.json")
+PARTIAL_SUFFIX = ".partial"
+
+# download(name, output_dir) -> None
+Downloader = Callable[[str, str], None]
+
+
+def default_store_dir() -> str:
+    base = os.getenv("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "presstalk", "models")
+
+
+def store_dir(path: Optional[str] = None) -> str:
+    return os.path.abspath(os.path.expanduser(path)) if path else default_store_dir()
+
+
+def model_path(name: str, store: Optional[str] = None) -> str:
+    # Hugging Face ids ("org/repo") become one directory
+    return os.path.join(store_dir(store), name.strip().replace("/", "--"))
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+
+def format_size(n: int) -> str:
+    size = float(n)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{n} B"
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _files(path: str) -> List[str]:
+    out = []
+    for root, _dirs, files in os.walk(path):
+        for f in files:
+            rel = os.path.relpath(os.path.join(root, f), path)
+            if rel != MANIFEST:
+                out.append(rel.replace(os.sep, "/"))
+    return sorted(out)
+
+
+def write_manifest(path: str, name: str) -> Dict:
+    files = {
+        rel: {
+            "size": os.path.getsize(os.path.join(path, rel)),
+            "sha256": _sha256(os.path.join(path, rel)),
+        }
+        for rel in _files(path)
+    }
+    manifest = {"model": name, "created": int(time.time()), "files": files}
+    with open(os.path.join(path, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+def read_manifest(path: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(path, MANIFEST), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data.get("files"), dict) else None
+    except Exception:
+        return None
+
+
+def verify_model(path: str, *, full: bool = True) -> List[str]:
+    """Return problems with a stored model ([] when intact).
+
+    The quick check (`full=False`) compares file sizes only; the full check
+    also re-hashes every file against the manifest.
+    """
+    if not os.path.isdir(path):
+        return ["not downloaded"]
+    problems = [
+        f"missing {f}"
+        for f in REQUIRED_FILES
+        if not os.path.isfile(os.path.join(path, f))
+    ]
+    manifest = read_manifest(path)
+    if manifest is None:
+        return problems + ["no manifest"]
+    for rel, meta in sorted(manifest["files"].items()):
+        fp = os.path.join(path, rel)
+        if not os.path.isfile(fp):
+            problems.append(f"missing {rel}")
+        elif os.path.getsize(fp) != meta.get("size"):
+            problems.append(f"size mismatch: {rel}")
+        elif full and _sha256(fp) != meta.get("sha256"):
+            problems.append(f"checksum mismatch: {rel}")
+    return problems
+
+
+def list_models(store: Optional[str] = None, names: Iterable[str] = ()) -> List[Dict]:
+    """Rows for `names` plus everything found in the store.
+
+    Status is "ok", "unverified" (no manifest), "corrupt" (quick check
+    failed) or "missing".
+    """
+    root = store_dir(store)
+    found = []
+    if os.path.isdir(root):
+        found = sorted(
+            d
+            for d in os.listdir(root)
+            if os.path.isdir(os.path.join(root, d)) and not d.endswith(PARTIAL_SUFFIX)
+        )
+    rows = []
+    for name in list(dict.fromkeys([*names, *found])):
+        path = model_path(name, root)
+        problems = verify_model(path, full=False)
+        if problems == ["not downloaded"]:
+            status = "missing"
+        elif problems == ["no manifest"]:
+            status = "unverified"
+        else:
+            status = "corrupt" if problems else "ok"
+        size = dir_size(path) if status != "missing" else 0
+        rows.append({"name": name, "status": status, "size": size, "path": path})
+    return rows
+
+
+def _hub_download(name: str, output_dir: str) -> None:
+    try:
+        from faster_whisper.utils import download_model  # type: ignore
+    except Exception as e:
+        raise RuntimeError("faster-whisper is not installed") from e
+    download_model(name, output_dir=output_dir)
+
+
+def prefetch_model(
+    name: str, store: Optional[str] = None, *, download: Optional[Downloader] = None
+) -> str:
+    """Download `name` into the store (no-op if already intact); return its path."""
+    path = model_path(name, store)
+    if not verify_model(path, full=False):
+        return path
+    partial = path + PARTIAL_SUFFIX
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial, exist_ok=True)
+    try:
+        (download or _hub_download)(name, partial)
+        missing = [
+            f for f in REQUIRED_FILES if not os.path.isfile(os.path.join(partial, f))
+        ]
+        if missing:
+            raise RuntimeError(f"download incomplete: missing {', '.join(missing)}")
+        write_manifest(partial, name)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(partial, path)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+    return path
+
+
+def prune_models(
+    store: Optional[str] = None,
+    *,
+    names: Iterable[str] = (),
+    keep: Iterable[str] = (),
+    dry_run: bool = False,
+) -> List[str]:
+    """Remove `names` (default: every model not in `keep`) and stale partials."""
+    root = store_dir(store)
+    if not os.path.isdir(root):
+        return []
+    keep_dirs = {os.path.basename(model_path(k, root)) for k in keep}
+    wanted = {os.path.basename(model_path(n, root)) for n in names}
+    removed = []
+    for d in sorted(os.listdir(root)):
+        full = os.path.join(root, d)
+        if not os.path.isdir(full):
+            continue
+        if d.endswith(PARTIAL_SUFFIX):
+            drop = True
+        elif wanted:
+            drop = d in wanted
+        else:
+            drop = d not in keep_dirs
+        if drop:
+            removed.append(full)
+            if not dry_run:
+                shutil.rmtree(full, ignore_errors=True)
+    return removed
+
+
+def resolve_model(
+    name: str, store: Optional[str] = None, *, offline: bool = False
+) -> str:
+    """What to hand WhisperModel: the stored copy if intact, else the name.
+
+    A name with a path separator or a leading "~" is a model directory and
+    is used as is; a bare name never resolves against the working
+    directory. Offline, a model missing from (or damaged in) the store is
+    an error instead of a download, and a directory without a manifest is
+    loaded with a warning, since nothing vouches for its files.
+    """
+    if is_model_dir_spec(name):
+        path = os.path.abspath(os.path.expanduser(name))
+        if not os.path.isdir(path):
+            raise RuntimeError(f"model directory not found: {name}")
+        if offline and read_manifest(path) is None:
+            _warn_unverified(path)
+        return path
+    path = model_path(name, store)
+    problems = verify_model(path, full=False)
+    if not problems:
+        return path
+    if problems == ["no manifest"]:
+        if offline:
+            _warn_unverified(path)
+        return path
+    if offline:
+        raise RuntimeError(
+            f"model '{name}' is not available offline ({'; '.join(problems)}); "
+            f"run `presstalk models prefetch {name}` while online"
+        )
+    return name
+
+
+def is_model_dir_spec(name: str) -> bool:
+    """True when `name` is written as a path ("./m", "~/m", "/opt/m", "C:\\m").
+
+    "org/repo" is a Hugging Face id, not a relative path.
+    """
+    if name.startswith(("~", "/", "./", "../")) or os.path.isabs(name):
+        return True
+    return bool(os.altsep) and os.sep in name  # a backslash on Windows
+
+
+def _warn_unverified(path: str) -> None:
+    get_logger().info(
+        "[PT] Loading %s offline without a manifest; its files are not verified",
+        path,
+    )
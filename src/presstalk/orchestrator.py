@@ -1,13 +1,36 @@
+import threading
 import time
-from typing import Callable, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
 
+from .clock import SYSTEM_CLOCK, Clock, elapsed_ms, elapsed_s
 from .controller import Controller
 from .ring_buffer import RingBuffer
 from .capture import PCMCapture
+from .levels import LEVEL_FLOOR_DB, LevelMeter  # noqa: F401 (re-exported)
+from .levels import level_dbfs as _level_dbfs  # noqa: F401
 
 
 class Orchestrator:
-    """Wires capture → ring + controller live push, handles press/release lifecycle."""
+    """Wires capture → ring + controller live push, handles press/release lifecycle.
+
+    `status_fn(**fields)` (e.g. StatusBoard.update) receives the run state
+    (recording/finalizing/idle), the input level at most every
+    `level_interval_s` while recording, and a per-utterance latency
+    breakdown after each release.
+
+    Input levels come from the capture's LevelMeter. With `silence_floor_db`
+    set, a recording whose peak never reached it (muted or wrong mic) is
+    closed without a decode; the controller counts those, and its own
+    speech-gate skips, in `decodes_skipped`.
+
+    Durations and latencies are `now_ns()` differences on `clock` (by
+    default the controller's), reported in ms to the microsecond.
+
+    An utterance is in flight from `press()` until `release()` returns.
+    `idle()` waits for that and holds off the next press while its block
+    runs, for swapping components (config reload) between utterances.
+    """
 
     def __init__(
         self,
@@ -18,8 +41,15 @@ class Orchestrator:
         paste_fn: Callable[[str], bool],
         audio_feedback: bool = True,
         beep_fn: Optional[Callable[[], None]] = None,
+        status_fn: Optional[Callable[..., None]] = None,
+        level_interval_s: float = 0.1,
+        silence_floor_db: Optional[float] = None,
+        clock: Optional[Clock] = None,
     ) -> None:
         self.controller = controller
+        if clock is None:
+            clock = getattr(controller, "clock", None)
+        self.clock: Clock = clock if isinstance(clock, Clock) else SYSTEM_CLOCK
         self.ring = ring
         self.capture = capture
         self.paste_fn = paste_fn
@@ -27,18 +57,89 @@ class Orchestrator:
         self._beep = beep_fn
         self._started_capture = False
         self._bytes_sent = 0
-        self._t0 = 0.0
+        self._t0 = 0  # now_ns() at press
+        self._pressed = False  # a clock may start at 0
+        self._idle = threading.Condition()
+        self._busy = False
+        self._status_fn = status_fn
+        self._level_interval_s = max(0.0, float(level_interval_s))
+        self._level_at = 0.0
+        self._utterances = 0
+        self.silence_floor_db = silence_floor_db
+        self._skipped: Optional[str] = None
+        # fakes without a meter get one updated from _on_bytes instead
+        meter = getattr(capture, "meter", None)
+        self._own_meter = not isinstance(meter, LevelMeter)
+        self.meter: LevelMeter = LevelMeter() if self._own_meter else meter
+
+    @property
+    def decodes_skipped(self) -> int:
+        n = getattr(self.controller, "decodes_skipped", 0)
+        return n if isinstance(n, int) else 0
+
+    @property
+    def audio_feedback(self) -> bool:
+        return self._audio_feedback
+
+    @audio_feedback.setter
+    def audio_feedback(self, on: bool) -> None:
+        self._audio_feedback = bool(on)
+
+    def _status(self, **fields: Any) -> None:
+        if self._status_fn is None:
+            return
+        try:
+            self._status_fn(**fields)
+        except Exception:
+            pass
 
     def _on_bytes(self, b: bytes):
         if b:
+            if self._own_meter:
+                self.meter.update(b)
             self.ring.write(b)
             self.controller.live_push(b)
             try:
                 self._bytes_sent += len(b)
             except Exception:
                 pass
+            if self._status_fn is not None:
+                now = self.clock.now()
+                if now - self._level_at >= self._level_interval_s:
+                    self._level_at = now
+                    self._status(**self.meter.snapshot())
+
+    def listen(self) -> None:
+        """Start capture ahead of any press (always-on microphone).
+
+        Audio before a press then reaches the prebuffer ring, and
+        press/release leave the capture running.
+        """
+        if not self.capture.is_running():
+            self.capture.start(self._on_bytes)
+
+    @contextmanager
+    def idle(self) -> Iterator[None]:
+        """Wait out an utterance in flight; a press waits until the block exits."""
+        with self._idle:
+            while self._busy:
+                self._idle.wait()
+            yield
+
+    def _set_busy(self, busy: bool) -> None:
+        with self._idle:
+            self._busy = busy
+            self._idle.notify_all()
 
     def press(self):
+        self._set_busy(True)
+        try:
+            self._press()
+        except BaseException:
+            self._set_busy(False)
+            raise
+
+    def _press(self) -> None:
         # pre-count prebuffer bytes (estimated) for stats
         try:
             n = int(
@@ -49,8 +150,12 @@ class Orchestrator:
             self._bytes_sent = len(pre)
         except Exception:
             self._bytes_sent = 0
-        self._t0 = time.time()
+        self._t0 = self.clock.now_ns()
+        self._pressed = True
+        self._skipped = None
+        self.meter.reset()
         self.controller.press()
+        self._status(state="recording", level_db=None, peak_db=None, clipping=False)
         # audio feedback on start
         if self._audio_feedback and self._beep:
             try:
@@ -62,12 +167,27 @@ class Orchestrator:
             self._started_capture = True
 
     def release(self) -> str:
+        try:
+            return self._release()
+        finally:
+            self._set_busy(False)
+
+    def _release(self) -> str:
+        t_release = self.clock.now_ns()
+        self._status(state="finalizing", level_db=None, peak_db=None)
         # stop capture promptly (silent)
         if self._started_capture:
             self.capture.stop()
             self._started_capture = False
-        # finalize transcription (may take time)
-        text = self.controller.release()
+        t_stopped = self.clock.now_ns()
+        # finalize transcription (may take time) unless there was no signal
+        if self._no_signal():
+            text = self.controller.release(skip_decode=True)
+        else:
+            text = self.controller.release()
+        reason = getattr(self.controller, "skip_reason", None)
+        self._skipped = reason if isinstance(reason, str) else None
+        t_decoded = self.clock.now_ns()
         # paste/output text if any
         if text:
             self.paste_fn(text)
@@ -77,16 +197,50 @@ class Orchestrator:
                     self._beep()
                 except Exception:
                     pass
+        t_done = self.clock.now_ns()
+        if self._status_fn is not None:
+            self._utterances += 1
+            st = self.stats()
+            self._status(
+                state="idle",
+                last_utterance={
+                    "seq": self._utterances,
+                    "at": time.time(),
+                    "audio_s": round(st["bytes"] / max(1, st["bytes_per_second"]), 2),
+                    "capture_stop_ms": elapsed_ms(t_release, t_stopped),
+                    "decode_ms": elapsed_ms(t_stopped, t_decoded),
+                    "paste_ms": elapsed_ms(t_decoded, t_done),
+                    "total_ms": elapsed_ms(t_release, t_done),
+                    "chars": len(text or ""),
+                    "peak_db": st["peak_db"],
+                    "clipped": st["clipped"],
+                    "skipped": self._skipped,
+                },
+            )
         return text
 
+    def _no_signal(self) -> bool:
+        floor = self.silence_floor_db
+        if floor is None:
+            return False
+        levels = self.meter.session()
+        # no chunks means nothing was measured, not silence
+        return levels["chunks"] > 0 and levels["peak_db"] < floor
+
     def stats(self) -> dict:
-        dur = max(0.0, time.time() - self._t0) if self._t0 else 0.0
+        dur = elapsed_s(self._t0, self.clock.now_ns()) if self._pressed else 0.0
         try:
             bps = int(self.controller.bytes_per_second)
         except Exception:
             bps = 32000
+        levels = self.meter.session()
         return {
             "bytes": int(self._bytes_sent),
             "duration_s": dur,
             "bytes_per_second": bps,
+            "rms_db": levels["rms_db"],
+            "peak_db": levels["peak_db"],
+            "clipped": levels["clipped"],
+            "decode_skipped": self._skipped,
+            "decodes_skipped": self.decodes_skipped,
         }
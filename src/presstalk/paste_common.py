@@ -1,9 +1,132 @@
+import fnmatch
 import os
-from typing import Dict, Optional, Sequence, Union, List
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple, Union, List
 from .constants import is_env_enabled
+from .logger import get_logger
+
+# Field qualifiers accepted in blocklist rules, e.g. "bundle_id:com.apple.Terminal"
+_FIELDS: Tuple[str, ...] = ("name", "bundle_id")
+_ANY = "*"
+
+
+def _rule_regex(rule: str) -> str:
+    """Translate one (lowercased) rule body into an anchored/unanchored regex.
+
+    - "=foo"   exact match
+    - "^foo"   prefix match
+    - "fo*o?"  glob (fnmatch) over the whole value
+    - "foo"    substring match (legacy behaviour)
+    """
+    if rule.startswith("="):
+        return r"\A" + re.escape(rule[1:]) + r"\Z"
+    if rule.startswith("^"):
+        return r"\A" + re.escape(rule[1:])
+    if any(c in rule for c in "*?["):
+        return r"\A" + fnmatch.translate(rule)
+    return re.escape(rule)
+
+
+def compile_rules(rules: Sequence[str]) -> Dict[str, "re.Pattern[str]"]:
+    """Compile lowercased rules into one regex alternation per field.
+
+    A rule may be qualified as "name:..." or "bundle_id:..."; unqualified
+    rules apply to every field (key "*"). Rules with an empty body ("",
+    "=", "^", "name:") are skipped with a log line: "^" alone would block
+    every app.
+    """
+    grouped: Dict[str, List[str]] = {}
+    for original in rules:
+        field, rule = _ANY, original
+        head, sep, tail = rule.partition(":")
+        if sep and head in _FIELDS:
+            field, rule = head, tail
+        if not rule.lstrip("=^").strip():
+            get_logger().info("[PT] Ignoring empty app rule: %r", original)
+            continue
+        grouped.setdefault(field, []).append(_rule_regex(rule))
+    return {
+        field: re.compile("|".join(f"(?:{p})" for p in parts))
+        for field, parts in grouped.items()
+    }
+
+
+def match_rules(
+    matchers: Dict[str, "re.Pattern[str]"], key: Tuple[Tuple[str, str], ...]
+) -> bool:
+    any_m = matchers.get(_ANY)
+    for field, value in key:
+        if any_m is not None and any_m.search(value):
+            return True
+        m = matchers.get(field)
+        if m is not None and m.search(value):
+            return True
+    return False
+
+
+def app_key(fg_info: Optional[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    """Hashable, lowercased identity of a foreground app (empty if unknown)."""
+    if not fg_info:
+        return ()
+    return tuple(
+        sorted((k, v.lower()) for k, v in fg_info.items() if isinstance(v, str) and v)
+    )
 
 
 class PasteGuard:
+    """Decides whether paste is blocked for a foreground app.
+
+    Build once (e.g. via `from_config`) and call `is_blocked(fg_info)` per paste.
+    Rules are compiled into one regex alternation per field and verdicts are
+    cached per foreground app, so a repeated app costs a dict lookup.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        blocklist: Optional[Union[str, Sequence[str]]] = None,
+        *,
+        cache_size: int = 128,
+    ) -> None:
+        self.enabled = bool(enabled)
+        self.rules: List[str] = self._normalize_blocklist(blocklist)
+        self._matchers: Dict[str, "re.Pattern[str]"] = self._compile(self.rules)
+        self._cache: "OrderedDict[Tuple[Tuple[str, str], ...], bool]" = OrderedDict()
+        self._cache_size = max(1, int(cache_size))
+
+    @classmethod
+    def from_config(cls, cfg: Any) -> "PasteGuard":
+        return cls(
+            enabled=bool(getattr(cfg, "paste_guard", True)),
+            blocklist=getattr(cfg, "paste_blocklist", None),
+        )
+
+    @staticmethod
+    def _compile(rules: Sequence[str]) -> Dict[str, "re.Pattern[str]"]:
+        return compile_rules(rules)
+
+    def _match(self, key: Tuple[Tuple[str, str], ...]) -> bool:
+        return match_rules(self._matchers, key)
+
+    def is_blocked(self, fg_info: Optional[Dict[str, str]]) -> bool:
+        """Return True when paste should be blocked for this foreground app."""
+        if not self.enabled or not self._matchers or not fg_info:
+            return False
+        key = app_key(fg_info)
+        if not key:
+            return False
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+        hit = self._match(key)
+        self._cache[key] = hit
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return hit
+
     @staticmethod
     def _normalize_blocklist(
         blocklist: Optional[Union[str, Sequence[str]]],
@@ -43,6 +166,9 @@ class PasteGuard:
     ) -> bool:
         """Return True when paste should be blocked based on foreground app info.
 
+        Stateless variant resolving settings on each call; prefer a `PasteGuard`
+        instance built once from Config.
+
         - guard_enabled: explicit on/off overrides ENV; if None, PT_PASTE_GUARD used; default True
         - blocklist: explicit list or comma-separated string; else PT_PASTE_BLOCKLIST; else default_blocklist
         - fg_info: foreground metadata (e.g., name, bundle_id); all string values are considered
@@ -54,13 +180,9 @@ class PasteGuard:
         blocks = PasteGuard._effective_blocklist(blocklist, default_blocklist)
         if not blocks:
             return False
-        targets = [str(v).lower() for v in fg_info.values() if isinstance(v, str) and v]
-        if not targets:
-            return False
-        for b in blocks:
-            if not b:
-                continue
-            for t in targets:
-                if b in t:
-                    return True
-        return False
+        return _shared_guard(tuple(blocks)).is_blocked(fg_info)
+
+
+@lru_cache(maxsize=16)
+def _shared_guard(rules: Tuple[str, ...]) -> PasteGuard:
+    return PasteGuard(enabled=True, blocklist=list(rules))
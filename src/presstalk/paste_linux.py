@@ -123,23 +123,29 @@ def insert_text(
     guard_enabled: Optional[bool] = None,
     blocklist: Optional[Union[str, Sequence[str]]] = None,
     clipboard_fn: Optional[Callable[[str], bool]] = None,
+    guard: Optional[PasteGuard] = None,
 ) -> bool:
     """Insert text at current cursor by clipboard swap + paste keystroke (Linux)."""
     if text is None:
         return True
 
     # Guard
-    try:
-        fg = frontmost_getter() if frontmost_getter else _get_frontmost_app()
-    except Exception:
-        fg = {}
-    if PasteGuard.should_block(
-        fg,
-        guard_enabled=guard_enabled,
-        blocklist=blocklist,
-        default_blocklist=",".join(essential_terminals),
-    ):
-        return False
+    if guard is None or guard.enabled:
+        try:
+            fg = frontmost_getter() if frontmost_getter else _get_frontmost_app()
+        except Exception:
+            fg = {}
+        if guard is not None:
+            blocked = guard.is_blocked(fg)
+        else:
+            blocked = PasteGuard.should_block(
+                fg,
+                guard_enabled=guard_enabled,
+                blocklist=blocklist,
+                default_blocklist=",".join(essential_terminals),
+            )
+        if blocked:
+            return False
 
     # Clipboard
     if clipboard_fn is not None:
@@ -1,15 +1,202 @@
+import ctypes
+import ctypes.util
 import subprocess
-from typing import Callable, Optional, Tuple, Dict, Sequence, Union
+import threading
+from typing import Any, Callable, Optional, Tuple, Dict, Sequence, Union
 from .paste_common import PasteGuard
 
+# One AppleScript round-trip for both fields (name, then bundle id on the next line)
+_FRONTMOST_SCRIPT = [
+    'tell application "System Events"',
+    "set p to first process whose frontmost is true",
+    'set bid to ""',
+    "try",
+    "set bid to bundle identifier of p",
+    "end try",
+    "return (name of p) & linefeed & bid",
+    "end tell",
+]
+
+_CMD_V_SCRIPT = 'tell application "System Events" to keystroke "v" using command down'
+
+# Virtual keycodes name physical (ANSI) key positions, so the key that types
+# "v" depends on the keyboard layout (9 on QWERTY, 47 on Dvorak)
+_KEYCODE_MAX = 128
+_kUCKeyActionDisplay = 3
+_kUCKeyTranslateNoDeadKeysMask = 1
+
+_UNSET: Any = object()
+_appkit_mod: Any = _UNSET
+_quartz_mod: Any = _UNSET
+_carbon_api: Any = _UNSET
+_cmd_v_script: Any = _UNSET
+_script_lock = threading.Lock()
+# input source id -> keycode typing "v" there (None: the layout has no "v" key)
+_KEYCODE_CACHE: Dict[str, Optional[int]] = {}
+
+
+def _appkit():
+    """Return the PyObjC AppKit module, or None when PyObjC is unavailable (cached)."""
+    global _appkit_mod
+    if _appkit_mod is _UNSET:
+        try:
+            import AppKit  # type: ignore
+
+            _appkit_mod = AppKit
+        except Exception:
+            _appkit_mod = None
+    return _appkit_mod
+
+
+def _quartz():
+    """Return the PyObjC Quartz module, or None when unavailable (cached)."""
+    global _quartz_mod
+    if _quartz_mod is _UNSET:
+        try:
+            import Quartz  # type: ignore
+
+            _quartz_mod = Quartz
+        except Exception:
+            _quartz_mod = None
+    return _quartz_mod
+
+
+def _carbon():
+    """Bind the Text Input Source / UCKeyTranslate calls via ctypes (cached; None if unavailable)."""
+    global _carbon_api
+    if _carbon_api is not _UNSET:
+        return _carbon_api
+    _carbon_api = None
+    try:
+        carbon = ctypes.cdll.LoadLibrary(ctypes.util.find_library("Carbon"))
+        cf = ctypes.cdll.LoadLibrary(ctypes.util.find_library("CoreFoundation"))
+    except Exception:
+        return None
+    vp = ctypes.c_void_p
+    carbon.TISCopyCurrentKeyboardLayoutInputSource.restype = vp
+    carbon.TISGetInputSourceProperty.argtypes = [vp, vp]
+    carbon.TISGetInputSourceProperty.restype = vp
+    carbon.LMGetKbdType.restype = ctypes.c_uint8
+    carbon.UCKeyTranslate.argtypes = [
+        vp,
+        ctypes.c_uint16,
+        ctypes.c_uint16,
+        ctypes.c_uint32,
+        ctypes.c_uint32,
+        ctypes.c_uint32,
+        ctypes.POINTER(ctypes.c_uint32),
+        ctypes.c_ulong,
+        ctypes.POINTER(ctypes.c_ulong),
+        ctypes.POINTER(ctypes.c_uint16),
+    ]
+    carbon.UCKeyTranslate.restype = ctypes.c_int32
+    cf.CFDataGetBytePtr.argtypes = [vp]
+    cf.CFDataGetBytePtr.restype = vp
+    cf.CFStringGetCString.argtypes = [vp, ctypes.c_char_p, ctypes.c_long, ctypes.c_uint32]
+    cf.CFStringGetCString.restype = ctypes.c_bool
+    cf.CFRelease.argtypes = [vp]
+    layout_key = vp.in_dll(carbon, "kTISPropertyUnicodeKeyLayoutData").value
+    id_key = vp.in_dll(carbon, "kTISPropertyInputSourceID").value
+    _carbon_api = (carbon, cf, layout_key, id_key)
+    return _carbon_api
+
+
+def _translate_keycode(carbon, layout, kbd_type: int, keycode: int) -> str:
+    dead = ctypes.c_uint32(0)
+    length = ctypes.c_ulong(0)
+    chars = (ctypes.c_uint16 * 4)()
+    err = carbon.UCKeyTranslate(
+        layout,
+        keycode,
+        _kUCKeyActionDisplay,
+        0,
+        kbd_type,
+        _kUCKeyTranslateNoDeadKeysMask,
+        ctypes.byref(dead),
+        4,
+        ctypes.byref(length),
+        chars,
+    )
+    if err != 0:
+        return ""
+    return "".join(chr(c) for c in chars[: length.value])
+
+
+def _keycode_for_v() -> Optional[int]:
+    """Keycode that types "v" in the current keyboard layout, or None if unknown.
+
+    The result is cached per input source, so a layout switch is picked up
+    while repeated pastes cost one TIS query.
+    """
+    api = _carbon()
+    if api is None:
+        return None
+    carbon, cf, layout_key, id_key = api
+    src = carbon.TISCopyCurrentKeyboardLayoutInputSource()
+    if not src:
+        return None
+    try:
+        buf = ctypes.create_string_buffer(256)
+        sid = carbon.TISGetInputSourceProperty(src, id_key)
+        source_id = (
+            buf.value.decode("utf-8", "replace")
+            if sid and cf.CFStringGetCString(sid, buf, 256, 0x08000100)  # UTF-8
+            else ""
+        )
+        if source_id in _KEYCODE_CACHE:
+            return _KEYCODE_CACHE[source_id]
+        data = carbon.TISGetInputSourceProperty(src, layout_key)
+        layout = cf.CFDataGetBytePtr(data) if data else None
+        if not layout:
+            return None  # e.g. some input methods carry no key layout
+        kbd = carbon.LMGetKbdType()
+        found = None
+        for code in range(_KEYCODE_MAX):
+            if _translate_keycode(carbon, layout, kbd, code) == "v":
+                found = code
+                break
+        if source_id:
+            _KEYCODE_CACHE[source_id] = found
+        return found
+    finally:
+        cf.CFRelease(src)
+
+
+def _osascript_cmd(lines: Sequence[str]) -> list:
+    cmd = ["osascript"]
+    for line in lines:
+        cmd.extend(["-e", line])
+    return cmd
+
+
+def _frontmost_via_appkit() -> Optional[Dict[str, str]]:
+    appkit = _appkit()
+    if appkit is None:
+        return None
+    try:
+        app = appkit.NSWorkspace.sharedWorkspace().frontmostApplication()
+        if app is None:
+            return {}
+        name = str(app.localizedName() or "")
+        bid = str(app.bundleIdentifier() or "")
+    except Exception:
+        return None
+    return {k: v for k, v in {"name": name, "bundle_id": bid}.items() if v}
+
 
 def _get_frontmost_app(
     *, runner: Optional[Callable[[list], Tuple[int, str]]] = None
 ) -> Dict[str, str]:
     """Return {'name': ..., 'bundle_id': ...} of frontmost app or empty dict on failure.
 
-    runner should execute a command list and return (exit_code, stdout_text).
+    Uses NSWorkspace in-process when PyObjC is available; otherwise a single
+    osascript call returns both fields. runner should execute a command list and
+    return (exit_code, stdout_text); when given, the osascript path is always used.
     """
+    if runner is None:
+        found = _frontmost_via_appkit()
+        if found is not None:
+            return found
 
     def _run(cmd: list) -> Tuple[int, str]:
         try:
@@ -19,29 +206,93 @@ def _get_frontmost_app(
             return (1, "")
 
     runner = runner or _run
-    name = ""
-    bid = ""
-    code, out = runner(
-        [
-            "osascript",
-            "-e",
-            'tell application "System Events" to get name of (first process whose frontmost is true)',
-        ]
-    )
-    if code == 0:
-        name = out
-    code, out = runner(
-        [
-            "osascript",
-            "-e",
-            'tell application "System Events" to get bundle identifier of (first process whose frontmost is true)',
-        ]
-    )
-    if code == 0:
-        bid = out
+    code, out = runner(_osascript_cmd(_FRONTMOST_SCRIPT))
+    if code != 0 or not out:
+        return {}
+    lines = out.strip().splitlines()
+    name = lines[0].strip() if lines else ""
+    bid = lines[1].strip() if len(lines) > 1 else ""
     return {k: v for k, v in {"name": name, "bundle_id": bid}.items() if v}
 
 
+def _set_clipboard(text: str) -> bool:
+    appkit = _appkit()
+    if appkit is not None:
+        try:
+            pb = appkit.NSPasteboard.generalPasteboard()
+            pb.clearContents()
+            if pb.setString_forType_(text, appkit.NSPasteboardTypeString):
+                return True
+        except Exception:
+            pass
+    # Fallback: pbcopy
+    try:
+        p = subprocess.Popen(["pbcopy"], stdin=subprocess.PIPE, text=True)
+        p.communicate(text, timeout=1)
+        return True
+    except Exception:
+        return False
+
+
+def _send_cmd_v_quartz(
+    *, keycode_fn: Optional[Callable[[], Optional[int]]] = None
+) -> bool:
+    """Post Cmd+V through Quartz using the layout's "v" key.
+
+    Returns False (so the caller falls back to AppleScript's layout-aware
+    `keystroke "v"`) when Quartz is unavailable or the key cannot be mapped.
+    """
+    q = _quartz()
+    if q is None:
+        return False
+    try:
+        keycode = (keycode_fn or _keycode_for_v)()
+    except Exception:
+        keycode = None
+    if keycode is None:
+        return False
+    try:
+        down = q.CGEventCreateKeyboardEvent(None, keycode, True)
+        up = q.CGEventCreateKeyboardEvent(None, keycode, False)
+        q.CGEventSetFlags(down, q.kCGEventFlagMaskCommand)
+        q.CGEventSetFlags(up, q.kCGEventFlagMaskCommand)
+        q.CGEventPost(q.kCGHIDEventTap, down)
+        q.CGEventPost(q.kCGHIDEventTap, up)
+        return True
+    except Exception:
+        return False
+
+
+def _compiled_cmd_v_script():
+    """One compiled NSAppleScript for Cmd+V, reused across pastes (None without PyObjC)."""
+    global _cmd_v_script
+    with _script_lock:
+        if _cmd_v_script is _UNSET:
+            _cmd_v_script = None
+            try:
+                import Foundation  # type: ignore
+
+                script = Foundation.NSAppleScript.alloc().initWithSource_(_CMD_V_SCRIPT)
+                ok, _err = script.compileAndReturnError_(None)
+                if ok:
+                    _cmd_v_script = script
+            except Exception:
+                pass
+        return _cmd_v_script
+
+
+def _send_cmd_v_applescript() -> bool:
+    script = _compiled_cmd_v_script()
+    if script is None:
+        return False
+    try:
+        with _script_lock:
+            _result, err = script.executeAndReturnError_(None)
+        return err is None
+    except Exception:
+        return False
+
+
 def insert_text(
     text: str,
     *,
@@ -50,27 +301,35 @@ def insert_text(
     guard_enabled: Optional[bool] = None,
     blocklist: Optional[Union[str, Sequence[str]]] = None,
     clipboard_fn: Optional[Callable[[str], bool]] = None,
+    guard: Optional[PasteGuard] = None,
 ) -> bool:
     """Insert text at current cursor by clipboard swap + Cmd+V (macOS).
 
     For testability, an optional run_cmd can be supplied to execute a command and
-    return its exit code. Default uses osascript to send Cmd+V.
+    return its exit code. By default Cmd+V is posted via Quartz events (PyObjC)
+    on the key the current layout maps to "v", falling back to a compiled
+    NSAppleScript `keystroke "v"` and then the osascript command.
     """
     if text is None:
         return True
 
     # Paste guard: optionally block paste when frontmost app matches blocklist (e.g., Terminal)
-    try:
-        fg = frontmost_getter() if frontmost_getter else _get_frontmost_app()
-    except Exception:
-        fg = {}
-    if PasteGuard.should_block(
-        fg,
-        guard_enabled=guard_enabled,
-        blocklist=blocklist,
-        default_blocklist="Terminal,iTerm2,com.apple.Terminal,com.googlecode.iterm2",
-    ):
-        return False
+    if guard is None or guard.enabled:
+        try:
+            fg = frontmost_getter() if frontmost_getter else _get_frontmost_app()
+        except Exception:
+            fg = {}
+        if guard is not None:
+            blocked = guard.is_blocked(fg)
+        else:
+            blocked = PasteGuard.should_block(
+                fg,
+                guard_enabled=guard_enabled,
+                blocklist=blocklist,
+                default_blocklist="Terminal,iTerm2,com.apple.Terminal,com.googlecode.iterm2",
+            )
+        if blocked:
+            return False
     # copy to clipboard
     if clipboard_fn is not None:
         try:
@@ -79,14 +338,13 @@ def insert_text(
         except Exception:
             return False
     else:
-        try:
-            p = subprocess.Popen(["pbcopy"], stdin=subprocess.PIPE, text=True)
-            p.communicate(text, timeout=1)
-        except Exception:
+        if not _set_clipboard(text):
             return False
 
-    # simulate Cmd+V via osascript
+    # simulate Cmd+V: Quartz in-process unless a runner is injected
     if run_cmd is None:
+        if _send_cmd_v_quartz() or _send_cmd_v_applescript():
+            return True
 
         def _runner(cmd: list) -> int:
             try:
@@ -102,11 +360,5 @@ def insert_text(
 
         run_cmd = _runner
 
-    code = run_cmd(
-        [
-            "osascript",
-            "-e",
-            'tell application "System Events" to keystroke "v" using command down',
-        ]
-    )
+    code = run_cmd(["osascript", "-e", _CMD_V_SCRIPT])
     return code == 0
@@ -1,47 +1,161 @@
 import subprocess
 import ctypes
+import ntpath
+import time
 from ctypes import wintypes
 from typing import Callable, Optional, Tuple, Dict, Sequence, Union
 from .paste_common import PasteGuard
 
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_CF_UNICODETEXT = 13
+_GMEM_MOVEABLE = 0x0002
+_MAX_PATH_W = 32768
+
+_api = None
+
+
+def _win32():
+    """Bind the Win32 entry points we use once, with explicit prototypes."""
+    global _api
+    if _api is not None:
+        return _api
+    user32 = ctypes.windll.user32  # type: ignore[attr-defined]
+    kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+
+    user32.GetForegroundWindow.restype = wintypes.HWND
+    user32.GetWindowThreadProcessId.argtypes = [
+        wintypes.HWND,
+        ctypes.POINTER(wintypes.DWORD),
+    ]
+    user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+    user32.OpenClipboard.argtypes = [wintypes.HWND]
+    user32.OpenClipboard.restype = wintypes.BOOL
+    user32.EmptyClipboard.restype = wintypes.BOOL
+    user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    user32.SetClipboardData.restype = wintypes.HANDLE
+    user32.CloseClipboard.restype = wintypes.BOOL
+
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.QueryFullProcessImageNameW.argtypes = [
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.LPWSTR,
+        ctypes.POINTER(wintypes.DWORD),
+    ]
+    kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalLock.restype = wintypes.LPVOID
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalUnlock.restype = wintypes.BOOL
+    kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.restype = wintypes.HGLOBAL
+
+    _api = (user32, kernel32)
+    return _api
+
+
+def _foreground_pid() -> int:
+    user32, _ = _win32()
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return 0
+    pid = wintypes.DWORD(0)
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return int(pid.value)
+
+
+def _query_process_name(pid: int) -> str:
+    """Return the executable name (e.g. 'notepad.exe') for pid, or '' on failure."""
+    _, kernel32 = _win32()
+    h = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not h:
+        return ""
+    try:
+        size = wintypes.DWORD(_MAX_PATH_W)
+        buf = ctypes.create_unicode_buffer(_MAX_PATH_W)
+        if not kernel32.QueryFullProcessImageNameW(h, 0, buf, ctypes.byref(size)):
+            return ""
+        return ntpath.basename(buf.value)
+    finally:
+        kernel32.CloseHandle(h)
+
 
 def _get_frontmost_app(
-    *, runner: Optional[Callable[[list], Tuple[int, str]]] = None
+    *,
+    runner: Optional[Callable[[list], Tuple[int, str]]] = None,
+    pid_getter: Optional[Callable[[], int]] = None,
+    name_resolver: Optional[Callable[[int], str]] = None,
 ) -> Dict[str, str]:
     """Return {'name': ...} of the foreground process on Windows or empty dict on failure.
 
-    runner is unused on Windows implementation but kept for signature parity/testing.
+    Uses GetForegroundWindow + OpenProcess/QueryFullProcessImageNameW directly
+    (no PowerShell): one process handle per lookup. Names are not cached,
+    since Windows reuses PIDs and validating a cached entry would cost the
+    same open/query/close as resolving the name. runner is unused but kept
+    for signature parity; pid_getter/name_resolver allow testing off-Windows.
     """
     try:
-        user32 = ctypes.windll.user32  # type: ignore[attr-defined]
-        GetForegroundWindow = user32.GetForegroundWindow
-        GetWindowThreadProcessId = user32.GetWindowThreadProcessId
-        GetForegroundWindow.restype = wintypes.HWND
-        GetWindowThreadProcessId.argtypes = [
-            wintypes.HWND,
-            ctypes.POINTER(wintypes.DWORD),
-        ]
-        hwnd = GetForegroundWindow()
-        pid = wintypes.DWORD(0)
-        GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-        try:
-            out = subprocess.check_output(
-                [
-                    "powershell",
-                    "-NoProfile",
-                    "-Command",
-                    f"(Get-Process -Id {pid.value}).ProcessName",
-                ],
-                text=True,
-                timeout=1,
-            ).strip()
-        except Exception:
-            out = ""
-        return {k: v for k, v in {"name": out}.items() if v}
+        pid = (pid_getter or _foreground_pid)()
+        if pid <= 0:
+            return {}
+        name = (name_resolver or _query_process_name)(pid)
+        return {"name": name} if name else {}
     except Exception:
         return {}
 
 
+def _set_clipboard_native(text: str) -> bool:
+    """Set CF_UNICODETEXT via OpenClipboard/SetClipboardData."""
+    user32, kernel32 = _win32()
+    data = ctypes.create_unicode_buffer(text)
+    size = ctypes.sizeof(data)
+    # Another app may briefly hold the clipboard open; retry a few times
+    for _ in range(5):
+        if user32.OpenClipboard(None):
+            break
+        time.sleep(0.01)
+    else:
+        return False
+    try:
+        user32.EmptyClipboard()
+        h = kernel32.GlobalAlloc(_GMEM_MOVEABLE, size)
+        if not h:
+            return False
+        p = kernel32.GlobalLock(h)
+        if not p:
+            kernel32.GlobalFree(h)
+            return False
+        ctypes.memmove(p, data, size)
+        kernel32.GlobalUnlock(h)
+        if not user32.SetClipboardData(_CF_UNICODETEXT, h):
+            kernel32.GlobalFree(h)
+            return False
+        # ownership of h passes to the system on success
+        return True
+    finally:
+        user32.CloseClipboard()
+
+
+def _set_clipboard(text: str) -> bool:
+    try:
+        if _set_clipboard_native(text):
+            return True
+    except Exception:
+        pass
+    # Fallback: clip.exe
+    try:
+        p = subprocess.Popen(["clip"], stdin=subprocess.PIPE, text=True)
+        p.communicate(text, timeout=1)
+        return True
+    except Exception:
+        return False
+
+
 def insert_text(
     text: str,
     *,
@@ -50,29 +164,36 @@ def insert_text(
     guard_enabled: Optional[bool] = None,
     blocklist: Optional[Union[str, Sequence[str]]] = None,
     clipboard_fn: Optional[Callable[[str], bool]] = None,
+    guard: Optional[PasteGuard] = None,
 ) -> bool:
     """Insert text at current cursor by clipboard swap + Ctrl+V (Windows).
 
     - If guard is enabled, block paste when foreground process matches blocklist.
     - `run_cmd` (if provided) is called instead of sending keys via pynput; it should
       return 0 on success.
-    - `clipboard_fn` (if provided) is used to set clipboard; otherwise `clip.exe`.
+    - `clipboard_fn` (if provided) is used to set clipboard; otherwise the Win32
+      clipboard API is used directly (falling back to `clip.exe`).
     """
     if text is None:
         return True
 
     # Paste guard
-    try:
-        fg = frontmost_getter() if frontmost_getter else _get_frontmost_app()
-    except Exception:
-        fg = {}
-    if PasteGuard.should_block(
-        fg,
-        guard_enabled=guard_enabled,
-        blocklist=blocklist,
-        default_blocklist="cmd.exe,powershell.exe,pwsh.exe,WindowsTerminal.exe,wt.exe,conhost.exe",
-    ):
-        return False
+    if guard is None or guard.enabled:
+        try:
+            fg = frontmost_getter() if frontmost_getter else _get_frontmost_app()
+        except Exception:
+            fg = {}
+        if guard is not None:
+            blocked = guard.is_blocked(fg)
+        else:
+            blocked = PasteGuard.should_block(
+                fg,
+                guard_enabled=guard_enabled,
+                blocklist=blocklist,
+                default_blocklist="cmd.exe,powershell.exe,pwsh.exe,WindowsTerminal.exe,wt.exe,conhost.exe",
+            )
+        if blocked:
+            return False
 
     # Clipboard
     if clipboard_fn is not None:
@@ -82,10 +203,7 @@ def insert_text(
         except Exception:
             return False
     else:
-        try:
-            p = subprocess.Popen(["clip"], stdin=subprocess.PIPE, text=True)
-            p.communicate(text, timeout=1)
-        except Exception:
+        if not _set_clipboard(text):
             return False
 
     # Key send: Ctrl+V
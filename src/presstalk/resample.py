@@ -0,0 +1,150 @@
+"""Streaming downmix + polyphase resampling of s16le PCM.
+
+Used on the capture path to turn whatever the input device delivers (e.g.
+48 kHz stereo) into the 16 kHz mono stream the ASR backend expects.
+"""
+
+from math import ceil, gcd
+from typing import Optional
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy is a runtime dependency
+    np = None  # type: ignore
+
+# Sample rate expected by Whisper models
+ASR_SAMPLE_RATE = 16000
+
+
+class PCMResampler:
+    """Stateful s16le converter: downmix to `out_channels`, then resample.
+
+    Rational L/M resampling with a Kaiser-windowed sinc low-pass split into L
+    polyphase branches; each output sample is one dot product over the input
+    history, computed for a whole chunk at once. Filter state carries over
+    between `process` calls, so chunked and one-shot conversion agree.
+    """
+
+    def __init__(
+        self,
+        *,
+        in_rate: int,
+        in_channels: int,
+        out_rate: int = ASR_SAMPLE_RATE,
+        out_channels: int = 1,
+        zero_crossings: int = 16,
+        rolloff: float = 0.94,
+        kaiser_beta: float = 8.0,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for resampling")
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError("sample rates must be > 0")
+        if in_channels <= 0 or out_channels <= 0:
+            raise ValueError("channel counts must be > 0")
+        self.in_rate = int(in_rate)
+        self.in_channels = int(in_channels)
+        self.out_rate = int(out_rate)
+        self.out_channels = int(out_channels)
+        g = gcd(self.in_rate, self.out_rate)
+        self._up = self.out_rate // g
+        self._down = self.in_rate // g
+        self._frame_bytes = self.in_channels * 2
+        self._rem = b""
+        if self._up == self._down:
+            self._taps = 1
+            self._poly = None
+        else:
+            # input-domain taps; widen with the decimation factor to keep the
+            # same number of zero crossings of the (lower) cutoff
+            taps = 2 * int(zero_crossings) * max(1, ceil(self._down / self._up))
+            n_total = taps * self._up
+            fc = 0.5 * float(rolloff) / max(self._up, self._down)
+            n = np.arange(n_total, dtype=np.float64) - (n_total - 1) / 2.0
+            h = 2.0 * fc * np.sinc(2.0 * fc * n) * np.kaiser(n_total, kaiser_beta)
+            h *= self._up
+            # poly[p, t] = h[p + t*L]; reversed along t so rows align with
+            # ascending input windows
+            poly = h.reshape(taps, self._up).T[:, ::-1]
+            self._taps = taps
+            self._poly = np.ascontiguousarray(poly, dtype=np.float32)
+        self.reset()
+
+    @property
+    def ratio(self) -> float:
+        return self._up / self._down
+
+    def reset(self) -> None:
+        self._rem = b""
+        self._hist = np.zeros(max(0, self._taps - 1), dtype=np.float32)
+        self._n_in = 0
+        self._k_out = 0
+
+    def _downmix(self, data: bytes) -> "np.ndarray":
+        x = np.frombuffer(data, dtype=np.int16)
+        if self.in_channels == 1:
+            return x.astype(np.float32)
+        return x.reshape(-1, self.in_channels).mean(axis=1, dtype=np.float32)
+
+    def _resample(self, x: "np.ndarray") -> "np.ndarray":
+        if self._poly is None:
+            return x
+        taps = self._taps
+        xe = np.concatenate((self._hist, x)) if taps > 1 else x
+        last = self._n_in + len(x) - 1
+        k_end = (last * self._up + self._up - 1) // self._down + 1
+        if k_end > self._k_out:
+            ks = np.arange(self._k_out, k_end, dtype=np.int64)
+            pos = ks * self._down
+            # window start inside xe for each output (xe[0] is input n_in-(taps-1))
+            start = pos // self._up - self._n_in
+            phase = pos % self._up
+            windows = np.lib.stride_tricks.sliding_window_view(xe, taps)[start]
+            if self._up == 1:
+                y = windows @ self._poly[0]
+            else:
+                y = np.einsum("kt,kt->k", windows, self._poly[phase])
+            self._k_out = k_end
+        else:
+            y = np.zeros(0, dtype=np.float32)
+        if taps > 1:
+            self._hist = xe[-(taps - 1) :].copy()
+        self._n_in += len(x)
+        return y
+
+    def process(self, data: Optional[bytes]) -> bytes:
+        """Convert a chunk of interleaved s16le input to s16le output."""
+        if not data:
+            return b""
+        if self._rem:
+            data = self._rem + data
+        usable = len(data) - (len(data) % self._frame_bytes)
+        self._rem = data[usable:]
+        if usable <= 0:
+            return b""
+        y = self._resample(self._downmix(data[:usable]))
+        if y.size == 0:
+            return b""
+        if self.out_channels > 1:
+            y = np.repeat(y, self.out_channels)
+        return np.clip(np.rint(y), -32768, 32767).astype(np.int16).tobytes()
+
+
+def resample_pcm(
+    data: bytes,
+    *,
+    in_rate: int,
+    in_channels: int,
+    out_rate: int = ASR_SAMPLE_RATE,
+    out_channels: int = 1,
+) -> bytes:
+    """One-shot conversion of a whole s16le buffer."""
+    if in_rate == out_rate and in_channels == out_channels:
+        return data
+    rs = PCMResampler(
+        in_rate=in_rate,
+        in_channels=in_channels,
+        out_rate=out_rate,
+        out_channels=out_channels,
+    )
+    return rs.process(data)
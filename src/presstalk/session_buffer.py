@@ -0,0 +1,137 @@
+"""Per-session PCM storage that spills to a temp file and enforces a hard cap.
+
+Short dictations stay in a bytearray. Once a session grows past
+`spill_bytes` its audio moves to an anonymous temp file, and decoders read
+it back through a read-only mmap, so a long session costs page cache, not
+process RSS. With `max_bytes` set, only the newest `max_bytes` are kept.
+"""
+
+import mmap
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+Buffer = Union[bytes, memoryview]
+
+
+class SessionBuffer:
+    """Append-only audio buffer with optional disk spill and truncate-oldest cap.
+
+    - extend(b): append PCM; drops the oldest whole frames beyond `max_bytes`
+    - view(): context manager yielding the retained audio (bytes or mmap view)
+    - len(buf): number of retained bytes
+    - close(): release memory and the temp file
+    """
+
+    _COPY_CHUNK = 1 << 20
+
+    def __init__(
+        self, *, spill_bytes: int = 0, max_bytes: int = 0, align: int = 2
+    ) -> None:
+        self.spill_bytes = max(0, int(spill_bytes))
+        self.align = max(1, int(align))
+        cap = max(0, int(max_bytes))
+        self.max_bytes = cap - (cap % self.align)
+        self.dropped = 0  # bytes discarded by the cap
+        self._lock = threading.Lock()
+        self._mem = bytearray()
+        self._file = None
+        # retained audio is [_start, _end) of _mem or of the spill file
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def extend(self, data: Optional[bytes]) -> None:
+        if not data:
+            return
+        with self._lock:
+            if self._file is not None:
+                self._file.write(data)
+            else:
+                self._mem.extend(data)
+            self._end += len(data)
+            if self.max_bytes and self._end - self._start > self.max_bytes:
+                over = self._end - self._start - self.max_bytes
+                over += -over % self.align
+                self._start += over
+                self.dropped += over
+                # trim lazily so the copy is amortized over max_bytes/4 of input
+                if self._start >= max(self.align, self.max_bytes // 4):
+                    self._compact()
+            if (
+                self._file is None
+                and self.spill_bytes
+                and self._end - self._start > self.spill_bytes
+            ):
+                self._spill()
+
+    @contextmanager
+    def view(self) -> Iterator[Buffer]:
+        """Yield the retained audio without copying it when spilled to disk."""
+        with self._lock:
+            start, end = self._start, self._end
+            if end <= start:
+                data: Optional[bytes] = b""
+                mm = None
+            elif self._file is None:
+                data = bytes(self._mem[start:end])
+                mm = None
+            else:
+                data = None
+                mm = mmap.mmap(self._file.fileno(), end, access=mmap.ACCESS_READ)
+        if mm is None:
+            yield data
+            return
+        mv = memoryview(mm)[start:end]
+        try:
+            yield mv
+        finally:
+            try:
+                mv.release()
+                mm.close()
+            except BufferError:
+                pass  # a consumer still holds the buffer; freed with it
+
+    def close(self) -> None:
+        with self._lock:
+            self._mem = bytearray()
+            if self._file is not None:
+                try:
+                    self._file.close()
+                except Exception:
+                    pass
+                self._file = None
+            self._start = self._end = 0
+
+    def _spill(self) -> None:
+        f = tempfile.TemporaryFile(prefix="presstalk-", suffix=".pcm", buffering=0)
+        f.write(self._mem[self._start : self._end])
+        self._mem = bytearray()
+        self._file = f
+        self._end -= self._start
+        self._start = 0
+
+    def _compact(self) -> None:
+        if self._file is None:
+            del self._mem[: self._start]
+        else:
+            # copy the tail into a fresh file; readers keep their own mapping
+            # of the old one, so an in-flight decode is never torn
+            old = self._file
+            new = tempfile.TemporaryFile(
+                prefix="presstalk-", suffix=".pcm", buffering=0
+            )
+            with mmap.mmap(old.fileno(), self._end, access=mmap.ACCESS_READ) as mm:
+                for pos in range(self._start, self._end, self._COPY_CHUNK):
+                    new.write(mm[pos : min(pos + self._COPY_CHUNK, self._end)])
+            old.close()
+            self._file = new
+        self._end -= self._start
+        self._start = 0
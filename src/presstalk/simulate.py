@@ -0,0 +1,194 @@
+"""Scripted replay of recorded audio through the live pipeline (`presstalk simulate --audio`).
+
+A `ReplaySource` wraps a finite source (see sources.py) and delivers it at
+`speed`x real time, as a microphone would. Capture runs from the start of
+the file (`Orchestrator.listen()`), so audio before a scripted press lands
+in the prebuffer ring exactly as it does when someone starts speaking just
+before the hotkey. At each scripted position the source pauses until the
+press or release has been handled, so what reaches the engine depends only
+on the script, never on machine speed.
+
+Pacing and timeouts run on a `Clock` (real time by default), so a replay
+on a `VirtualClock` plays at "real time" without waiting for it.
+"""
+
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .capture import PCMSourceProtocol
+from .clock import SYSTEM_CLOCK, Clock
+from .orchestrator import Orchestrator
+
+Utterance = Tuple[float, float]  # (press_s, release_s) into the audio
+
+
+def parse_utterance(spec: str) -> Utterance:
+    """"1.2-3.5" -> (1.2, 3.5); an empty end ("1.2-") means end of input."""
+    start, sep, end = spec.partition("-")
+    if not sep:
+        raise ValueError(f"expected START-END seconds, got {spec!r}")
+    press = float(start or 0.0)
+    release = float(end) if end else float("inf")
+    if press < 0 or release <= press:
+        raise ValueError(f"utterance {spec!r} must have 0 <= START < END")
+    return press, release
+
+
+def utterance_marks(
+    utterances: Sequence[Utterance], *, bytes_per_second: int, channels: int = 1
+) -> List[int]:
+    """Byte offsets (frame aligned) of every press and release, in order."""
+    frame = 2 * int(channels)
+    marks: List[int] = []
+    for press_s, release_s in utterances:
+        for t in (press_s, release_s):
+            if t == float("inf"):
+                marks.append(2**62)
+            else:
+                n = int(t * bytes_per_second)
+                marks.append(n - n % frame)
+    if marks != sorted(marks):
+        raise ValueError("utterances must be in order and must not overlap")
+    return marks
+
+
+class ReplaySource:
+    """Paces `source` at `speed`x real time (0 = as fast as possible) and
+    stops at each byte offset in `marks` until `resume()` is called.
+
+    `reached` receives every mark (in order) once all audio before it has
+    been handed to the capture callback; marks past the end of the input
+    are reached at end of input. Pacing sleeps on `clock`.
+    """
+
+    def __init__(
+        self,
+        source: PCMSourceProtocol,
+        *,
+        bytes_per_second: int,
+        speed: float = 1.0,
+        marks: Sequence[int] = (),
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.source = source
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.bytes_per_second = int(bytes_per_second)
+        self.speed = max(0.0, float(speed))
+        self.device_name = getattr(source, "device_name", None)
+        self._marks = sorted(int(m) for m in marks)
+        self.reached: "queue.Queue[int]" = queue.Queue()
+        self._resume = threading.Event()
+        self._pos = 0
+        self._t0 = 0.0
+
+    def position_s(self) -> float:
+        return self._pos / float(self.bytes_per_second)
+
+    def resume(self) -> None:
+        self._resume.set()
+
+    def start(self) -> None:
+        self.source.start()
+        self._pos = 0
+        self._t0 = self.clock.now()
+
+    def _pause(self) -> None:
+        mark = self._marks.pop(0)
+        paused = self.clock.now()
+        self._resume.clear()
+        self.reached.put(mark)
+        self._resume.wait()
+        # the script's pause is not audio time
+        self._t0 += self.clock.now() - paused
+
+    def read(self, nbytes: int) -> Optional[bytes]:
+        while self._marks and self._pos >= self._marks[0]:
+            self._pause()
+        if self._marks:
+            nbytes = max(1, min(nbytes, self._marks[0] - self._pos))
+        data = self.source.read(nbytes)
+        if data is None:
+            while self._marks:
+                self._pause()
+            return None
+        if not data:
+            return data
+        self._pos += len(data)
+        if self.speed > 0:
+            due = self._t0 + self._pos / (self.bytes_per_second * self.speed)
+            delay = due - self.clock.now()
+            if delay > 0:
+                self.clock.sleep(delay)
+        return data
+
+    def cancel(self) -> None:
+        """Drop the remaining marks and let a paused read continue."""
+        self._marks = []
+        self._resume.set()
+
+    def stop(self) -> None:
+        self.cancel()
+        self.source.stop()
+
+
+def replay(
+    orch: Orchestrator,
+    source: ReplaySource,
+    utterances: Sequence[Utterance],
+    *,
+    events: Optional[List[Dict[str, Any]]] = None,
+    timeout_s: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Drive `orch` through `utterances` while `source` plays; one result each.
+
+    `orch.capture.source` must be `source`, built with the utterances' byte
+    offsets as marks. `events` is the list its status_fn appends
+    `last_utterance` payloads to (for the latency breakdown). Replay ends
+    early if the capture stops (source error) or, with `timeout_s`, when a
+    mark takes longer than that to arrive on the source's clock.
+    """
+    cap = orch.capture
+    clock = source.clock
+    results: List[Dict[str, Any]] = []
+
+    def _wait_mark() -> bool:
+        deadline = None if timeout_s is None else clock.now() + timeout_s
+        while deadline is None or clock.now() < deadline:
+            try:
+                source.reached.get(timeout=0.05)
+                return True
+            except queue.Empty:
+                if cap.wait(0):  # capture ended (source error)
+                    return False
+        return False
+
+    orch.listen()
+    try:
+        for _ in utterances:
+            if not _wait_mark():
+                break
+            at_press = source.position_s()
+            orch.press()
+            source.resume()
+            if not _wait_mark():
+                orch.release()
+                break
+            at_release = source.position_s()
+            text = orch.release()
+            res: Dict[str, Any] = {
+                "press_s": round(at_press, 3),
+                "release_s": round(at_release, 3),
+                "text": text,
+            }
+            if events:
+                last = dict(events[-1])
+                for k in ("seq", "at", "chars"):
+                    last.pop(k, None)
+                res.update(last)
+            results.append(res)
+            source.resume()
+    finally:
+        source.cancel()
+        cap.stop()
+    return results
@@ -0,0 +1,216 @@
+"""PCM sources for headless use: WAV files, raw PCM on stdin, and ffmpeg.
+
+Each implements PCMSourceProtocol, delivers s16le at `sample_rate`/
+`channels` (converting with PCMResampler when the input format differs)
+and returns None from read() at end of input, so a PCMCapture driven by
+one of them finishes on its own.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import wave
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+
+from .resample import PCMResampler
+
+
+class _ConvertingSource(ABC):
+    """Reads `in_rate`/`in_channels` s16le from `_read_raw` and converts it."""
+
+    def __init__(self, *, sample_rate: int, channels: int) -> None:
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.in_rate = self.sample_rate
+        self.in_channels = self.channels
+        self._resampler: Optional[PCMResampler] = None
+        self.device_name: Optional[str] = None
+
+    def _set_input_format(self, rate: int, channels: int) -> None:
+        self.in_rate, self.in_channels = int(rate), int(channels)
+        if (self.in_rate, self.in_channels) != (self.sample_rate, self.channels):
+            self._resampler = PCMResampler(
+                in_rate=self.in_rate,
+                in_channels=self.in_channels,
+                out_rate=self.sample_rate,
+                out_channels=self.channels,
+            )
+        else:
+            self._resampler = None
+
+    @abstractmethod
+    def _read_raw(self, nbytes: int) -> bytes:
+        """Up to `nbytes` of input-format PCM; b"" at end of input."""
+
+    def read(self, nbytes: int) -> Optional[bytes]:
+        frames = max(1, nbytes // (2 * self.channels))
+        if self._resampler is not None:
+            frames = max(1, frames * self.in_rate // self.sample_rate)
+        data = self._read_raw(frames * 2 * self.in_channels)
+        if not data:
+            return None
+        if self._resampler is None:
+            return data
+        # b"" (not None) while the resampler is still filling its history
+        return self._resampler.process(data)
+
+
+class WavFileSource(_ConvertingSource):
+    """16-bit PCM WAV file (any rate/channel count)."""
+
+    def __init__(self, path: str, *, sample_rate: int = 16000, channels: int = 1):
+        super().__init__(sample_rate=sample_rate, channels=channels)
+        self.path = path
+        self.device_name = os.path.basename(path)
+        self._wav: Optional[wave.Wave_read] = None
+
+    def start(self) -> None:
+        wav = wave.open(self.path, "rb")
+        if wav.getsampwidth() != 2 or wav.getcomptype() != "NONE":
+            wav.close()
+            raise RuntimeError(f"{self.path}: only 16-bit PCM WAV is supported")
+        self._wav = wav
+        self._set_input_format(wav.getframerate(), wav.getnchannels())
+
+    def duration_s(self) -> float:
+        wav = self._wav
+        return wav.getnframes() / float(wav.getframerate()) if wav else 0.0
+
+    def _read_raw(self, nbytes: int) -> bytes:
+        if self._wav is None:
+            return b""
+        return self._wav.readframes(nbytes // (2 * self.in_channels))
+
+    def stop(self) -> None:
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+
+class RawPCMStdinSource(_ConvertingSource):
+    """Headerless s16le on a binary stream (stdin by default).
+
+    `input_rate`/`input_channels` describe the stream (default: the output
+    format), e.g. `arecord -f S16_LE -r 48000 -c 2 | presstalk transcribe -`.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[BinaryIO] = None,
+        *,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        input_rate: int = 0,
+        input_channels: int = 0,
+    ) -> None:
+        super().__init__(sample_rate=sample_rate, channels=channels)
+        self._stream = stream
+        self._input_format = (
+            int(input_rate) or self.sample_rate,
+            int(input_channels) or self.channels,
+        )
+        self._rem = b""
+        self.device_name = "stdin"
+
+    def start(self) -> None:
+        if self._stream is None:
+            self._stream = sys.stdin.buffer
+        self._set_input_format(*self._input_format)
+
+    def _read_raw(self, nbytes: int) -> bytes:
+        # pipes return short reads; keep whole frames only
+        frame = 2 * self.in_channels
+        data = self._rem + (self._stream.read(nbytes) or b"")
+        usable = len(data) - len(data) % frame
+        self._rem = data[usable:]
+        return data[:usable]
+
+    def stop(self) -> None:
+        pass
+
+
+class FfmpegSource(_ConvertingSource):
+    """Any format ffmpeg can decode, piped out as s16le at the output format."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        ffmpeg: str = "ffmpeg",
+    ) -> None:
+        super().__init__(sample_rate=sample_rate, channels=channels)
+        self.path = path
+        self.ffmpeg = ffmpeg
+        self.device_name = os.path.basename(path)
+        self._proc: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        exe = shutil.which(self.ffmpeg)
+        if exe is None:
+            raise RuntimeError(f"ffmpeg not found ({self.ffmpeg}); needed for {self.path}")
+        cmd = [exe, "-nostdin", "-loglevel", "error", "-i", self.path]
+        cmd += ["-f", "s16le", "-acodec", "pcm_s16le"]
+        cmd += ["-ar", str(self.sample_rate), "-ac", str(self.channels), "-"]
+        self._proc = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self._rem = b""
+
+    def _read_raw(self, nbytes: int) -> bytes:
+        proc = self._proc
+        if proc is None:
+            return b""
+        frame = 2 * self.channels
+        data = self._rem + (proc.stdout.read(nbytes) or b"")
+        usable = len(data) - len(data) % frame
+        self._rem = data[usable:]
+        if not usable and proc.wait() != 0:
+            err = proc.stderr.read().decode("utf-8", "replace").strip()
+            raise RuntimeError(f"ffmpeg failed on {self.path}: {err or proc.returncode}")
+        return data[:usable]
+
+    def stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        for f in (proc.stdout, proc.stderr):
+            if f is not None:
+                f.close()
+
+
+def open_source(
+    path: str,
+    *,
+    sample_rate: int = 16000,
+    channels: int = 1,
+    ffmpeg: str = "ffmpeg",
+    stdin: Optional[BinaryIO] = None,
+    input_rate: int = 0,
+    input_channels: int = 0,
+):
+    """Source for `path`: "-" is raw PCM on stdin, 16-bit WAV is read
+    directly, and anything else (or a WAV in another encoding) goes
+    through ffmpeg."""
+    if path == "-":
+        return RawPCMStdinSource(
+            stdin,
+            sample_rate=sample_rate,
+            channels=channels,
+            input_rate=input_rate,
+            input_channels=input_channels,
+        )
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, "rb") as w:
+                if w.getsampwidth() == 2 and w.getcomptype() == "NONE":
+                    return WavFileSource(path, sample_rate=sample_rate, channels=channels)
+        except (wave.Error, EOFError):
+            pass
+    return FfmpegSource(path, sample_rate=sample_rate, channels=channels, ffmpeg=ffmpeg)
@@ -0,0 +1,184 @@
+"""Run-time status shared between `presstalk run` and the web UI.
+
+The web config server runs in its own process, so the running instance
+publishes a small JSON snapshot to a per-user file (atomically replaced on
+every update) and the server reads it back for `/api/status`. Outside
+XDG_RUNTIME_DIR the file lives in a 0700 directory owned by the user, so
+other local users can neither read it nor plant a symlink in its place.
+"""
+
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+def status_path() -> str:
+    """Status file location: PT_STATUS_FILE, else a private runtime/temp dir."""
+    explicit = os.getenv("PT_STATUS_FILE")
+    if explicit:
+        return explicit
+    try:
+        import getpass
+
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, f"presstalk-{user}.status.json")
+    base = os.path.join(tempfile.gettempdir(), f"presstalk-{user}")
+    if not _private_dir(base):
+        # someone else holds the shared name; fall back to the home directory
+        base = os.path.join(os.path.expanduser("~"), ".cache", "presstalk")
+        try:
+            os.makedirs(base, mode=0o700, exist_ok=True)
+        except OSError:
+            pass
+    return os.path.join(base, "status.json")
+
+
+def _private_dir(path: str) -> bool:
+    """Create `path` mode 0700, or check an existing one is ours and private."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    except OSError:
+        return False
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False  # includes a symlink planted at the name
+    if os.name == "nt":
+        return True  # the temp dir is already per-user
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (None if unavailable)."""
+    try:
+        import psutil  # type: ignore
+
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        return True  # os.kill(pid, 0) would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except Exception:
+        pass
+    return True
+
+
+class StatusBoard:
+    """Thread-safe status snapshot mirrored to the status file.
+
+    `update()` only merges fields and marks the board dirty; a writer
+    thread writes the latest snapshot, so callers on the capture or hotkey
+    threads never wait on file I/O. Updates arriving while a write is in
+    progress are coalesced into the next one.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or status_path()
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {"pid": os.getpid(), "started": time.time()}
+        self._version = 0
+        self._written = 0
+        self._dirty = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="pt-status-writer", daemon=True
+        )
+        self._thread.start()
+
+    def update(self, **fields: Any) -> None:
+        with self._lock:
+            self._state.update(fields)
+            self._state["updated"] = time.time()
+            self._version += 1
+            self._dirty.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._state)
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until every update so far is in the file."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            target = self._version
+            while self._written < target and not self._closed:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._dirty.wait(left)
+            return self._written >= target
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._lock:
+            self._closed = True
+            self._dirty.notify_all()
+        self._thread.join(timeout)
+        try:
+            if read_status(self.path).get("pid") == os.getpid():
+                os.remove(self.path)
+        except Exception:
+            pass
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while self._written == self._version and not self._closed:
+                    self._dirty.wait()
+                if self._written == self._version:
+                    return  # closed with nothing left to write
+                version, state = self._version, dict(self._state)
+            self._write(state)
+            with self._lock:
+                self._written = version
+                self._dirty.notify_all()
+
+    def _write(self, state: Dict[str, Any]) -> None:
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except Exception:
+                pass
+
+
+def read_status(path: Optional[str] = None) -> Dict[str, Any]:
+    """Return the published status, or {} if no instance is running."""
+    try:
+        with open(path or status_path(), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(state, dict):
+        return {}
+    pid = state.get("pid")
+    if isinstance(pid, int) and not _pid_alive(pid):
+        return {}  # left behind by an instance that did not exit cleanly
+    return state
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+import mimetypes
+import os
+import threading
+import time
 import webbrowser
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
-from ..config import Config
-from ..constants import MODEL_CHOICES
+from ..config import Config, clear_config_cache
+from ..constants import DECODE_PROFILE_CHOICES, MODEL_CHOICES, UI_CONFIG_KEYS
+from ..status import read_status, status_path
 
 
 def _repo_root() -> Path:
@@ -24,21 +31,152 @@ def _discover_config_path(explicit: Optional[str]) -> Optional[str]:
     return str(candidate) if candidate.is_file() else None
 
 
+def _etag(data: bytes) -> str:
+    return '"' + hashlib.sha1(data).hexdigest()[:20] + '"'
+
+
+class _StaticCache:
+    """Static assets held in memory with a gzip copy and ETag, per mtime."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[int, dict]] = {}
+
+    def get(self, path: Path) -> Optional[dict]:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        key = str(path)
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[0] == mtime:
+                return hit[1]
+        raw = path.read_bytes()
+        ctype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if ctype.startswith("text/") or ctype in ("application/javascript", "application/json"):
+            ctype += "; charset=utf-8"
+        entry = {"raw": raw, "ctype": ctype, "etag": _etag(raw)}
+        gz = gzip.compress(raw, compresslevel=9, mtime=0)
+        if len(gz) < len(raw):
+            entry["gzip"] = gz
+        with self._lock:
+            self._entries[key] = (mtime, entry)
+        return entry
+
+
+_STATIC = _StaticCache()
+
+
 class _Handler(SimpleHTTPRequestHandler):
+    # SSE: how often the status file is checked, and the keep-alive period
+    sse_poll_s = 0.1
+    sse_keepalive_s = 15.0
+
     def __init__(self, *args, static_dir: Path, cfg_path: Optional[str], **kwargs):
         self._static_dir = static_dir
         self._cfg_path = cfg_path
         super().__init__(*args, directory=str(static_dir), **kwargs)
 
-    def _send_json(self, obj, status: int = 200) -> None:
+    def _send_json(self, obj, status: int = 200, *, revalidate: bool = False) -> None:
         data = json.dumps(obj).encode("utf-8")
+        if revalidate:
+            # clients may keep it but must ask again; unchanged bodies get a 304
+            tag = _etag(data)
+            if self._not_modified(tag):
+                return
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Cache-Control", "no-store")
+        if revalidate:
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("ETag", tag)
+        else:
+            self.send_header("Cache-Control", "no-store")
         self.send_header("Content-Length", str(len(data)))
         self.end_headers()
         self.wfile.write(data)
 
+    def _not_modified(self, tag: str) -> bool:
+        inm = self.headers.get("If-None-Match", "")
+        if tag not in [t.strip() for t in inm.split(",")] and inm.strip() != "*":
+            return False
+        self.send_response(304)
+        self.send_header("ETag", tag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        return True
+
+    def _stream_status(self) -> None:
+        """Server-Sent Events: push the run status each time it changes.
+
+        The running instance rewrites the status file atomically, so a stat()
+        per tick is enough to notice changes. The file is re-read at least
+        every few seconds anyway, so a crashed instance shows up as not running.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        path = status_path()
+        last_stamp: object = ()
+        last_payload = None
+        last_read = last_write = 0.0
+        try:
+            while True:
+                now = time.monotonic()
+                try:
+                    st = os.stat(path)
+                    stamp: object = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    stamp = None
+                if stamp != last_stamp or now - last_read >= 2.0:
+                    last_stamp, last_read = stamp, now
+                    state = read_status(path)
+                    payload = json.dumps(dict(state, running=bool(state)))
+                    if payload != last_payload:
+                        last_payload = payload
+                        self.wfile.write(f"data: {payload}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        last_write = now
+                if now - last_write >= self.sse_keepalive_s:
+                    self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+                    last_write = now
+                time.sleep(self.sse_poll_s)
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass  # client went away
+
+    def _send_static(self) -> bool:
+        rel = self.path.split("?", 1)[0].split("#", 1)[0].lstrip("/") or "index.html"
+        path = (self._static_dir / rel).resolve()
+        try:
+            path.relative_to(self._static_dir.resolve())
+        except ValueError:
+            return False
+        entry = _STATIC.get(path) if path.is_file() else None
+        if entry is None:
+            return False
+        if self._not_modified(entry["etag"]):
+            return True
+        accept = self.headers.get("Accept-Encoding", "")
+        body = entry["raw"]
+        use_gzip = "gzip" in entry and "gzip" in accept.lower()
+        if use_gzip:
+            body = entry["gzip"]
+        self.send_response(200)
+        self.send_header("Content-Type", entry["ctype"])
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("ETag", entry["etag"])
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        return True
+
     def _read_json(self) -> Tuple[dict, Optional[str]]:
         try:
             length = int(self.headers.get("Content-Length", "0"))
@@ -56,19 +194,28 @@ class _Handler(SimpleHTTPRequestHandler):
             return {}, f"invalid json: {e}"
 
     def do_GET(self):  # noqa: N802 - stdlib signature
+        if self.path.startswith("/api/events"):
+            self._stream_status()
+            return
+        if self.path.startswith("/api/status"):
+            # published by a running `presstalk run` (see status.py)
+            state = read_status()
+            self._send_json(dict(state, running=bool(state)), revalidate=True)
+            return
         if self.path.startswith("/api/config"):
+            # Config() reuses its parsed values until the file or PT_* env changes
             cfg = Config(config_path=self._cfg_path)
-            self._send_json(
-                {
-                    "language": cfg.language,
-                    "model": cfg.model,
-                    "hotkey": cfg.hotkey,
-                    "audio_feedback": bool(getattr(cfg, "audio_feedback", True)),
-                }
-            )
+            self._send_json(cfg.to_dict(*UI_CONFIG_KEYS), revalidate=True)
+            return
+        if self._send_static():
             return
         return super().do_GET()
 
+    def do_HEAD(self):  # noqa: N802 - stdlib signature
+        if self._send_static():
+            return
+        return super().do_HEAD()
+
     def do_POST(self):  # noqa: N802 - stdlib signature
         if self.path.startswith("/api/validate/hotkey"):
             payload, err = self._read_json()
@@ -121,6 +268,10 @@ class _Handler(SimpleHTTPRequestHandler):
                 m = payload["model"].strip().lower()
                 if m in set(MODEL_CHOICES):
                     cfg.model = m
+            if "decode_profile" in payload and isinstance(payload["decode_profile"], str):
+                p = payload["decode_profile"].strip().lower()
+                if p in DECODE_PROFILE_CHOICES:
+                    cfg.decode_profile = p
             if "hotkey" in payload and isinstance(payload["hotkey"], str):
                 hk = normalize_hotkey(payload["hotkey"])  # type: ignore[arg-type]
                 if validate_hotkey(hk):
@@ -136,15 +287,9 @@ class _Handler(SimpleHTTPRequestHandler):
 
             # Decide path: repo root or provided path or default repo path
             path = self._cfg_path or str((_repo_root() / "presstalk.yaml"))
-            writer(
-                path,
-                {
-                    "language": cfg.language,
-                    "model": cfg.model,
-                    "hotkey": cfg.hotkey,
-                    "audio_feedback": bool(getattr(cfg, "audio_feedback", True)),
-                },
-            )
+            writer(path, cfg.to_dict(*UI_CONFIG_KEYS))
+            # a rewrite within one mtime tick would not change the cache key
+            clear_config_cache()
             self._send_json({"ok": True, "path": path})
             return
         return super().do_POST()
@@ -160,7 +305,8 @@ def serve_web_config(
     def _handler(*args, **kwargs):  # type: ignore
         return _Handler(*args, static_dir=static_dir, cfg_path=cfg_path, **kwargs)
 
-    httpd = HTTPServer(("127.0.0.1", port), _handler)
+    # one thread per connection: a slow client cannot block status polling
+    httpd = ThreadingHTTPServer(("127.0.0.1", port), _handler)
 
     url = f"http://127.0.0.1:{port}/"
     print(f"Web config running at {url}")
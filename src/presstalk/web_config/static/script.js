@@ -17,6 +17,7 @@ function fillForm(cfg) {
   document.getElementById('hotkey').value = cfg.hotkey || '';
   document.getElementById('language').value = cfg.language || 'ja';
   document.getElementById('model').value = cfg.model || 'small';
+  document.getElementById('decode_profile').value = cfg.decode_profile || 'balanced';
   document.getElementById('audio_feedback').checked = !!cfg.audio_feedback;
 }
 
@@ -25,6 +26,7 @@ function readForm() {
     hotkey: document.getElementById('hotkey').value.trim(),
     language: document.getElementById('language').value,
     model: document.getElementById('model').value,
+    decode_profile: document.getElementById('decode_profile').value,
     audio_feedback: document.getElementById('audio_feedback').checked,
   };
 }
@@ -35,6 +37,94 @@ function status(msg, ok = true) {
   el.style.color = ok ? 'inherit' : 'crimson';
 }
 
+function formatBytes(n) {
+  if (!n) return '';
+  const units = ['B', 'KB', 'MB', 'GB'];
+  let i = 0;
+  while (n >= 1024 && i < units.length - 1) { n /= 1024; i++; }
+  return n.toFixed(i ? 1 : 0) + ' ' + units[i];
+}
+
+function describeRun(st) {
+  if (!st || !st.running) return 'PressTalk is not running';
+  const model = st.model ? ' (' + st.model + ')' : '';
+  const secs = typeof st.model_elapsed_s === 'number' ? Math.round(st.model_elapsed_s) + 's' : '';
+  const mem = [st.rss_bytes ? 'RSS ' + formatBytes(st.rss_bytes) : '',
+               st.model_bytes ? 'model ' + formatBytes(st.model_bytes) : ''].filter(Boolean).join(', ');
+  const suffix = mem ? ' · ' + mem : '';
+  if (st.model_state === 'loading') return 'Loading model' + model + '... ' + secs + ' (recordings are kept)' + suffix;
+  if (st.model_state === 'failed') return 'Model' + model + ' failed to load: ' + (st.model_error || 'unknown error');
+  if (st.model_state === 'ready') return 'Model' + model + ' ready (loaded in ' + secs + ')' + suffix;
+  if (st.model_state === 'unloaded') return 'Model' + model + ' unloaded while idle; reloads on the next press' + suffix;
+  return 'PressTalk is running';
+}
+
+function describeDevice(st) {
+  const name = st.device || 'system default';
+  if (st.device_state === 'lost') return name + ' lost: ' + (st.device_error || 'stream stopped') + '; reconnecting...';
+  if (st.device_state === 'reconnecting') return 'Reconnecting (attempt ' + (st.device_retries || 1) + '): ' + (st.device_error || '');
+  return st.device_state === 'ok' ? name : '';
+}
+
+const LATENCY_ROWS = 10;
+let _lastUtterance = 0;
+
+function renderLive(st) {
+  const run = document.getElementById('run-status');
+  if (run) run.textContent = describeRun(st);
+  const running = !!(st && st.running);
+  const state = running ? (st.state || 'idle') : 'not running';
+  const badge = document.getElementById('live-state');
+  if (badge) {
+    badge.textContent = state;
+    badge.className = 'badge ' + state.replace(' ', '-');
+  }
+  const meter = document.getElementById('live-level');
+  const db = document.getElementById('live-level-db');
+  const level = running && st.state === 'recording' && typeof st.level_db === 'number' ? st.level_db : null;
+  if (meter) meter.value = level === null ? meter.min : level;
+  if (db) db.textContent = level === null ? '' : level.toFixed(1) + ' dBFS' + (st.clipping ? ' (clipping)' : '');
+  const dev = document.getElementById('live-device');
+  if (dev) dev.textContent = running ? describeDevice(st) : '';
+  const u = running ? st.last_utterance : null;
+  const body = document.getElementById('live-latency');
+  if (u && body && u.seq !== _lastUtterance) {
+    _lastUtterance = u.seq;
+    const tr = document.createElement('tr');
+    const decode = u.skipped ? 'skipped (' + u.skipped.replace('_', ' ') + ')' : u.decode_ms;
+    [u.seq, u.audio_s + ' s', u.capture_stop_ms, decode, u.paste_ms, u.total_ms].forEach((v) => {
+      const td = document.createElement('td');
+      td.textContent = String(v);
+      tr.appendChild(td);
+    });
+    body.insertBefore(tr, body.firstChild);
+    while (body.children.length > LATENCY_ROWS) body.removeChild(body.lastChild);
+  }
+}
+
+async function refreshRunStatus() {
+  try {
+    const res = await fetch('/api/status');
+    renderLive(await res.json());
+  } catch {
+    renderLive(null);
+  }
+}
+
+function watchRunStatus() {
+  if (!window.EventSource) {
+    refreshRunStatus();
+    window.setInterval(refreshRunStatus, 1000);
+    return;
+  }
+  // EventSource reconnects on its own if the server restarts
+  const es = new EventSource('/api/events');
+  es.onmessage = (ev) => {
+    try { renderLive(JSON.parse(ev.data)); } catch {}
+  };
+  es.onerror = () => renderLive(null);
+}
+
 let _hkTimer = null;
 async function validateHotkeyLive(value) {
   const err = document.getElementById('hotkey-error');
@@ -159,6 +249,7 @@ window.addEventListener('DOMContentLoaded', async () => {
   } catch (e) {
     status('Failed to load configuration', false);
   }
+  watchRunStatus();
   form.addEventListener('submit', async (ev) => {
     ev.preventDefault();
     // simple client-side validation
@@ -0,0 +1,158 @@
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from presstalk import app_prompts
+from presstalk.app_prompts import AppPrompts, parse_app_prompts
+from presstalk.config import Config
+from presstalk.controller import Controller
+from presstalk.engine.fwhisper_engine import FasterWhisperEngine
+from presstalk.ring_buffer import RingBuffer
+
+
+class TestParseAppPrompts(unittest.TestCase):
+    def test_mapping_list_and_env_forms(self):
+        self.assertEqual(
+            parse_app_prompts({"Code": "Python, pytest", "slack": ""}),
+            [("code", "Python, pytest")],
+        )
+        self.assertEqual(
+            parse_app_prompts(["bundle_id:com.x.Editor: asyncio: await", "junk"]),
+            [("bundle_id:com.x.editor", "asyncio: await")],
+        )
+        self.assertEqual(
+            parse_app_prompts("code: numpy; *: PressTalk"),
+            [("code", "numpy"), ("*", "PressTalk")],
+        )
+        self.assertEqual(parse_app_prompts(None), [])
+
+
+class TestAppPrompts(unittest.TestCase):
+    def test_first_match_and_catch_all(self):
+        p = AppPrompts({"name:=code": "vscode words", "^term": "shell", "*": "default"})
+        self.assertEqual(p.prompt_for({"name": "Code"}), "vscode words")
+        self.assertEqual(p.prompt_for({"name": "Terminal"}), "shell")
+        self.assertEqual(p.prompt_for({"name": "Safari"}), "default")
+        self.assertEqual(p.prompt_for({}), "default")
+
+    def test_no_match_returns_none(self):
+        p = AppPrompts({"bundle_id:com.apple.dt.xcode": "Swift"})
+        self.assertIsNone(p.prompt_for({"name": "Xcode"}))
+        self.assertEqual(p.prompt_for({"bundle_id": "com.apple.dt.Xcode"}), "Swift")
+        self.assertFalse(AppPrompts(None))
+
+    def test_lookup_cached_per_app(self):
+        p = AppPrompts({"code": "x"})
+        with mock.patch.object(
+            app_prompts, "match_rules", wraps=app_prompts.match_rules
+        ) as m:
+            for _ in range(5):
+                p.prompt_for({"name": "Code"})
+            self.assertEqual(m.call_count, 1)
+
+    def test_config_from_env(self):
+        with mock.patch.dict(os.environ, {"PT_APP_PROMPTS": "code: numpy"}):
+            cfg = Config()
+        self.assertEqual(AppPrompts.from_config(cfg).entries, [("code", "numpy")])
+        self.assertEqual(Config().app_prompts, {})
+
+
+class _PromptBackend:
+    def __init__(self):
+        self.prompts = []
+
+    def transcribe(self, pcm, *, sample_rate, language, model, prompt=None):
+        self.prompts.append(prompt)
+        return "ok"
+
+
+class TestSessionPrompt(unittest.TestCase):
+    def test_callable_prompt_resolved_once_per_session(self):
+        backend = _PromptBackend()
+        eng = FasterWhisperEngine(
+            sample_rate=16000, language="en", model="tiny", backend=backend
+        )
+        calls = []
+
+        def prompt_fn():
+            calls.append(1)
+            return "PressTalk"
+
+        ctl = Controller(
+            eng, RingBuffer(10), prebuffer_ms=0, min_capture_ms=0, prompt_fn=prompt_fn
+        )
+        self.assertEqual(calls, [])  # nothing on the press path
+        ctl.press()
+        ctl.live_push(b"\x00\x00")
+        self.assertEqual(ctl.release(), "ok")
+        self.assertEqual(backend.prompts, ["PressTalk"])
+        self.assertEqual(len(calls), 1)
+
+    def test_no_prompt_not_passed(self):
+        class Plain:
+            def transcribe(self, pcm, *, sample_rate, language, model):
+                return "plain"
+
+        eng = FasterWhisperEngine(
+            sample_rate=16000, language="en", model="tiny", backend=Plain()
+        )
+        sid = eng.start_session(prompt=lambda: None)
+        eng.push_audio(sid, b"\x00\x00")
+        self.assertEqual(eng.finalize(sid), "plain")
+
+
+class TestPasteGuardApp(unittest.TestCase):
+    def test_guard_sees_the_app_frontmost_at_paste_time(self):
+        import presstalk.cli as cli
+
+        front = {"app": {"name": "Code"}}
+        cfg = Config()
+        cfg.app_prompts = {"code": "numpy"}
+        cfg.paste_guard = True
+        cfg.paste_blocklist = "Terminal"
+        with mock.patch.object(cli, "get_frontmost_app", lambda: front["app"]):
+            prompt_fn, paste = cli._prompt_fn(cfg), cli._paste_fn(cfg)
+            self.assertEqual(prompt_fn(), "numpy")
+            # switched to a terminal after the prompt was resolved
+            front["app"] = {"name": "Terminal"}
+            self.assertFalse(paste("rm -rf ~"))
+
+
+class TestBackendPromptTokens(unittest.TestCase):
+    def test_prompt_tokenized_once(self):
+        encodes = []
+
+        class Tok:
+            def encode(self, text, add_special_tokens=True):
+                encodes.append(text)
+                return types.SimpleNamespace(ids=[1, 2, 3])
+
+        class Model:
+            def __init__(self, name, **kw):
+                self.hf_tokenizer = Tok()
+                self.opts = []
+
+            def transcribe(self, audio, language, **opts):
+                self.opts.append(opts)
+                return [types.SimpleNamespace(text=" x")], None
+
+        fake = types.ModuleType("faster_whisper")
+        fake.WhisperModel = Model
+        with mock.patch.dict(sys.modules, {"faster_whisper": fake}):
+            from presstalk.engine.fwhisper_backend import FasterWhisperBackend
+
+            be = FasterWhisperBackend(model="tiny")
+        pcm = b"\x00\x00" * 10
+        for _ in range(3):
+            be.transcribe(pcm, sample_rate=16000, language="en", model="t", prompt="pt")
+        be.transcribe(pcm, sample_rate=16000, language="en", model="t")
+        self.assertEqual(encodes, [" pt"])
+        self.assertEqual(be._model.opts[0]["initial_prompt"], [1, 2, 3])
+        self.assertNotIn("initial_prompt", be._model.opts[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -66,6 +66,8 @@ class TestCliConfig(unittest.TestCase):
                 "4",
                 "n",  # edit audio feedback (disable)
                 "5",
+                "fastest",  # edit decode profile
+                "6",
                 "y",  # save changes, then confirm with 'y'
             ]
             args = SimpleNamespace(cmd="config", config=path, show=False)
@@ -78,6 +80,7 @@ class TestCliConfig(unittest.TestCase):
             self.assertEqual(cfg.language, "en")
             self.assertEqual(cfg.model, "base")
             self.assertEqual(cfg.audio_feedback, False)
+            self.assertEqual(cfg.decode_profile, "fastest")
         finally:
             os.environ.pop("PT_SIMPLE_UI", None)
             os.remove(path)
@@ -91,7 +94,7 @@ class TestCliConfig(unittest.TestCase):
                 "1",
                 "ctrl+alt",
                 "",  # hotkey editor: invalid then keep current
-                "5",
+                "6",
                 "y",  # save + confirm with 'y'
             ]
             args = SimpleNamespace(cmd="config", config=path, show=False)
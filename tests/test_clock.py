@@ -0,0 +1,216 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from presstalk.bench import bench_pipeline
+from presstalk.capture import PCMCapture
+from presstalk.clock import SYSTEM_CLOCK, Stopwatch, VirtualClock, elapsed_ms, elapsed_s
+from presstalk.controller import Controller
+from presstalk.engine.dummy_engine import DummyAsrEngine
+from presstalk.orchestrator import Orchestrator
+from presstalk.ring_buffer import RingBuffer
+
+
+class _SlowEngine(DummyAsrEngine):
+    """Decoding takes `decode_s` on the given clock."""
+
+    def __init__(self, clock, decode_s):
+        super().__init__()
+        self.clock = clock
+        self.decode_s = decode_s
+
+    def finalize(self, session_id, timeout_s=10.0):
+        self.clock.sleep(self.decode_s)
+        return super().finalize(session_id, timeout_s)
+
+
+class _ListSource:
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def start(self):
+        pass
+
+    def read(self, nbytes):
+        return self._chunks.pop(0) if self._chunks else None
+
+    def stop(self):
+        pass
+
+
+class _DeadSource:
+    def start(self):
+        raise OSError("device unavailable")
+
+    def read(self, nbytes):
+        return None
+
+    def stop(self):
+        pass
+
+
+class TestVirtualClock(unittest.TestCase):
+    def test_auto_advance(self):
+        clock = VirtualClock(10.0)
+        clock.sleep(1.5)
+        clock.advance(0.5)
+        self.assertEqual(clock.now(), 12.0)
+        self.assertEqual(clock.sleeps, [1.5])
+        ev = threading.Event()
+        self.assertFalse(clock.wait(ev, 2.0))
+        self.assertEqual(clock.now(), 14.0)
+        ev.set()
+        self.assertTrue(clock.wait(ev, 2.0))
+        self.assertEqual(clock.now(), 14.0)
+
+    def test_manual_sleep_blocks_until_advanced(self):
+        clock = VirtualClock(auto_advance=False)
+        woke = threading.Event()
+
+        def _sleeper():
+            clock.sleep(1.0)
+            woke.set()
+
+        t = threading.Thread(target=_sleeper)
+        t.start()
+        clock.advance(0.5)
+        self.assertFalse(woke.wait(0.05))
+        clock.advance(0.5)
+        self.assertTrue(woke.wait(1.0))
+        t.join()
+
+    def test_system_clock_is_monotonic(self):
+        a = SYSTEM_CLOCK.now()
+        self.assertLessEqual(a, SYSTEM_CLOCK.now())
+        ns = SYSTEM_CLOCK.now_ns()
+        self.assertIsInstance(ns, int)
+        self.assertLessEqual(ns, SYSTEM_CLOCK.now_ns())
+
+    def test_elapsed_helpers_keep_microseconds(self):
+        self.assertEqual(elapsed_ms(1_000_000, 1_250_400), 0.25)
+        self.assertEqual(elapsed_ms(0, 1_234_567), 1.235)
+        self.assertEqual(elapsed_s(0, 1_234_567), 0.001235)
+        clock = VirtualClock(5.0)
+        sw = Stopwatch(clock)
+        clock.advance(0.0004)
+        self.assertEqual(sw.elapsed_ns(), 400_000)
+        self.assertEqual(sw.elapsed_ms(), 0.4)
+        sw.restart()
+        self.assertEqual(sw.elapsed_s(), 0.0)
+        self.assertEqual(clock.now(), 5.0004)
+
+
+class TestPipelineOnVirtualClock(unittest.TestCase):
+    def _orch(self, clock, engine, min_capture_ms=0, chunks=()):
+        ring = RingBuffer(64)
+        ctl = Controller(
+            engine,
+            ring,
+            prebuffer_ms=0,
+            min_capture_ms=min_capture_ms,
+            bytes_per_second=32000,
+            clock=clock,
+        )
+        cap = PCMCapture(
+            sample_rate=16000,
+            channels=1,
+            chunk_ms=10,
+            source=_ListSource(chunks),
+            clock=clock,
+        )
+        events = []
+        orch = Orchestrator(
+            controller=ctl,
+            ring=ring,
+            capture=cap,
+            paste_fn=lambda t: True,
+            audio_feedback=False,
+            status_fn=lambda **kw: events.append(kw),
+        )
+        return orch, events
+
+    def test_latency_breakdown_is_exact(self):
+        clock = VirtualClock()
+        orch, events = self._orch(clock, _SlowEngine(clock, 0.25), chunks=[b"ab"])
+        self.assertIs(orch.clock, clock)  # taken from the controller
+        orch.press()
+        orch.capture.wait(1.0)
+        clock.advance(1.0)
+        self.assertEqual(orch.release(), "bytes=2")
+        last = [e for e in events if "last_utterance" in e][-1]["last_utterance"]
+        self.assertEqual(last["decode_ms"], 250.0)
+        self.assertEqual(last["total_ms"], 250.0)
+        self.assertEqual(last["capture_stop_ms"], 0.0)
+        self.assertEqual(orch.stats()["duration_s"], 1.25)
+
+    def test_sub_millisecond_latency(self):
+        clock = VirtualClock()
+        orch, events = self._orch(clock, _SlowEngine(clock, 0.0004), chunks=[b"ab"])
+        orch.press()
+        orch.capture.wait(1.0)
+        orch.release()
+        last = [e for e in events if "last_utterance" in e][-1]["last_utterance"]
+        self.assertEqual(last["decode_ms"], 0.4)
+
+    def test_wall_clock_jump_does_not_affect_hold(self):
+        ctl = Controller(
+            DummyAsrEngine(),
+            RingBuffer(8),
+            prebuffer_ms=0,
+            min_capture_ms=30,
+            bytes_per_second=32000,
+        )
+        # the system clock steps back an hour between press and release
+        with mock.patch("time.time", side_effect=[1e9, 1e9 - 3600] * 4):
+            ctl.press()
+            sw = Stopwatch()
+            ctl.release()
+        self.assertGreaterEqual(sw.elapsed_ms(), 25.0)
+        self.assertLess(sw.elapsed_ms(), 1000.0)
+
+    def test_min_capture_skipped_when_held_long_enough(self):
+        clock = VirtualClock()
+        orch, _ = self._orch(clock, DummyAsrEngine(), min_capture_ms=1500)
+        orch.press()
+        clock.advance(2.0)
+        sleeps = len(clock.sleeps)
+        orch.release()
+        self.assertEqual(clock.sleeps[sleeps:], [])
+
+    def test_capture_backoff_runs_on_the_clock(self):
+        clock = VirtualClock()
+        states = []
+        cap = PCMCapture(
+            sample_rate=16000,
+            channels=1,
+            chunk_ms=10,
+            source=_DeadSource(),
+            recover=True,
+            backoff_s=(1.0, 8.0),
+            status_fn=lambda **kw: states.append(kw),
+            clock=clock,
+        )
+        t0 = time.perf_counter()
+        cap.start(lambda b: None)
+        while len(states) < 6 and time.perf_counter() - t0 < 2.0:
+            time.sleep(0.001)
+        cap.stop()
+        # 1+2+4+8+8 s of backoff in well under a real second
+        self.assertGreaterEqual(clock.now(), 23.0)
+        self.assertLess(time.perf_counter() - t0, 1.0)
+
+    def test_bench_pipeline(self):
+        (row,) = bench_pipeline(seconds=4.0)
+        self.assertEqual(row["suite"], "pipeline")
+        self.assertEqual(row["utterances"], 2)
+        # a 1.5 s minimum hold per utterance is virtual
+        self.assertLess(row["wall_ms_per_utterance"], 1000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
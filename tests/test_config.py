@@ -32,6 +32,23 @@ class TestConfig(unittest.TestCase):
             os.environ.pop("PT_CHANNELS", None)
             os.environ.pop("PT_MODEL", None)
 
+    def test_session_storage_env(self):
+        os.environ["PT_SESSION_MAX_S"] = "600"
+        os.environ["PT_SESSION_CAP_POLICY"] = "Window"
+        try:
+            cfg = Config()
+            self.assertEqual(cfg.session_spill_s, 120)
+            self.assertEqual(cfg.session_max_s, 600)
+            self.assertEqual(cfg.session_cap_policy, "window")
+        finally:
+            os.environ.pop("PT_SESSION_MAX_S", None)
+            os.environ.pop("PT_SESSION_CAP_POLICY", None)
+        os.environ["PT_SESSION_CAP_POLICY"] = "bogus"
+        try:
+            self.assertEqual(Config().session_cap_policy, "truncate")
+        finally:
+            os.environ.pop("PT_SESSION_CAP_POLICY", None)
+
 
 if __name__ == "__main__":
     unittest.main()
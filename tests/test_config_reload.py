@@ -0,0 +1,257 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import presstalk.cli as cli  # type: ignore
+from presstalk.capture import PCMCapture
+from presstalk.config_watch import ConfigWatcher
+from presstalk.controller import Controller
+from presstalk.engine.fwhisper_engine import FasterWhisperEngine
+from presstalk.engine.loader import BackgroundBackend
+from presstalk.orchestrator import Orchestrator
+from presstalk.ring_buffer import RingBuffer
+
+
+class _Backend:
+    def __init__(self, name="small"):
+        self.name = name
+        self.profile = None
+        self.unloaded = False
+
+    def transcribe(self, pcm, **kw):
+        return self.name
+
+    def set_profile(self, profile):
+        self.profile = profile
+
+    def unload(self):
+        self.unloaded = True
+
+
+class TestConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "presstalk.yaml")
+        with open(self.path, "w") as f:
+            f.write("language: ja\n")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _check(self, use_inotify):
+        hits = threading.Event()
+        w = ConfigWatcher(
+            [self.path],
+            hits.set,
+            poll_s=0.02 if not use_inotify else 5.0,
+            debounce_s=0.02,
+            use_inotify=use_inotify,
+        ).start()
+        try:
+            time.sleep(0.05)
+            with open(self.path, "w") as f:
+                f.write("language: en\nmodel: tiny\n")
+            self.assertTrue(hits.wait(2.0))
+        finally:
+            w.stop()
+        return w
+
+    def test_poll_detects_change(self):
+        self.assertEqual(self._check(False).backend, "poll")
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_detects_change_without_polling(self):
+        w = self._check(True)
+        self.assertEqual(w.backend, "inotify")
+
+    def test_created_file_counts_as_change(self):
+        os.remove(self.path)
+        hits = threading.Event()
+        w = ConfigWatcher([self.path], hits.set, poll_s=0.02, debounce_s=0.0)
+        w.start()
+        try:
+            with open(self.path, "w") as f:
+                f.write("language: en\n")
+            self.assertTrue(hits.wait(2.0))
+        finally:
+            w.stop()
+
+
+class TestSwap(unittest.TestCase):
+    def test_swap_reload_replaces_model(self):
+        old = _Backend("small")
+        be = BackgroundBackend(lambda: old).start()
+        self.assertTrue(be.wait_ready(2.0))
+        be.swap(lambda: _Backend("tiny"))
+        self.assertTrue(be.wait_ready(2.0))
+        self.assertEqual(be.transcribe(b"\x00\x00"), "tiny")
+        self.assertTrue(old.unloaded)
+
+    def test_swap_without_reload_keeps_model(self):
+        be = BackgroundBackend(lambda: _Backend("small")).start()
+        be.wait_ready(2.0)
+        loads = be._loads
+        be.swap(lambda: _Backend("tiny"), reload=False)
+        self.assertEqual(be._loads, loads)
+        self.assertEqual(be.transcribe(b"\x00\x00"), "small")
+        # the new factory is used for the next (idle) reload
+        be._maybe_unload()
+        self.assertEqual(be.transcribe(b"\x00\x00"), "tiny")
+
+    def test_superseded_load_is_discarded(self):
+        gate = threading.Event()
+
+        def slow():
+            gate.wait(2.0)
+            return _Backend("small")
+
+        be = BackgroundBackend(slow).start()
+        be.swap(lambda: _Backend("tiny"))
+        self.assertTrue(be.wait_ready(2.0))
+        gate.set()
+        time.sleep(0.05)
+        self.assertEqual(be.transcribe(b"\x00\x00"), "tiny")
+
+
+class TestRunReloader(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "presstalk.yaml")
+        self._write("language: ja\nmodel: small\nhotkey: ctrl+space\n")
+        self.args = SimpleNamespace(config=self.path)
+        self.cfg = cli._load_run_config(self.args)
+        self.backend = BackgroundBackend(lambda: _Backend("small")).start()
+        self.backend.wait_ready(2.0)
+        self.engine = FasterWhisperEngine(
+            sample_rate=16000, language="ja", model="small", backend=self.backend
+        )
+        ring = RingBuffer(32000)
+        ctl = Controller(self.engine, ring, prebuffer_ms=1000, language="ja")
+        self.orch = Orchestrator(
+            controller=ctl,
+            ring=ring,
+            capture=PCMCapture(
+                sample_rate=16000, channels=1, chunk_ms=20, source=mock.Mock()
+            ),
+            paste_fn=lambda t: True,
+        )
+        self.bound = []
+        self.reloader = cli._RunReloader(
+            self.orch,
+            self.cfg,
+            self.args,
+            plan=SimpleNamespace(cpu_threads=1, num_workers=1),
+            rebind=lambda mode, hotkey: self.bound.append((mode, hotkey)),
+        )
+        fake = mock.patch.object(
+            cli, "_backend_factory", lambda cfg, plan: lambda: _Backend(cfg.model)
+        )
+        fake.start()
+        self.addCleanup(fake.stop)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write(self, text):
+        with open(self.path, "w") as f:
+            f.write(text)
+
+    def test_unchanged_file_is_a_no_op(self):
+        self.assertEqual(self.reloader.reload(), [])
+
+    def test_controller_options_and_hotkey(self):
+        paste = self.orch.paste_fn
+        self._write(
+            "language: en\nmodel: small\nhotkey: shift+space\nmin_capture_ms: 300\n"
+            "prebuffer_ms: 200\naudio_feedback: false\npaste_blocklist: foo\n"
+        )
+        changed = self.reloader.reload()
+        for k in ("language", "hotkey", "min_capture_ms", "prebuffer_ms"):
+            self.assertIn(k, changed)
+        ctl = self.orch.controller
+        self.assertEqual(ctl.language, "en")
+        self.assertEqual(ctl.min_capture_ms, 300)
+        self.assertIs(self.orch.ring, ctl.ring)
+        self.assertEqual(ctl.ring.capacity(), 6400)
+        self.assertFalse(self.orch.audio_feedback)
+        self.assertIsNot(self.orch.paste_fn, paste)
+        self.assertEqual(self.bound, [("hold", "shift+space")])
+        # the model is untouched
+        self.assertEqual(self.backend._loads, 1)
+
+    def test_model_change_reloads_backend(self):
+        self._write("language: ja\nmodel: tiny\nhotkey: ctrl+space\n")
+        self.assertEqual(self.reloader.reload(), ["model"])
+        self.assertTrue(self.backend.wait_ready(2.0))
+        self.assertEqual(self.backend._loads, 2)
+        self.assertEqual(self.engine.model, "tiny")
+        self.assertEqual(self.backend.transcribe(b"\x00\x00"), "tiny")
+
+    def test_profile_change_keeps_model(self):
+        self._write(
+            "language: ja\nmodel: small\nhotkey: ctrl+space\ndecode_profile: fastest\n"
+        )
+        self.reloader.reload()
+        self.assertEqual(self.backend._loads, 1)
+        self.assertEqual(self.backend._backend.profile, "fastest")
+
+    def test_cli_overrides_survive_reload(self):
+        self.args.language = "fr"
+        self._write("language: en\nmodel: small\nhotkey: ctrl+space\n")
+        self.reloader.reload()
+        self.assertEqual(self.orch.controller.language, "fr")
+
+    def test_invalid_hotkey_keeps_previous(self):
+        def reject(mode, hotkey):
+            raise ValueError(f"Invalid hotkey: {hotkey}")
+
+        self.reloader._rebind = reject
+        self._write("language: ja\nmodel: small\nhotkey: ctrl+alt+shift\n")
+        self.assertEqual(self.reloader.reload(), [])
+        self.assertEqual(self.reloader.cfg.hotkey, "ctrl+space")
+
+    def test_restart_only_keys_are_reported(self):
+        self._write("language: ja\nmodel: small\nhotkey: ctrl+space\ncpu_threads: 3\n")
+        with mock.patch.object(cli, "get_logger") as log:
+            self.assertEqual(self.reloader.reload(), ["cpu_threads"])
+        msg, *fmt_args = log.return_value.info.call_args[0]
+        self.assertIn("Restart to apply: cpu_threads", msg % tuple(fmt_args))
+
+    def test_waits_for_recording_to_finish(self):
+        ctl = self.orch.controller
+        self.orch._set_busy(True)  # an utterance between press and release
+        threading.Timer(0.1, self.orch._set_busy, [False]).start()
+        self._write("language: en\nmodel: small\nhotkey: ctrl+space\n")
+        t0 = time.monotonic()
+        self.reloader.reload()
+        self.assertGreaterEqual(time.monotonic() - t0, 0.08)
+        self.assertEqual(ctl.language, "en")
+
+    def test_press_waits_for_reload(self):
+        applying = threading.Event()
+        order = []
+
+        def slow_rebind(mode, hotkey):
+            applying.set()
+            time.sleep(0.1)
+            order.append("rebind")
+
+        self.reloader._rebind = slow_rebind
+        self.orch._press = lambda: order.append("press")
+        self._write("language: ja\nmodel: small\nhotkey: shift+space\n")
+        t = threading.Thread(target=self.reloader.reload)
+        t.start()
+        self.assertTrue(applying.wait(2.0))
+        self.orch.press()
+        t.join(2.0)
+        self.assertEqual(order, ["rebind", "press"])
+
+
+if __name__ == "__main__":
+    unittest.main()
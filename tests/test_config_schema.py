@@ -0,0 +1,90 @@
+import dataclasses
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from presstalk.config import FIELD_MAP, FIELDS, Config, clear_config_cache
+
+
+class TestConfigSchema(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".yaml")
+        os.close(fd)
+        self._write("language: en\nprebuffer_ms: 250\n")
+        clear_config_cache()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _write(self, text):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_schema_covers_every_field(self):
+        names = {f.name for f in dataclasses.fields(Config)} - {"config_path"}
+        self.assertEqual(names, set(FIELD_MAP))
+        self.assertEqual(len(FIELDS), len(FIELD_MAP))
+
+    def test_cached_until_file_or_env_changes(self):
+        with mock.patch.object(Config, "_load_yaml", wraps=Config._load_yaml) as m:
+            self.assertEqual(Config(config_path=self.path).language, "en")
+            Config(config_path=self.path)
+            self.assertEqual(m.call_count, 1)
+            st = os.stat(self.path)
+            self._write("language: de\nprebuffer_ms: 250\n")
+            os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            self.assertEqual(Config(config_path=self.path).language, "de")
+            self.assertEqual(m.call_count, 2)
+            with mock.patch.dict(os.environ, {"PT_LANGUAGE": "fr"}):
+                self.assertEqual(Config(config_path=self.path).language, "fr")
+            self.assertEqual(m.call_count, 3)
+
+    def test_instances_do_not_share_mutable_values(self):
+        self._write("paste_blocklist: [A, B]\n")
+        a = Config(config_path=self.path)
+        a.paste_blocklist.append("C")
+        self.assertEqual(Config(config_path=self.path).paste_blocklist, ["A", "B"])
+
+    def test_invalid_values_fall_back(self):
+        self._write(
+            "prebuffer_ms: lots\nsession_cap_policy: bogus\ncpu_affinity: [0, 2]\n"
+        )
+        with mock.patch.dict(os.environ, {"PT_MIN_CAPTURE_MS": "x"}):
+            cfg = Config(config_path=self.path)
+        self.assertEqual(cfg.prebuffer_ms, 1000)
+        self.assertEqual(cfg.min_capture_ms, 1800)
+        self.assertEqual(cfg.session_cap_policy, "truncate")
+        self.assertEqual(cfg.cpu_affinity, "0,2")
+
+    def test_explicit_arguments_win_and_are_normalised(self):
+        cfg = Config(config_path=self.path, decode_profile="FASTEST", prebuffer_ms=0)
+        self.assertEqual(cfg.decode_profile, "fastest")
+        self.assertEqual(cfg.prebuffer_ms, 0)
+        self.assertEqual(cfg.language, "en")
+
+    def test_to_dict_round_trips(self):
+        from presstalk.cli import _write_yaml
+
+        src = Config(config_path=self.path, model="tiny", offline=True)
+        _write_yaml(self.path, src.to_dict("language", "model", "offline"))
+        clear_config_cache()
+        back = Config(config_path=self.path)
+        self.assertEqual(
+            back.to_dict("language", "model", "offline"),
+            {"language": "en", "model": "tiny", "offline": True},
+        )
+        self.assertEqual(set(src.to_dict()), set(FIELD_MAP))
+
+    def test_bench_suite(self):
+        from presstalk.bench import bench_config
+
+        rows = bench_config(iterations=5, config_path=self.path)
+        self.assertEqual([r["mode"] for r in rows], ["cold", "cached"])
+        self.assertTrue(all(r["us_per_config"] > 0 for r in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
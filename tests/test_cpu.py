@@ -0,0 +1,74 @@
+import os
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from presstalk.engine.cpu import (
+    apply_affinity,
+    available_cpus,
+    format_cpu_list,
+    parse_cpu_list,
+    resolve_threads,
+)
+
+
+class TestCpuList(unittest.TestCase):
+    def test_parse_and_format_roundtrip(self):
+        self.assertEqual(parse_cpu_list("0-3, 6,8-9"), [0, 1, 2, 3, 6, 8, 9])
+        self.assertEqual(parse_cpu_list([3, 1, 1]), [1, 3])
+        self.assertEqual(parse_cpu_list(""), [])
+        self.assertEqual(format_cpu_list([0, 1, 2, 3, 6, 8, 9]), "0-3,6,8-9")
+
+    def test_parse_rejects_bad_ranges(self):
+        with self.assertRaises(ValueError):
+            parse_cpu_list("3-1")
+        with self.assertRaises(ValueError):
+            parse_cpu_list("a")
+
+
+class TestResolveThreads(unittest.TestCase):
+    def test_auto_leaves_headroom(self):
+        plan = resolve_threads(affinity=list(range(8)))
+        self.assertEqual((plan.cpu_threads, plan.num_workers), (3, 2))
+        self.assertLessEqual(plan.cpu_threads * plan.num_workers, 6)
+        plan = resolve_threads(affinity=[0, 1])
+        self.assertEqual((plan.cpu_threads, plan.num_workers), (2, 1))
+        plan = resolve_threads(affinity=[5])
+        self.assertEqual((plan.cpu_threads, plan.num_workers), (1, 1))
+
+    def test_explicit_values_win(self):
+        plan = resolve_threads(6, 3, affinity=list(range(4)))
+        self.assertEqual((plan.cpu_threads, plan.num_workers), (6, 3))
+        self.assertEqual(
+            plan.as_dict(), {"cpu_threads": 6, "num_workers": 3, "affinity": "0-3"}
+        )
+
+    def test_unpinned_uses_available_cpus(self):
+        plan = resolve_threads()
+        self.assertIsNone(plan.affinity)
+        self.assertIn("affinity=all", plan.describe())
+
+    @unittest.skipUnless(hasattr(os, "sched_setaffinity"), "no affinity API")
+    def test_apply_affinity_to_current_set(self):
+        cpus = available_cpus()
+        self.assertEqual(apply_affinity(cpus), cpus)
+        self.assertIsNone(apply_affinity([]))
+
+
+class TestBackendThreadKwargs(unittest.TestCase):
+    def test_threads_passed_to_model(self):
+        calls = []
+        fake = types.ModuleType("faster_whisper")
+        fake.WhisperModel = lambda name, **kw: calls.append(kw)
+        with patch.dict(sys.modules, {"faster_whisper": fake}):
+            from presstalk.engine.fwhisper_backend import FasterWhisperBackend
+
+            FasterWhisperBackend(model="tiny", cpu_threads=3, num_workers=2)
+        self.assertEqual(calls[0]["cpu_threads"], 3)
+        self.assertEqual(calls[0]["num_workers"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,259 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import presstalk.cli as cli  # type: ignore
+from presstalk.capture import PCMCapture
+from presstalk.capture_sd import SoundDeviceSource, resolve_input_device
+from presstalk.logger import INFO, Logger, set_logger
+
+
+class FlakySource:
+    """Yields `chunks`, unplugging after `unplug_after` reads; reopening
+    fails `fail_opens` times before the device comes back."""
+
+    def __init__(self, chunks, unplug_after=2, fail_opens=2):
+        self._chunks = list(chunks)
+        self._reads = 0
+        self.unplug_after = unplug_after
+        self.fail_opens = fail_opens
+        self.starts = 0
+        self.stops = 0
+        self.device_name = "USB Headset"
+        self.open_at = []
+
+    def start(self):
+        self.starts += 1
+        self.open_at.append(time.monotonic())
+        if self.starts > 1 and self.fail_opens > 0:
+            self.fail_opens -= 1
+            raise OSError("device unavailable")
+
+    def read(self, nbytes):
+        self._reads += 1
+        if self._reads == self.unplug_after + 1:
+            raise OSError("stream error")
+        return self._chunks.pop(0) if self._chunks else None
+
+    def stop(self):
+        self.stops += 1
+
+
+def _wait_done(cap, timeout=3.0):
+    end = time.monotonic() + timeout
+    while cap.is_running() and time.monotonic() < end:
+        time.sleep(0.005)
+
+
+class TestCaptureRecovery(unittest.TestCase):
+    def test_reopens_after_disconnect(self):
+        src = FlakySource([b"a", b"b", b"c", b"d"])
+        events = []
+        out = []
+        cap = PCMCapture(
+            sample_rate=16000,
+            channels=1,
+            chunk_ms=10,
+            source=src,
+            recover=True,
+            backoff_s=(0.01, 0.04),
+            status_fn=lambda **kw: events.append(kw),
+        )
+        cap.start(out.append)
+        time.sleep(0.02)
+        _wait_done(cap)
+        cap.stop()
+        self.assertEqual(out, [b"a", b"b", b"c", b"d"])
+        self.assertEqual(src.starts, 4)  # first open, two failures, success
+        self.assertEqual(cap.reconnects, 1)
+        states = [e["device_state"] for e in events]
+        self.assertEqual(states, ["ok", "lost", "reconnecting", "reconnecting", "ok"])
+        self.assertEqual(events[-1]["device"], "USB Headset")
+        self.assertEqual(events[3]["device_retries"], 2)
+
+    def test_backoff_grows_and_is_bounded(self):
+        src = FlakySource([b"a"] * 3, unplug_after=1, fail_opens=4)
+        cap = PCMCapture(
+            sample_rate=16000,
+            channels=1,
+            chunk_ms=10,
+            source=src,
+            recover=True,
+            backoff_s=(0.02, 0.05),
+        )
+        cap.start(lambda b: None)
+        time.sleep(0.02)
+        _wait_done(cap)
+        cap.stop()
+        gaps = [b - a for a, b in zip(src.open_at[1:], src.open_at[2:])]
+        self.assertGreaterEqual(gaps[0], 0.035)  # 0.02 -> 0.04
+        self.assertTrue(all(g < 0.05 + 0.04 for g in gaps))
+
+    def test_stop_interrupts_backoff(self):
+        src = FlakySource([b"a"] * 3, unplug_after=0, fail_opens=100)
+        cap = PCMCapture(
+            sample_rate=16000,
+            channels=1,
+            chunk_ms=10,
+            source=src,
+            recover=True,
+            backoff_s=(5.0, 5.0),
+        )
+        cap.start(lambda b: None)
+        time.sleep(0.05)
+        t0 = time.monotonic()
+        cap.stop()
+        self.assertLess(time.monotonic() - t0, 0.5)
+        self.assertFalse(cap.is_running())
+
+    def test_without_recover_a_read_error_ends_capture(self):
+        src = FlakySource([b"a", b"b", b"c"], unplug_after=1)
+        out = []
+        cap = PCMCapture(sample_rate=16000, channels=1, chunk_ms=10, source=src)
+        cap.start(out.append)
+        _wait_done(cap)
+        cap.stop()
+        self.assertEqual(out, [b"a"])
+        self.assertEqual(src.starts, 1)
+
+
+class _FakeStream:
+    def __init__(self, callback, finished_callback, **kw):
+        self.callback = callback
+        self.finished_callback = finished_callback
+        self.kw = kw
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _FakeSD:
+    __version__ = "0.4.6"
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.default = 0
+        self.streams = []
+        self.rescans = 0
+
+    def query_devices(self, device=None, kind=None):
+        if device is None and kind is None:
+            return self.devices
+        return self.devices[self.default if device is None else device]
+
+    def InputStream(self, **kw):
+        s = _FakeStream(**kw)
+        self.streams.append(s)
+        return s
+
+    def _terminate(self):
+        self.rescans += 1
+
+    def _initialize(self):
+        pass
+
+
+def _dev(name, ch=1):
+    return {"name": name, "max_input_channels": ch, "default_samplerate": 16000.0}
+
+
+class TestSoundDeviceSource(unittest.TestCase):
+    def setUp(self):
+        self.sd = _FakeSD([_dev("Built-in Mic"), _dev("Speakers", 0), _dev("USB Headset")])
+
+    def test_resolve_selector(self):
+        self.assertIsNone(resolve_input_device(self.sd, ""))
+        self.assertEqual(resolve_input_device(self.sd, "2"), 2)
+        self.assertIsNone(resolve_input_device(self.sd, "1"))  # output only
+        self.assertEqual(resolve_input_device(self.sd, "headset"), 2)
+        self.assertIsNone(resolve_input_device(self.sd, "webcam"))
+
+    def test_selected_device_and_missing_fallback(self):
+        src = SoundDeviceSource(device="headset")
+        src._sd = self.sd
+        src.start()
+        self.assertEqual(self.sd.streams[-1].kw["device"], 2)
+        self.assertEqual(src.device_name, "USB Headset")
+        src.stop()
+        del self.sd.devices[2]  # unplugged
+        src.start()
+        self.assertIsNone(self.sd.streams[-1].kw["device"])
+        self.assertEqual(src.device_name, "Built-in Mic")
+        self.assertEqual(self.sd.rescans, 1)
+        src.stop()
+
+    def test_dead_or_stalled_stream_raises(self):
+        src = SoundDeviceSource(stall_s=0.05)
+        src._sd = self.sd
+        src.start()
+        stream = self.sd.streams[-1]
+        stream.callback(b"\x00\x00" * 320, 320, None, None)
+        self.assertEqual(len(src.read(640)), 640)
+        self.assertEqual(src.read(640), b"")
+        time.sleep(0.08)
+        with self.assertRaises(RuntimeError):
+            src.read(640)
+        src.stop()
+        src.start()
+        self.sd.streams[-1].finished_callback()
+        with self.assertRaises(RuntimeError):
+            src.read(640)
+        src.stop()
+
+
+    def test_periodic_check_reopens_on_device_change(self):
+        src = SoundDeviceSource(check_s=0.01)
+        src._sd = self.sd
+        src.start()
+        self.sd.streams[-1].callback(b"\x00\x00" * 320, 320, None, None)
+        time.sleep(0.02)
+        self.assertEqual(len(src.read(640)), 640)  # unchanged: keeps going
+        src.device = "headset"  # config reload
+        time.sleep(0.02)
+        with self.assertRaises(RuntimeError):
+            src.read(640)
+        src.stop()
+        src.start()
+        self.assertEqual(self.sd.streams[-1].kw["device"], 2)
+        src.stop()
+
+    def test_rescan_is_gated_on_the_sounddevice_version(self):
+        src = SoundDeviceSource()
+        src._sd = self.sd
+        self.sd.__version__ = "2.0.0"
+        src.start()
+        src.stop()
+        src.start()
+        self.assertEqual(self.sd.rescans, 0)
+        src.stop()
+
+
+class TestDeviceStatus(unittest.TestCase):
+    def test_logs_loss_and_recovery_once(self):
+        out = []
+        set_logger(Logger(level=INFO, sink=lambda lvl, msg: out.append(msg)))
+        board = SimpleNamespace(updates=[], update=lambda **kw: board.updates.append(kw))
+        fn = cli._device_status(board)
+        fn(device_state="ok", device="Mic")
+        fn(device_state="lost", device_error="stream error")
+        fn(device_state="reconnecting", device_error="busy", device_retries=1)
+        fn(device_state="ok", device="Mic")
+        self.assertEqual(len(board.updates), 4)
+        self.assertEqual(len(out), 2)
+        self.assertIn("lost", out[0])
+        self.assertIn("reconnected: Mic", out[1])
+        set_logger(Logger())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -72,6 +72,143 @@ class TestFasterWhisperEngine(unittest.TestCase):
         out = eng.finalize(sid, timeout_s=0.01)  # 10ms timeout
         self.assertEqual(out, "")
 
+    def test_partials_stream_and_stop_on_finalize(self):
+        import time as _t
+
+        backend = FakeBackend()
+        seen = []
+        eng = FasterWhisperEngine(
+            sample_rate=16000,
+            language="ja",
+            model="small",
+            backend=backend,
+            partial_interval_ms=5,
+            on_partial=lambda sid, text: seen.append((sid, text)),
+        )
+        sid = eng.start_session()
+        eng.push_audio(sid, b"aaaa")
+        for _ in range(100):
+            if seen:
+                break
+            _t.sleep(0.005)
+        self.assertTrue(seen)
+        self.assertEqual(seen[0][0], sid)
+        self.assertIn("len=4", seen[0][1])
+        final = eng.finalize(sid, timeout_s=1)
+        self.assertIn("len=4", final)
+        # iterator drains published partials then ends after finalize
+        items = list(eng.partials(sid))
+        self.assertIn(seen[0][1], items)
+        n_calls = len(backend.calls)
+        _t.sleep(0.03)
+        self.assertEqual(len(backend.calls), n_calls)
+        eng.close_session(sid)
+
+    def test_partials_decode_a_trailing_window_and_finalize_waits(self):
+        import threading
+        import time as _t
+
+        started = threading.Event()
+        calls = []
+
+        class SlowBackend:
+            def transcribe(self, pcm_bytes, **kw):
+                calls.append(("begin", len(pcm_bytes)))
+                started.set()
+                _t.sleep(0.05)
+                calls.append(("end", len(pcm_bytes)))
+                return f"len={len(pcm_bytes)}"
+
+        eng = FasterWhisperEngine(
+            sample_rate=16000,
+            language="ja",
+            model="small",
+            backend=SlowBackend(),
+            partial_interval_ms=5,
+            partial_window_s=0.5,
+        )
+        sid = eng.start_session()
+        eng.push_audio(sid, b"\x00" * 32000)  # 1 s
+        self.assertTrue(started.wait(2.0))
+        final = eng.finalize(sid, timeout_s=2)
+        self.assertEqual(final, "len=32000")
+        # the partial saw only the newest 0.5 s and finished before the final began
+        self.assertEqual(calls[:2], [("begin", 16000), ("end", 16000)])
+        self.assertEqual(calls[2:], [("begin", 32000), ("end", 32000)])
+        eng.close_session(sid)
+
+    def test_partials_disabled_by_default(self):
+        backend = FakeBackend()
+        eng = FasterWhisperEngine(
+            sample_rate=16000, language="ja", model="small", backend=backend
+        )
+        sid = eng.start_session()
+        eng.push_audio(sid, b"aaaa")
+        self.assertEqual(list(eng.partials(sid)), [])
+        eng.finalize(sid)
+        self.assertEqual(len(backend.calls), 1)
+
+    def test_non_16k_mono_audio_is_converted(self):
+        backend = FakeBackend()
+        eng = FasterWhisperEngine(
+            sample_rate=48000,
+            channels=2,
+            language="ja",
+            model="small",
+            backend=backend,
+        )
+        sid = eng.start_session()
+        # 0.1 s of 48 kHz stereo silence -> 1600 mono samples at 16 kHz
+        eng.push_audio(sid, b"\x00" * (4800 * 2 * 2))
+        eng.finalize(sid, timeout_s=5)
+        self.assertEqual(backend.calls[0][:2], (1600 * 2, 16000))
+
+    def test_truncate_policy_caps_session(self):
+        backend = FakeBackend()
+        eng = FasterWhisperEngine(
+            sample_rate=16000,
+            language="en",
+            model="small",
+            backend=backend,
+            spill_bytes=8,
+            max_bytes=16,
+        )
+        sid = eng.start_session()
+        for _ in range(10):
+            eng.push_audio(sid, b"\x01\x00" * 4)
+        self.assertEqual(eng.finalize(sid, timeout_s=1).split(",")[0], "len=16")
+        eng.close_session(sid)
+
+    def test_window_policy_decodes_each_window(self):
+        backend = FakeBackend()
+        eng = FasterWhisperEngine(
+            sample_rate=16000,
+            language="en",
+            model="small",
+            backend=backend,
+            max_bytes=8,
+            cap_policy="window",
+        )
+        sid = eng.start_session()
+        for _ in range(5):
+            eng.push_audio(sid, b"abcd")
+        text = eng.finalize(sid, timeout_s=2)
+        eng.close_session(sid)
+        # two full windows of 8 bytes, then a 4 byte tail
+        self.assertEqual([c[0] for c in backend.calls], [8, 8, 4])
+        self.assertEqual(text.count("len="), 3)
+        self.assertTrue(text.startswith("len=8") and "len=4" in text)
+
+    def test_invalid_cap_policy(self):
+        with self.assertRaises(ValueError):
+            FasterWhisperEngine(
+                sample_rate=16000,
+                language="en",
+                model="small",
+                backend=FakeBackend(),
+                cap_policy="bogus",
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,134 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import presstalk.levels as levels
+from presstalk.capture import PCMCapture
+from presstalk.config import Config
+from presstalk.controller import Controller
+from presstalk.engine.dummy_engine import DummyAsrEngine
+from presstalk.levels import LEVEL_FLOOR_DB, LevelMeter, chunk_levels
+from presstalk.orchestrator import Orchestrator
+from presstalk.ring_buffer import RingBuffer
+
+
+def _pcm(*samples):
+    return b"".join(int(s).to_bytes(2, "little", signed=True) for s in samples)
+
+
+class _Source:
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def start(self):
+        pass
+
+    def read(self, nbytes):
+        return self._chunks.pop(0) if self._chunks else None
+
+    def stop(self):
+        pass
+
+
+class TestChunkLevels(unittest.TestCase):
+    def test_values(self):
+        lv = chunk_levels(_pcm(100, -300, 32767, -32768, 0) + b"\x01")
+        self.assertEqual(lv.samples, 5)
+        self.assertEqual(lv.peak, 32768)
+        self.assertEqual(lv.clipped, 2)
+        self.assertAlmostEqual(
+            lv.mean_square, (100**2 + 300**2 + 32767**2 + 32768**2) / 5
+        )
+        self.assertEqual(chunk_levels(b""), (0, 0.0, 0, 0))
+
+    def test_pure_python_fallback_agrees(self):
+        pcm = _pcm(*range(-32768, 32768, 97))
+        with mock.patch.object(levels, "np", None):
+            slow = chunk_levels(pcm)
+        fast = chunk_levels(pcm)
+        self.assertEqual(
+            (slow.samples, slow.peak, slow.clipped),
+            (fast.samples, fast.peak, fast.clipped),
+        )
+        self.assertAlmostEqual(slow.mean_square, fast.mean_square)
+
+
+class TestLevelMeter(unittest.TestCase):
+    def test_session_and_rolling_window(self):
+        m = LevelMeter(window=2)
+        m.update(_pcm(*[32767] * 10))
+        m.update(_pcm(*[100] * 10))
+        m.update(_pcm(*[100] * 10))
+        snap = m.snapshot()
+        # the clipped chunk has left the rolling window but not the session
+        self.assertFalse(snap["clipping"])
+        self.assertLess(snap["peak_db"], -40.0)
+        sess = m.session()
+        self.assertEqual(sess["chunks"], 3)
+        self.assertEqual(sess["clipped"], 10)
+        self.assertAlmostEqual(sess["peak_db"], 0.0, places=0)
+        m.reset()
+        self.assertEqual(m.session()["peak_db"], LEVEL_FLOOR_DB)
+        self.assertEqual(m.session()["chunks"], 0)
+
+
+class _Engine(DummyAsrEngine):
+    def __init__(self):
+        super().__init__()
+        self.finalized = 0
+
+    def finalize(self, session_id, timeout_s=10.0):
+        self.finalized += 1
+        return "text"
+
+
+class TestSilentSessionSkip(unittest.TestCase):
+    def _run(self, chunks, floor=-60.0):
+        eng = _Engine()
+        ring = RingBuffer(64)
+        ctl = Controller(eng, ring, prebuffer_ms=0, min_capture_ms=0)
+        cap = PCMCapture(
+            sample_rate=16000, channels=1, chunk_ms=10, source=_Source(chunks)
+        )
+        orch = Orchestrator(
+            controller=ctl,
+            ring=ring,
+            capture=cap,
+            paste_fn=lambda t: True,
+            silence_floor_db=floor,
+        )
+        orch.press()
+        for _ in range(200):
+            if not cap.is_running():
+                break
+            time.sleep(0.005)
+        return orch, eng, orch.release()
+
+    def test_silence_skips_decode(self):
+        orch, eng, text = self._run([_pcm(*[3] * 160)] * 3)
+        self.assertEqual(text, "")
+        self.assertEqual(eng.finalized, 0)
+        self.assertEqual(orch.decodes_skipped, 1)
+        self.assertTrue(orch.stats()["decode_skipped"])
+        self.assertFalse(orch.controller.is_recording())
+
+    def test_signal_is_decoded(self):
+        orch, eng, text = self._run([_pcm(*[3] * 160), _pcm(*[4000] * 160)])
+        self.assertEqual(text, "text")
+        self.assertEqual(eng.finalized, 1)
+        self.assertFalse(orch.stats()["decode_skipped"])
+
+    def test_disabled_floor_always_decodes(self):
+        orch, eng, _ = self._run([_pcm(*[0] * 160)], floor=None)
+        self.assertEqual(eng.finalized, 1)
+        self.assertEqual(orch.decodes_skipped, 0)
+
+    def test_config_default(self):
+        self.assertEqual(Config(config_path="/nonexistent").silence_floor_db, -60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
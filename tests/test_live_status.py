@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.client import HTTPConnection
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from presstalk.capture import PCMCapture
+from presstalk.controller import Controller
+from presstalk.engine.dummy_engine import DummyAsrEngine
+from presstalk.orchestrator import LEVEL_FLOOR_DB, Orchestrator, _level_dbfs
+from presstalk.ring_buffer import RingBuffer
+from presstalk.status import StatusBoard
+from presstalk.web_config import server as web_server
+
+
+class _Source:
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def start(self):
+        pass
+
+    def read(self, nbytes):
+        return self._chunks.pop(0) if self._chunks else None
+
+    def stop(self):
+        pass
+
+
+class TestLevel(unittest.TestCase):
+    def test_full_scale_and_silence(self):
+        full = (32767).to_bytes(2, "little", signed=True) * 100
+        self.assertAlmostEqual(_level_dbfs(full), 0.0, places=0)
+        self.assertEqual(_level_dbfs(b"\x00\x00" * 100), LEVEL_FLOOR_DB)
+        self.assertEqual(_level_dbfs(b""), LEVEL_FLOOR_DB)
+        half = (16384).to_bytes(2, "little", signed=True) * 100
+        self.assertAlmostEqual(_level_dbfs(half), -6.0, places=0)
+
+
+class TestOrchestratorStatus(unittest.TestCase):
+    def test_states_level_and_latency(self):
+        events = []
+        ring = RingBuffer(64)
+        ctl = Controller(
+            DummyAsrEngine(),
+            ring,
+            prebuffer_ms=0,
+            min_capture_ms=0,
+            bytes_per_second=100,
+        )
+        loud = (8000).to_bytes(2, "little", signed=True) * 8
+        cap = PCMCapture(
+            sample_rate=16000, channels=1, chunk_ms=10, source=_Source([loud, loud])
+        )
+        orch = Orchestrator(
+            controller=ctl,
+            ring=ring,
+            capture=cap,
+            paste_fn=lambda t: True,
+            status_fn=lambda **kw: events.append(kw),
+            level_interval_s=0.0,
+        )
+        orch.press()
+        for _ in range(100):
+            if not cap.is_running():
+                break
+            time.sleep(0.005)
+        orch.release()
+        states = [e["state"] for e in events if "state" in e]
+        self.assertEqual(states, ["recording", "finalizing", "idle"])
+        levels = [e["level_db"] for e in events if e.get("level_db") is not None]
+        self.assertTrue(levels)
+        self.assertLess(levels[0], 0.0)
+        last = events[-1]["last_utterance"]
+        self.assertEqual(last["seq"], 1)
+        for key in ("capture_stop_ms", "decode_ms", "paste_ms", "total_ms"):
+            self.assertGreaterEqual(last[key], 0.0)
+        self.assertGreaterEqual(
+            last["total_ms"], last["decode_ms"] + last["paste_ms"] - 0.2
+        )
+
+
+class TestEventStream(unittest.TestCase):
+    def test_sse_pushes_status_changes(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        os.remove(path)
+        static_dir = Path(web_server.__file__).resolve().parent / "static"
+
+        def _handler(*args, **kwargs):
+            return web_server._Handler(
+                *args, static_dir=static_dir, cfg_path=None, **kwargs
+            )
+
+        httpd = web_server.ThreadingHTTPServer(("127.0.0.1", 0), _handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        board = StatusBoard(path)
+        env = mock.patch.dict(os.environ, {"PT_STATUS_FILE": path})
+        env.start()
+        try:
+            conn = HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=2)
+            conn.request("GET", "/api/events")
+            r = conn.getresponse()
+            self.assertEqual(r.status, 200)
+            self.assertTrue(r.getheader("Content-Type").startswith("text/event-stream"))
+
+            def next_event():
+                line = r.fp.readline().decode("utf-8")
+                while not line.startswith("data: "):
+                    line = r.fp.readline().decode("utf-8")
+                r.fp.readline()  # blank separator
+                return json.loads(line[len("data: ") :])
+
+            self.assertFalse(next_event()["running"])
+            board.update(state="recording", level_db=-20.0)
+            ev = next_event()
+            self.assertTrue(ev["running"])
+            self.assertEqual(ev["state"], "recording")
+            conn.close()
+        finally:
+            env.stop()
+            board.close()
+            httpd.shutdown()
+            httpd.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,14 @@
+import json
 import os
 import sys
+import tempfile
+import threading
 import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from presstalk.logger import Logger, QUIET, INFO, DEBUG
+from presstalk.logger import AsyncSink, JsonlFileHandler
 
 
 class TestLogger(unittest.TestCase):
@@ -29,6 +33,76 @@ class TestLogger(unittest.TestCase):
         lg.debug("d")
         self.assertEqual(out, [])
 
+    def test_formatting_is_lazy(self):
+        out = []
+        calls = []
+        lg = Logger(level=INFO, sink=lambda lvl, msg: out.append(msg))
+
+        def expensive():
+            calls.append(1)
+            return "costly"
+
+        lg.debug(expensive)
+        lg.debug("x=%s", object())
+        self.assertEqual(calls, [])
+        lg.info(expensive)
+        lg.info("n=%d", 3, took=0.123456, ok=True)
+        self.assertEqual(out, ["costly", "n=3 took=0.12 ok=True"])
+
+
+class TestAsyncSink(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "logs", "pt.jsonl")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_writes_json_lines(self):
+        sink = AsyncSink(JsonlFileHandler(self.path))
+        lg = Logger(level=INFO, sink=sink)
+        lg.info("[PT] Final: %s", "こんにちは", chars=5)
+        sink.close()
+        (rec,) = self._read(self.path)
+        self.assertEqual(rec["msg"], "[PT] Final: こんにちは")
+        self.assertEqual(rec["chars"], 5)
+        self.assertEqual(rec["level"], "INFO")
+        self.assertEqual(rec["thread"], threading.current_thread().name)
+
+    def test_rotates_at_max_bytes(self):
+        sink = AsyncSink(JsonlFileHandler(self.path, max_bytes=200, backups=2))
+        lg = Logger(level=INFO, sink=sink)
+        for i in range(20):
+            lg.info("event %d", i, pad="x" * 40)
+        sink.close()
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertTrue(os.path.exists(self.path + ".2"))
+        self.assertFalse(os.path.exists(self.path + ".3"))
+        self.assertLessEqual(os.path.getsize(self.path), 200)
+        self.assertEqual(self._read(self.path)[-1]["msg"], "event 19")
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        gate = threading.Event()
+        seen = []
+
+        def slow(event):
+            gate.wait(2.0)
+            seen.append(event.message())
+
+        sink = AsyncSink(slow, maxsize=2)
+        lg = Logger(level=INFO, sink=sink)
+        for i in range(10):
+            lg.info("e%d", i)
+        self.assertGreater(sink.dropped, 0)
+        gate.set()
+        self.assertTrue(sink.flush())
+        sink.close()
+        self.assertEqual(len(seen) + sink.dropped, 10)
+
 
 if __name__ == "__main__":
     unittest.main()
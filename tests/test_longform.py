@@ -0,0 +1,116 @@
+import os
+import sys
+import threading
+import types
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np  # type: ignore
+
+from presstalk.engine.longform import merge_texts, plan_windows
+
+SR = 16000
+
+
+def _speech_with_pauses(seconds, pauses):
+    """Noise 'speech' with silent gaps at the given (start_s, end_s) spans."""
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-0.5, 0.5, int(seconds * SR)).astype(np.float32)
+    for a, b in pauses:
+        x[int(a * SR) : int(b * SR)] = 0.0
+    return x
+
+
+class TestPlanWindows(unittest.TestCase):
+    def test_short_audio_single_window(self):
+        self.assertEqual(plan_windows(np.zeros(SR * 10), SR), [(0, SR * 10)])
+
+    def test_cuts_land_in_pauses_with_overlap(self):
+        audio = _speech_with_pauses(70, [(24.0, 24.6), (49.0, 49.6)])
+        wins = plan_windows(audio, SR, window_s=28.0, overlap_s=1.0)
+        self.assertEqual(len(wins), 3)
+        self.assertEqual(wins[0][0], 0)
+        self.assertEqual(wins[-1][1], len(audio))
+        for (s, e), (ns, _) in zip(wins, wins[1:]):
+            self.assertLessEqual(e - s, 28 * SR)
+            self.assertEqual(e - ns, SR)  # 1 s overlap
+        self.assertTrue(24.0 * SR <= wins[0][1] <= 24.6 * SR)
+        self.assertTrue(49.0 * SR <= wins[1][1] <= 49.6 * SR)
+
+    def test_no_pause_still_bounded(self):
+        audio = _speech_with_pauses(95, [])
+        wins = plan_windows(audio, SR, window_s=28.0)
+        self.assertTrue(all(e - s <= 28 * SR for s, e in wins))
+        self.assertEqual(wins[-1][1], len(audio))
+
+
+class TestMergeTexts(unittest.TestCase):
+    def test_word_overlap_removed(self):
+        out = merge_texts(
+            ["we went to the store.", "The store was closed today"], language="en"
+        )
+        self.assertEqual(out, "we went to the store. was closed today")
+
+    def test_no_overlap_joined(self):
+        self.assertEqual(
+            merge_texts(["hello", "", "world"], language="en"), "hello world"
+        )
+
+    def test_char_overlap_for_japanese(self):
+        out = merge_texts(
+            ["今日は天気がいいです。", "いいです。明日は雨"], language="ja"
+        )
+        self.assertEqual(out, "今日は天気がいいです。明日は雨")
+
+
+class _FakeModel:
+    def __init__(self, name, **kwargs):
+        self.kwargs = kwargs
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def transcribe(self, audio, language, **opts):
+        def _gen():
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            threading.Event().wait(0.05)
+            with self.lock:
+                self.active -= 1
+            yield types.SimpleNamespace(text=f" w{len(audio) // SR}")
+
+        return _gen(), None
+
+
+class TestLongFormBackend(unittest.TestCase):
+    def _backend(self, **kw):
+        fake = types.ModuleType("faster_whisper")
+        fake.WhisperModel = _FakeModel
+        with patch.dict(sys.modules, {"faster_whisper": fake}):
+            from presstalk.engine.fwhisper_backend import FasterWhisperBackend
+
+            return FasterWhisperBackend(model="tiny", **kw)
+
+    def test_parallel_windows(self):
+        be = self._backend(num_workers=3)
+        self.assertEqual(be._model.kwargs.get("num_workers"), 3)
+        audio = _speech_with_pauses(75, [(25.0, 25.5), (51.0, 51.5)])
+        pcm = (audio * 20000).astype(np.int16).tobytes()
+        text = be.transcribe(pcm, sample_rate=SR, language="en", model="tiny")
+        self.assertEqual(text.split(), ["w25", "w27", "w24"])
+        self.assertGreater(be._model.peak, 1)
+
+    def test_single_worker_uses_one_pass(self):
+        be = self._backend()
+        self.assertNotIn("num_workers", be._model.kwargs)
+        pcm = np.zeros(SR * 40, dtype=np.int16).tobytes()
+        self.assertEqual(
+            be.transcribe(pcm, sample_rate=SR, language="en", model="tiny"), "w40"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,333 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.client import HTTPConnection
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from presstalk.engine.fwhisper_engine import FasterWhisperEngine
+from presstalk.engine.loader import BackgroundBackend
+from presstalk.status import StatusBoard, read_status
+
+
+class _Backend:
+    def __init__(self):
+        self.seen = []
+
+    def transcribe(self, pcm, *, sample_rate, language, model):
+        self.seen.append(len(pcm))
+        return f"{len(pcm)} bytes"
+
+
+def _gated(release: threading.Event, on_state=None, progress_s=5.0):
+    def factory():
+        release.wait(2.0)
+        return _Backend()
+
+    return BackgroundBackend(factory, on_state=on_state, progress_s=progress_s)
+
+
+class TestBackgroundBackend(unittest.TestCase):
+    def test_states_and_progress(self):
+        gate = threading.Event()
+        events = []
+        be = _gated(gate, lambda s, info: events.append(s), progress_s=0.05).start()
+        self.assertFalse(be.is_ready())
+        self.assertFalse(be.wait_ready(0.01))
+        time.sleep(0.15)
+        gate.set()
+        self.assertTrue(be.wait_ready(2.0))
+        self.assertEqual(events[0], "loading")
+        self.assertGreater(events.count("loading"), 1)
+        self.assertEqual(events[-1], "ready")
+        self.assertGreaterEqual(be.load_s, 0.1)
+
+    def test_failure_is_reported_and_raised(self):
+        events = []
+
+        def boom():
+            raise RuntimeError("no such model")
+
+        be = BackgroundBackend(boom, on_state=lambda s, i: events.append((s, i)))
+        be.start()
+        self.assertFalse(be.wait_ready(2.0))
+        self.assertEqual(be.state, "failed")
+        self.assertEqual(events[-1][1]["error"], "no such model")
+        with self.assertRaises(RuntimeError):
+            be.transcribe(b"\x00\x00", sample_rate=16000, language="en", model="t")
+
+    def test_failed_load_is_retried_on_touch_after_backoff(self):
+        attempts = []
+        events = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("disk busy")
+            return _Backend()
+
+        be = BackgroundBackend(
+            flaky,
+            on_state=lambda s, i: events.append((s, i)),
+            retry_s=0.05,
+        ).start()
+        self.assertFalse(be.wait_ready(2.0))
+        self.assertEqual(events[-1][1]["retry_s"], 0.05)
+        be.touch()  # still backing off: no new attempt
+        self.assertEqual(len(attempts), 1)
+        time.sleep(0.06)
+        be.touch()
+        self.assertFalse(be.wait_ready(2.0))
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(events[-1][1]["retry_s"], 0.1)  # doubled
+        time.sleep(0.11)
+        kw = dict(sample_rate=16000, language="en", model="t")
+        self.assertEqual(be.transcribe(b"\x00\x00", **kw), "2 bytes")
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(be.state, "ready")
+        self.assertEqual(be._failures, 0)
+
+
+class TestIdleUnload(unittest.TestCase):
+    def test_unloads_when_idle_and_reloads_on_touch(self):
+        built = []
+        events = []
+
+        class Unloadable(_Backend):
+            unloaded = False
+
+            def unload(self):
+                self.unloaded = True
+
+        def factory():
+            built.append(Unloadable())
+            return built[-1]
+
+        be = BackgroundBackend(factory, on_state=lambda s, i: events.append((s, i)))
+        be.start()
+        be._idle_s = 0.05  # no idle thread; drive _maybe_unload directly
+        self.assertTrue(be.wait_ready(2.0))
+        self.assertFalse(be._maybe_unload())  # not idle long enough yet
+        time.sleep(0.06)
+        self.assertTrue(be._maybe_unload())
+        self.assertEqual(be.state, "unloaded")
+        self.assertTrue(built[0].unloaded)
+        self.assertEqual(events[-1][0], "unloaded")
+        be.touch()
+        self.assertTrue(be.wait_ready(2.0))
+        self.assertEqual(len(built), 2)
+        self.assertTrue(events[-1][1]["reload"])
+
+    def test_busy_model_is_not_unloaded(self):
+        be = BackgroundBackend(_Backend).start()
+        be._idle_s = 0.01
+        be.wait_ready(2.0)
+        be._busy = 1
+        time.sleep(0.03)
+        self.assertFalse(be._maybe_unload())
+
+    def test_transcribe_after_unload_reloads(self):
+        be = BackgroundBackend(_Backend)
+        be.start().wait_ready(2.0)
+        self.assertTrue(be._maybe_unload())
+        kw = dict(sample_rate=16000, language="en", model="t")
+        self.assertEqual(be.transcribe(b"\x00\x00", **kw), "2 bytes")
+
+    def test_engine_touches_backend_on_session_start(self):
+        be = BackgroundBackend(_Backend)
+        be.start().wait_ready(2.0)
+        be._maybe_unload()
+        eng = FasterWhisperEngine(
+            sample_rate=16000, language="en", model="tiny", backend=be
+        )
+        eng.start_session()
+        self.assertIn(be.state, ("loading", "ready"))
+
+    def test_whisper_backend_unload_and_reload(self):
+        import types
+
+        loads = []
+
+        class Model:
+            def __init__(self, name, **kw):
+                loads.append(name)
+
+            def transcribe(self, audio, language, **opts):
+                return [types.SimpleNamespace(text=" hi")], None
+
+        fake = types.ModuleType("faster_whisper")
+        fake.WhisperModel = Model
+        with mock.patch.dict(sys.modules, {"faster_whisper": fake}):
+            from presstalk.engine.fwhisper_backend import FasterWhisperBackend
+
+            be = FasterWhisperBackend(model="tiny")
+            be.unload()
+            self.assertIsNone(be._model)
+            kw = dict(sample_rate=16000, language="en", model="tiny")
+            self.assertEqual(be.transcribe(b"\x00\x00" * 10, **kw), "hi")
+        self.assertEqual(loads, ["tiny", "tiny"])
+
+    def test_rss_and_config(self):
+        from presstalk.config import Config
+        from presstalk.status import rss_bytes
+
+        rss = rss_bytes()
+        if rss is not None:
+            self.assertGreater(rss, 0)
+        self.assertEqual(Config().idle_unload_min, 0)
+        with mock.patch.dict(os.environ, {"PT_IDLE_UNLOAD_MIN": "15"}):
+            self.assertEqual(Config().idle_unload_min, 15)
+
+
+class TestEngineReadinessGate(unittest.TestCase):
+    def test_audio_buffered_until_model_ready(self):
+        gate = threading.Event()
+        be = _gated(gate).start()
+        eng = FasterWhisperEngine(
+            sample_rate=16000, language="en", model="tiny", backend=be
+        )
+        sid = eng.start_session()
+        eng.push_audio(sid, b"\x01\x00" * 100)
+        threading.Timer(0.1, gate.set).start()
+        # the load wait comes out of the finalize budget
+        self.assertEqual(eng.finalize(sid, timeout_s=1.0), "200 bytes")
+
+    def test_finalize_gives_up_on_a_stuck_load(self):
+        gate = threading.Event()
+        be = _gated(gate).start()
+        eng = FasterWhisperEngine(
+            sample_rate=16000, language="en", model="tiny", backend=be
+        )
+        sid = eng.start_session()
+        eng.push_audio(sid, b"\x01\x00" * 100)
+        t0 = time.monotonic()
+        self.assertEqual(eng.finalize(sid, timeout_s=0.1), "")
+        self.assertLess(time.monotonic() - t0, 1.0)
+        gate.set()
+
+    def test_partials_skipped_while_loading(self):
+        gate = threading.Event()
+        be = _gated(gate).start()
+        eng = FasterWhisperEngine(
+            sample_rate=16000,
+            language="en",
+            model="tiny",
+            backend=be,
+            partial_interval_ms=10,
+        )
+        sid = eng.start_session()
+        eng.push_audio(sid, b"\x01\x00" * 50)
+        time.sleep(0.1)
+        gate.set()
+        be.wait_ready(2.0)
+        self.assertEqual(eng.finalize(sid), "100 bytes")
+        # no decode was queued behind the load
+        self.assertLessEqual(len(be._backend.seen), 2)
+
+
+class TestStatusBoard(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        os.remove(self.path)
+
+    def test_round_trip_and_close(self):
+        board = StatusBoard(self.path)
+        self.assertEqual(read_status(self.path), {})
+        board.update(model="tiny", model_state="loading")
+        self.assertTrue(board.flush())
+        st = read_status(self.path)
+        self.assertEqual(st["model_state"], "loading")
+        self.assertEqual(st["pid"], os.getpid())
+        board.close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_update_does_not_wait_for_the_write(self):
+        board = StatusBoard(self.path)
+        gate = threading.Event()
+        writes = []
+        real_write = board._write
+
+        def slow_write(state):
+            gate.wait(2.0)
+            writes.append(state)
+            real_write(state)
+
+        board._write = slow_write
+        t0 = time.monotonic()
+        for i in range(50):
+            board.update(level_db=-float(i))
+        self.assertLess(time.monotonic() - t0, 0.5)
+        gate.set()
+        self.assertTrue(board.flush())
+        # bursts are coalesced; the file ends with the latest value
+        self.assertLess(len(writes), 50)
+        self.assertEqual(read_status(self.path)["level_db"], -49.0)
+        board.close()
+
+    @unittest.skipIf(os.name == "nt", "pid liveness is not checked on Windows")
+    def test_stale_file_ignored(self):
+        with open(self.path, "w") as f:
+            json.dump({"pid": 2**22 + 12345, "model_state": "ready"}, f)
+        try:
+            self.assertEqual(read_status(self.path), {})
+        finally:
+            os.remove(self.path)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permissions")
+    def test_default_path_is_in_a_private_dir(self):
+        from presstalk import status
+
+        with tempfile.TemporaryDirectory() as tmp:
+            home = os.path.join(tmp, "home")
+            env = {"PT_STATUS_FILE": "", "XDG_RUNTIME_DIR": "", "HOME": home}
+            with mock.patch.dict(os.environ, env), mock.patch.object(
+                status.tempfile, "gettempdir", return_value=tmp
+            ):
+                path = status.status_path()
+                base = os.path.dirname(path)
+                self.assertEqual(os.path.dirname(base), tmp)
+                self.assertEqual(os.stat(base).st_mode & 0o777, 0o700)
+                # a name taken by something else is not used
+                os.rmdir(base)
+                os.symlink(tmp, base)
+                path = status.status_path()
+                self.assertTrue(path.startswith(home + os.sep), path)
+
+    def test_web_status_endpoint(self):
+        from presstalk.web_config import server as web_server
+
+        static_dir = Path(web_server.__file__).resolve().parent / "static"
+
+        def _handler(*args, **kwargs):
+            return web_server._Handler(
+                *args, static_dir=static_dir, cfg_path=None, **kwargs
+            )
+
+        httpd = web_server.ThreadingHTTPServer(("127.0.0.1", 0), _handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        board = StatusBoard(self.path)
+        try:
+            with mock.patch.dict(os.environ, {"PT_STATUS_FILE": self.path}):
+                conn = HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=2)
+                conn.request("GET", "/api/status")
+                self.assertFalse(json.loads(conn.getresponse().read())["running"])
+                board.update(model="small", model_state="ready", model_elapsed_s=3.2)
+                self.assertTrue(board.flush())
+                conn.request("GET", "/api/status")
+                data = json.loads(conn.getresponse().read())
+            self.assertTrue(data["running"])
+            self.assertEqual(data["model_state"], "ready")
+        finally:
+            board.close()
+            httpd.shutdown()
+            httpd.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from presstalk import models
+from presstalk.config import Config
+
+
+def _fake_download(name, output_dir):
+    """Write a tiny CTranslate2-shaped model directory (test fixture)."""
+    for fname, data in (
+        ("model.bin", b"\x00" * 256),
+        ("config.json", b"{}"),
+        ("tokenizer.json", b"{}"),
+        ("vocabulary.txt", b"a\nb\n"),
+    ):
+        with open(os.path.join(output_dir, fname), "wb") as f:
+            f.write(data)
+
+
+class _StoreCase(unittest.TestCase):
+    def setUp(self):
+        self.store = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.store, True)
+
+
+class TestModelStore(_StoreCase):
+    def test_prefetch_writes_manifest_and_verifies(self):
+        path = models.prefetch_model("tiny", self.store, download=_fake_download)
+        self.assertEqual(path, os.path.join(self.store, "tiny"))
+        self.assertEqual(models.verify_model(path), [])
+        self.assertFalse(os.path.exists(path + models.PARTIAL_SUFFIX))
+        # already intact: no second download
+        boom = mock.Mock(side_effect=AssertionError("downloaded twice"))
+        models.prefetch_model("tiny", self.store, download=boom)
+
+    def test_failed_download_leaves_no_entry(self):
+        def partial(name, out):
+            with open(os.path.join(out, "config.json"), "w") as f:
+                f.write("{}")
+
+        with self.assertRaises(RuntimeError):
+            models.prefetch_model("base", self.store, download=partial)
+        self.assertEqual(os.listdir(self.store), [])
+
+    def test_verify_detects_corruption(self):
+        path = models.prefetch_model("tiny", self.store, download=_fake_download)
+        with open(os.path.join(path, "model.bin"), "r+b") as f:
+            f.write(b"\x01")
+        self.assertEqual(models.verify_model(path, full=False), [])
+        self.assertEqual(models.verify_model(path), ["checksum mismatch: model.bin"])
+        os.remove(os.path.join(path, "vocabulary.txt"))
+        self.assertIn("missing vocabulary.txt", models.verify_model(path, full=False))
+
+    def test_list_and_prune(self):
+        models.prefetch_model("tiny", self.store, download=_fake_download)
+        models.prefetch_model("base", self.store, download=_fake_download)
+        os.makedirs(os.path.join(self.store, "small" + models.PARTIAL_SUFFIX))
+        rows = {r["name"]: r for r in models.list_models(self.store, ["medium"])}
+        self.assertEqual(rows["tiny"]["status"], "ok")
+        self.assertGreater(rows["tiny"]["size"], 256)
+        self.assertEqual(rows["medium"]["status"], "missing")
+        self.assertNotIn("small.partial", rows)
+        removed = models.prune_models(self.store, keep=["tiny"])
+        self.assertEqual(sorted(os.listdir(self.store)), ["tiny"])
+        self.assertEqual(len(removed), 2)
+
+    def test_resolve_offline(self):
+        self.assertEqual(models.resolve_model("tiny", self.store), "tiny")
+        with self.assertRaises(RuntimeError):
+            models.resolve_model("tiny", self.store, offline=True)
+        path = models.prefetch_model("tiny", self.store, download=_fake_download)
+        self.assertEqual(models.resolve_model("tiny", self.store, offline=True), path)
+
+    def test_model_dir_needs_a_path_form(self):
+        local = os.path.join(self.store, "local")
+        models.prefetch_model("local", self.store, download=_fake_download)
+        other = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other, True)
+        cwd = os.getcwd()
+        os.chdir(self.store)
+        try:
+            # a bare name is never looked up in the working directory
+            self.assertEqual(models.resolve_model("local", other), "local")
+            self.assertEqual(models.resolve_model("./local"), local)
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(models.resolve_model(local, offline=True), local)
+        with self.assertRaises(RuntimeError):
+            models.resolve_model(local + "-missing")
+        self.assertFalse(models.is_model_dir_spec("Systran/faster-whisper-small"))
+
+    def test_offline_unverified_dir_warns(self):
+        from presstalk.logger import INFO, Logger, set_logger
+
+        bare = os.path.join(self.store, "bare")
+        os.makedirs(bare)
+        out = []
+        set_logger(Logger(level=INFO, sink=lambda lvl, msg: out.append(msg)))
+        try:
+            self.assertEqual(models.resolve_model(bare, offline=True), bare)
+        finally:
+            set_logger(Logger())
+        self.assertTrue(any("not verified" in m for m in out))
+
+    def test_config_keys(self):
+        self.assertEqual(Config().model_dir, "")
+        self.assertFalse(Config().offline)
+        env = {"PT_MODEL_DIR": self.store, "PT_OFFLINE": "1"}
+        with mock.patch.dict(os.environ, env):
+            cfg = Config()
+        self.assertEqual(cfg.model_dir, self.store)
+        self.assertTrue(cfg.offline)
+
+
+class TestBackendOffline(_StoreCase):
+    def _fake_fw(self, calls):
+        class Model:
+            def __init__(self, source, **kwargs):
+                calls.append((source, kwargs))
+
+        fake = types.ModuleType("faster_whisper")
+        fake.WhisperModel = Model
+        return mock.patch.dict(sys.modules, {"faster_whisper": fake})
+
+    def test_loads_from_store_offline(self):
+        path = models.prefetch_model("tiny", self.store, download=_fake_download)
+        calls = []
+        with self._fake_fw(calls):
+            from presstalk.engine.fwhisper_backend import FasterWhisperBackend
+
+            FasterWhisperBackend(model="tiny", model_dir=self.store, offline=True)
+        self.assertEqual(calls[0][0], path)
+        self.assertTrue(calls[0][1]["local_files_only"])
+
+    def test_offline_without_model_fails_fast(self):
+        calls = []
+        with self._fake_fw(calls):
+            from presstalk.engine.fwhisper_backend import FasterWhisperBackend
+
+            with self.assertRaises(RuntimeError):
+                FasterWhisperBackend(model="small", model_dir=self.store, offline=True)
+        self.assertEqual(calls, [])
+
+
+class TestModelsCommand(_StoreCase):
+    def _run(self, *argv):
+        from presstalk import cli
+
+        args = cli.build_parser().parse_args(["models", *argv])
+        out = io.StringIO()
+        with mock.patch.dict(os.environ, {"PT_MODEL_DIR": self.store}):
+            with mock.patch.object(cli, "_find_repo_config", return_value=None):
+                with redirect_stdout(out):
+                    rc = cli._run_models(args)
+        return rc, out.getvalue()
+
+    def test_list_verify_prune(self):
+        models.prefetch_model("tiny", self.store, download=_fake_download)
+        rc, out = self._run()
+        self.assertEqual(rc, 0)
+        self.assertIn("tiny", out)
+        self.assertIn("missing", out)
+        self.assertEqual(self._run("verify", "tiny")[0], 0)
+        self.assertEqual(self._run("verify", "base")[0], 1)
+        rc, out = self._run("prune", "tiny", "--dry-run")
+        self.assertIn("Would remove", out)
+        self.assertTrue(os.path.isdir(os.path.join(self.store, "tiny")))
+        # listing is the default; deleting needs --yes
+        rc, out = self._run("prune", "tiny")
+        self.assertIn("--yes", out)
+        self.assertTrue(os.path.isdir(os.path.join(self.store, "tiny")))
+        self._run("prune", "tiny", "--yes")
+        self.assertFalse(os.path.isdir(os.path.join(self.store, "tiny")))
+
+    def test_prune_without_names_needs_all(self):
+        models.prefetch_model("base", self.store, download=_fake_download)
+        self.assertEqual(self._run("prune", "--yes")[0], 2)
+        self.assertTrue(os.path.isdir(os.path.join(self.store, "base")))
+        self.assertEqual(self._run("prune", "--all", "--yes")[0], 0)
+        self.assertFalse(os.path.isdir(os.path.join(self.store, "base")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -80,5 +80,74 @@ class TestPasteCommon(unittest.TestCase):
         )
 
 
+class TestCompiledPasteGuard(unittest.TestCase):
+    def test_exact_prefix_glob_and_substring_rules(self):
+        g = PasteGuard(blocklist=["=kitty", "^com.apple.", "*term?", "tilix"])
+        self.assertTrue(g.is_blocked({"name": "Kitty"}))
+        self.assertFalse(g.is_blocked({"name": "kitty-helper"}))
+        self.assertTrue(g.is_blocked({"name": "x", "bundle_id": "com.apple.Notes"}))
+        self.assertFalse(g.is_blocked({"name": "my.com.apple.tool"}))
+        self.assertTrue(g.is_blocked({"name": "xterm2"}))
+        self.assertFalse(g.is_blocked({"name": "xterm22"}))
+        self.assertTrue(g.is_blocked({"name": "com.gexperts.Tilix"}))
+
+    def test_field_qualified_rules(self):
+        g = PasteGuard(blocklist="bundle_id:com.apple.Terminal, name:=iTerm2")
+        self.assertTrue(
+            g.is_blocked({"name": "Foo", "bundle_id": "com.apple.Terminal"})
+        )
+        self.assertFalse(g.is_blocked({"name": "com.apple.Terminal"}))
+        self.assertTrue(g.is_blocked({"name": "iTerm2"}))
+        self.assertFalse(g.is_blocked({"name": "x", "bundle_id": "iTerm2"}))
+
+    def test_disabled_or_empty_never_blocks(self):
+        self.assertFalse(
+            PasteGuard(enabled=False, blocklist="x").is_blocked({"name": "x"})
+        )
+        self.assertFalse(PasteGuard(blocklist=None).is_blocked({"name": "x"}))
+        self.assertFalse(PasteGuard(blocklist="x").is_blocked({}))
+
+    def test_verdict_cached_per_app(self):
+        g = PasteGuard(blocklist="terminal", cache_size=2)
+        calls = {"n": 0}
+        real = g._match
+
+        def counting(key):
+            calls["n"] += 1
+            return real(key)
+
+        g._match = counting  # type: ignore[assignment]
+        fg = {"name": "Terminal"}
+        self.assertTrue(g.is_blocked(fg))
+        self.assertTrue(g.is_blocked(dict(fg)))
+        self.assertEqual(calls["n"], 1)
+        g.is_blocked({"name": "a"})
+        g.is_blocked({"name": "b"})
+        self.assertEqual(len(g._cache), 2)
+
+    def test_from_config(self):
+        from types import SimpleNamespace
+
+        cfg = SimpleNamespace(paste_guard=True, paste_blocklist=["Terminal"])
+        self.assertTrue(PasteGuard.from_config(cfg).is_blocked({"name": "Terminal"}))
+        cfg.paste_guard = False
+        self.assertFalse(PasteGuard.from_config(cfg).enabled)
+
+    def test_empty_rule_bodies_are_skipped(self):
+        from presstalk.logger import INFO, Logger, set_logger
+
+        logged = []
+        set_logger(Logger(level=INFO, sink=lambda lvl, msg: logged.append(msg)))
+        try:
+            g = PasteGuard(blocklist=["^", "=", "name:", "=Terminal"])
+        finally:
+            set_logger(Logger())
+        self.assertFalse(g.is_blocked({"name": "TextEdit"}))
+        self.assertFalse(g.is_blocked({"name": ""}))
+        self.assertTrue(g.is_blocked({"name": "Terminal"}))
+        self.assertEqual(len(logged), 3)
+        self.assertIn("'^'", logged[0])
+
+
 if __name__ == "__main__":
     unittest.main()
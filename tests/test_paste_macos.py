@@ -3,7 +3,7 @@ import sys
 import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-from presstalk.paste_macos import insert_text
+from presstalk.paste_macos import insert_text, _get_frontmost_app
 
 
 class TestPasteMac(unittest.TestCase):
@@ -49,6 +49,56 @@ class TestPasteMac(unittest.TestCase):
         self.assertTrue(ok)
         self.assertEqual(calls["run"], 1)
 
+    def test_frontmost_single_osascript_call(self):
+        calls = []
+
+        def runner(cmd):
+            calls.append(cmd)
+            return (0, "TextEdit\ncom.apple.TextEdit\n")
+
+        fg = _get_frontmost_app(runner=runner)
+        self.assertEqual(fg, {"name": "TextEdit", "bundle_id": "com.apple.TextEdit"})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][0], "osascript")
+
+    def test_frontmost_missing_bundle_id_and_failure(self):
+        self.assertEqual(
+            _get_frontmost_app(runner=lambda cmd: (0, "Finder\n")), {"name": "Finder"}
+        )
+        self.assertEqual(_get_frontmost_app(runner=lambda cmd: (1, "")), {})
+
+    def test_cmd_v_uses_layout_keycode(self):
+        import presstalk.paste_macos as pm
+
+        posted = []
+
+        class FakeQuartz:
+            kCGEventFlagMaskCommand = 1 << 20
+            kCGHIDEventTap = 0
+
+            def CGEventCreateKeyboardEvent(self, src, code, down):
+                return {"code": code, "down": down}
+
+            def CGEventSetFlags(self, ev, flags):
+                ev["flags"] = flags
+
+            def CGEventPost(self, tap, ev):
+                posted.append(ev)
+
+        saved = pm._quartz_mod
+        pm._quartz_mod = FakeQuartz()
+        try:
+            # Dvorak: "v" sits on the ANSI "." key
+            self.assertTrue(pm._send_cmd_v_quartz(keycode_fn=lambda: 47))
+            self.assertEqual([e["code"] for e in posted], [47, 47])
+            self.assertEqual(posted[0]["flags"], FakeQuartz.kCGEventFlagMaskCommand)
+            # unmappable layout: nothing posted, caller falls back to keystroke "v"
+            posted.clear()
+            self.assertFalse(pm._send_cmd_v_quartz(keycode_fn=lambda: None))
+            self.assertEqual(posted, [])
+        finally:
+            pm._quartz_mod = saved
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,7 @@ import sys
 import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import presstalk.paste_windows as pw  # type: ignore
 from presstalk.paste_windows import insert_text  # type: ignore
 
 
@@ -70,6 +71,39 @@ class TestPasteWindows(unittest.TestCase):
         self.assertEqual(calls["run"], 1)
         self.assertEqual(calls["clip"], 1)
 
+    def test_frontmost_resolves_the_name_on_every_call(self):
+        # a reused PID must never hand a new process an old name
+        names = iter(["notepad.exe", "KeePass.exe"])
+        calls = {"resolve": 0}
+
+        def resolver(pid: int) -> str:
+            calls["resolve"] += 1
+            return next(names)
+
+        def get():
+            return pw._get_frontmost_app(pid_getter=lambda: 4242, name_resolver=resolver)
+
+        self.assertEqual(get(), {"name": "notepad.exe"})
+        self.assertEqual(get(), {"name": "KeePass.exe"})
+        self.assertEqual(calls["resolve"], 2)
+
+    def test_frontmost_failed_lookup_is_empty(self):
+        calls = {"resolve": 0}
+
+        def resolver(pid: int) -> str:
+            calls["resolve"] += 1
+            return ""
+
+        self.assertEqual(
+            pw._get_frontmost_app(pid_getter=lambda: 7, name_resolver=resolver), {}
+        )
+        self.assertEqual(calls["resolve"], 1)
+        # no foreground window -> empty without resolving
+        self.assertEqual(
+            pw._get_frontmost_app(pid_getter=lambda: 0, name_resolver=resolver), {}
+        )
+        self.assertEqual(calls["resolve"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from presstalk.constants import DECODE_PROFILE_CHOICES
+from presstalk.engine.profiles import DECODE_PROFILES, decode_options
+
+
+class _FakeModel:
+    def __init__(self, name, **kwargs):
+        self.calls = []
+
+    def transcribe(self, audio, language, **opts):
+        self.calls.append(opts)
+        return [types.SimpleNamespace(text=" hi")], None
+
+
+def _fake_fw():
+    fake = types.ModuleType("faster_whisper")
+    fake.WhisperModel = _FakeModel
+    return patch.dict(sys.modules, {"faster_whisper": fake})
+
+
+class TestDecodeProfiles(unittest.TestCase):
+    def test_profiles_match_choices(self):
+        self.assertEqual(tuple(DECODE_PROFILES), DECODE_PROFILE_CHOICES)
+
+    def test_fastest_avoids_fallback_redecodes(self):
+        opts = decode_options("fastest")
+        self.assertEqual(opts["temperature"], 0.0)
+        self.assertFalse(opts["condition_on_previous_text"])
+        self.assertTrue(opts["without_timestamps"])
+
+    def test_unknown_profile_and_beam_override(self):
+        self.assertEqual(decode_options("nope"), decode_options("balanced"))
+        self.assertEqual(decode_options("accurate", beam_size=2)["beam_size"], 2)
+        self.assertEqual(DECODE_PROFILES["accurate"]["beam_size"], 5)
+
+    def test_backend_forwards_profile_options(self):
+        with _fake_fw():
+            from presstalk.engine.fwhisper_backend import FasterWhisperBackend
+
+            be = FasterWhisperBackend(model="tiny", profile="accurate")
+        be.transcribe(b"\x00\x00" * 10, sample_rate=16000, language="en", model="tiny")
+        self.assertEqual(be._model.calls[-1], DECODE_PROFILES["accurate"])
+        be.set_profile("fastest")
+        be.transcribe(b"\x00\x00" * 10, sample_rate=16000, language="en", model="tiny")
+        self.assertEqual(be._model.calls[-1], DECODE_PROFILES["fastest"])
+
+    def test_bench_records_rtf_per_profile(self):
+        from presstalk.bench import bench_decode
+
+        with _fake_fw():
+            rows = bench_decode(seconds=1.0, model="tiny")
+        self.assertEqual([r["profile"] for r in rows], list(DECODE_PROFILE_CHOICES))
+        for r in rows:
+            self.assertEqual(r["audio_s"], 1.0)
+            self.assertGreaterEqual(r["rtf"], 0.0)
+
+    def test_bench_skips_without_backend(self):
+        from presstalk.bench import bench_decode
+
+        with patch.dict(sys.modules, {"faster_whisper": None}):
+            rows = bench_decode(seconds=1.0)
+        self.assertIn("skipped", rows[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np  # type: ignore
+
+from presstalk.resample import PCMResampler, resample_pcm
+
+
+def _tone(freq, rate, seconds, channels=1, amp=10000.0):
+    t = np.arange(int(rate * seconds)) / rate
+    x = (amp * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+    return np.repeat(x, channels).tobytes()
+
+
+def _samples(b):
+    return np.frombuffer(b, dtype=np.int16).astype(np.float64)
+
+
+class TestResample(unittest.TestCase):
+    def test_48k_stereo_to_16k_mono_preserves_tone(self):
+        out = _samples(resample_pcm(_tone(1000, 48000, 1.0, 2), in_rate=48000, in_channels=2))
+        self.assertEqual(len(out), 16000)
+        body = out[1000:]
+        spec = np.abs(np.fft.rfft(body * np.hanning(len(body))))
+        peak_hz = np.argmax(spec) * 16000 / len(body)
+        self.assertAlmostEqual(peak_hz, 1000, delta=5)
+        self.assertAlmostEqual(body.std() * np.sqrt(2), 10000, delta=100)
+
+    def test_chunked_matches_one_shot(self):
+        pcm = _tone(700, 44100, 0.5)
+        one = resample_pcm(pcm, in_rate=44100, in_channels=1)
+        rs = PCMResampler(in_rate=44100, in_channels=1)
+        # odd chunk size also exercises partial-frame carry-over
+        step = 883
+        chunked = b"".join(rs.process(pcm[i : i + step]) for i in range(0, len(pcm), step))
+        self.assertEqual(chunked, one)
+        self.assertAlmostEqual(len(one) / 2, 8000, delta=1)
+
+    def test_anti_aliasing_rejects_above_nyquist(self):
+        # 12 kHz cannot be represented at 16 kHz and must not fold back to 4 kHz
+        out = _samples(resample_pcm(_tone(12000, 48000, 0.5), in_rate=48000, in_channels=1))
+        self.assertLess(out[500:].std(), 50)
+
+    def test_downmix_only_when_rates_match(self):
+        left = np.full(100, 1000, dtype=np.int16)
+        right = np.full(100, 3000, dtype=np.int16)
+        pcm = np.stack([left, right], axis=1).reshape(-1).tobytes()
+        out = _samples(resample_pcm(pcm, in_rate=16000, in_channels=2))
+        self.assertEqual(len(out), 100)
+        self.assertTrue(np.all(out == 2000))
+
+    def test_identity_passthrough(self):
+        pcm = _tone(440, 16000, 0.1)
+        self.assertEqual(resample_pcm(pcm, in_rate=16000, in_channels=1), pcm)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from presstalk.session_buffer import SessionBuffer
+
+
+class TestSessionBuffer(unittest.TestCase):
+    def test_in_memory_until_threshold(self):
+        buf = SessionBuffer(spill_bytes=10)
+        buf.extend(b"abcd")
+        buf.extend(b"efgh")
+        self.assertFalse(buf.spilled)
+        with buf.view() as v:
+            self.assertEqual(bytes(v), b"abcdefgh")
+        buf.close()
+
+    def test_spills_to_file_and_reads_via_mmap(self):
+        buf = SessionBuffer(spill_bytes=6)
+        buf.extend(b"abcd")
+        buf.extend(b"efgh")
+        self.assertTrue(buf.spilled)
+        buf.extend(b"ij")
+        self.assertEqual(len(buf), 10)
+        with buf.view() as v:
+            self.assertIsInstance(v, memoryview)
+            self.assertEqual(bytes(v), b"abcdefghij")
+        buf.close()
+        self.assertEqual(len(buf), 0)
+
+    def test_view_is_stable_while_appending(self):
+        buf = SessionBuffer(spill_bytes=2)
+        buf.extend(b"1234")
+        with buf.view() as v:
+            buf.extend(b"5678")
+            self.assertEqual(bytes(v), b"1234")
+        with buf.view() as v:
+            self.assertEqual(bytes(v), b"12345678")
+        buf.close()
+
+    def test_cap_keeps_newest_whole_frames(self):
+        for spill in (0, 4):
+            buf = SessionBuffer(spill_bytes=spill, max_bytes=8, align=2)
+            for i in range(10):
+                buf.extend(bytes([i, i]))
+                self.assertLessEqual(len(buf), 8)
+            with buf.view() as v:
+                self.assertEqual(bytes(v), bytes([6, 6, 7, 7, 8, 8, 9, 9]))
+            self.assertEqual(buf.dropped, 12)
+            buf.close()
+
+    def test_cap_drop_is_frame_aligned(self):
+        buf = SessionBuffer(max_bytes=6, align=4)  # cap rounds down to 4
+        buf.extend(b"aaaabbbbcc")
+        with buf.view() as v:
+            self.assertEqual(bytes(v), b"cc")
+        buf.close()
+
+    def test_empty_view(self):
+        buf = SessionBuffer(spill_bytes=1)
+        with buf.view() as v:
+            self.assertEqual(len(v), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
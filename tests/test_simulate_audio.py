@@ -0,0 +1,174 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+import wave
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np  # type: ignore
+
+import presstalk.cli as cli  # type: ignore
+from presstalk.capture import PCMCapture
+from presstalk.clock import VirtualClock
+from presstalk.controller import Controller
+from presstalk.orchestrator import Orchestrator
+from presstalk.ring_buffer import RingBuffer
+from presstalk.simulate import (
+    ReplaySource,
+    parse_utterance,
+    replay,
+    utterance_marks,
+)
+from presstalk.sources import WavFileSource
+
+BPS = 32000
+
+
+class _RecordingEngine:
+    def __init__(self):
+        self.sessions = []
+
+    def start_session(self, language="ja", prompt=None):
+        self.sessions.append(bytearray())
+        return str(len(self.sessions) - 1)
+
+    def push_audio(self, sid, pcm):
+        self.sessions[int(sid)].extend(pcm)
+
+    def finalize(self, sid, timeout_s=10.0):
+        return f"bytes={len(self.sessions[int(sid)])}"
+
+    def close_session(self, sid):
+        pass
+
+
+def _counting_pcm(seconds):
+    # every sample distinct, so any misplaced byte shows up
+    n = int(16000 * seconds)
+    return (np.arange(n) % 30000).astype("<i2").tobytes()
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.wav = os.path.join(self.dir.name, "talk.wav")
+        self.pcm = _counting_pcm(3.0)
+        with wave.open(self.wav, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes(self.pcm)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _replay(self, utterances, speed=0.0, prebuffer_ms=250, clock=None):
+        eng = _RecordingEngine()
+        ring = RingBuffer(int(BPS * prebuffer_ms / 1000))
+        ctl = Controller(
+            eng, ring, prebuffer_ms=prebuffer_ms, min_capture_ms=0, bytes_per_second=BPS
+        )
+        src = ReplaySource(
+            WavFileSource(self.wav),
+            bytes_per_second=BPS,
+            speed=speed,
+            marks=utterance_marks(utterances, bytes_per_second=BPS),
+            clock=clock,
+        )
+        cap = PCMCapture(sample_rate=16000, channels=1, chunk_ms=20, source=src)
+        events = []
+        orch = Orchestrator(
+            controller=ctl,
+            ring=ring,
+            capture=cap,
+            paste_fn=lambda t: True,
+            audio_feedback=False,
+            status_fn=lambda **kw: events.append(kw["last_utterance"])
+            if "last_utterance" in kw
+            else None,
+        )
+        results = replay(orch, src, utterances, events=events, timeout_s=10.0)
+        return results, eng
+
+    def test_prebuffer_and_session_audio_are_exact(self):
+        results, eng = self._replay([(1.0, 2.0), (2.4, 2.9)])
+        self.assertEqual(len(results), 2)
+        # 250 ms before each press came from the ring, the rest live
+        self.assertEqual(bytes(eng.sessions[0]), self.pcm[int(0.75 * BPS) : 2 * BPS])
+        self.assertEqual(
+            bytes(eng.sessions[1]), self.pcm[int(2.15 * BPS) : int(2.9 * BPS)]
+        )
+        self.assertEqual(results[0]["press_s"], 1.0)
+        self.assertEqual(results[0]["release_s"], 2.0)
+        self.assertEqual(results[0]["text"], f"bytes={int(1.25 * BPS)}")
+        for key in ("decode_ms", "total_ms", "capture_stop_ms", "audio_s"):
+            self.assertIn(key, results[0])
+
+    def test_repeatable_and_release_past_end(self):
+        first, _ = self._replay([(0.5, float("inf"))])
+        second, _ = self._replay([(0.5, float("inf"))])
+        self.assertEqual(first[0]["release_s"], 3.0)
+        self.assertEqual(first[0]["text"], second[0]["text"])
+
+    def test_real_time_pacing(self):
+        t0 = time.perf_counter()
+        results, _ = self._replay([(0.0, 0.3)], speed=2.0)
+        elapsed = time.perf_counter() - t0
+        self.assertEqual(results[0]["text"], f"bytes={int(0.3 * BPS)}")
+        self.assertGreaterEqual(elapsed, 0.14)
+
+    def test_real_time_pacing_on_a_virtual_clock(self):
+        clock = VirtualClock()
+        t0 = time.perf_counter()
+        results, _ = self._replay([(1.0, 2.0)], speed=1.0, clock=clock)
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        self.assertEqual(results[0]["text"], f"bytes={int(1.25 * BPS)}")
+        # the source slept its way through the audio in virtual time
+        self.assertGreaterEqual(clock.now(), 2.0)
+
+    def test_parse_utterance(self):
+        self.assertEqual(parse_utterance("1.5-3"), (1.5, 3.0))
+        self.assertEqual(parse_utterance("2-"), (2.0, float("inf")))
+        for bad in ("3", "2-1", "-1-2"):
+            with self.assertRaises(ValueError):
+                parse_utterance(bad)
+        with self.assertRaises(ValueError):
+            utterance_marks([(0, 2), (1, 3)], bytes_per_second=BPS)
+
+    def test_cli_replays_audio(self):
+        args = cli.build_parser().parse_args(
+            [
+                "simulate",
+                "--audio",
+                self.wav,
+                "--utterance",
+                "0.5-1.5",
+                "--speed",
+                "0",
+                "--json",
+            ]
+        )
+        buf = io.StringIO()
+        with mock.patch.object(cli, "print_logo"), redirect_stdout(buf):
+            rc = cli._run_simulate(args)
+        self.assertEqual(rc, 0)
+        (row,) = [json.loads(line) for line in buf.getvalue().splitlines()]
+        self.assertEqual((row["press_s"], row["release_s"]), (0.5, 1.5))
+        self.assertTrue(row["text"].startswith("bytes="))
+
+    def test_cli_rejects_bad_script(self):
+        args = cli.build_parser().parse_args(
+            ["simulate", "--audio", self.wav, "--utterance", "2-1"]
+        )
+        with mock.patch.object(cli, "print_logo"), redirect_stdout(io.StringIO()):
+            self.assertEqual(cli._run_simulate(args), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
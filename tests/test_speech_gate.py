@@ -0,0 +1,142 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np  # type: ignore
+
+import presstalk.levels as levels
+from presstalk.bench import _speechlike_pcm
+from presstalk.controller import Controller
+from presstalk.levels import SpeechDetector
+from presstalk.ring_buffer import RingBuffer
+
+RATE = 16000
+
+
+def _noise(seconds, rms, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0.0, rms, int(RATE * seconds))
+    return np.clip(x, -32768, 32767).astype("<i2").tobytes()
+
+
+def _mix(a, b):
+    x = np.frombuffer(a, "<i2").astype(np.int32) + np.frombuffer(b, "<i2")
+    return np.clip(x, -32768, 32767).astype("<i2").tobytes()
+
+
+def _feed(det, pcm, chunk=640):
+    for i in range(0, len(pcm), chunk):
+        det.update(pcm[i : i + chunk])
+    return det.speech_ms()
+
+
+class TestSpeechDetector(unittest.TestCase):
+    def test_silence_has_no_speech(self):
+        self.assertEqual(_feed(SpeechDetector(), b"\x00\x00" * RATE), 0.0)
+
+    def test_steady_noise_has_no_speech(self):
+        # below voiced_db (-35 dBFS); louder steady sound counts as voiced
+        for rms in (30.0, 300.0):
+            ms = _feed(SpeechDetector(), _noise(1.0, rms))
+            self.assertLess(ms, 50.0, rms)
+
+    def test_speech_is_detected(self):
+        ms = _feed(SpeechDetector(), _speechlike_pcm(1.0))
+        self.assertGreater(ms, 300.0)
+
+    def test_sustained_voice_without_pauses_is_detected(self):
+        # 500 ms tone at about -22 dBFS with a 6 dB envelope: no quiet frames
+        t = np.arange(RATE // 2) / RATE
+        env = 0.75 + 0.25 * np.sin(2 * np.pi * 3.0 * t)
+        x = (4000.0 * env * np.sin(2 * np.pi * 220.0 * t)).astype("<i2")
+        self.assertEqual(_feed(SpeechDetector(), x.tobytes()), 500.0)
+
+    def test_speech_over_noise_is_detected(self):
+        pcm = _mix(_speechlike_pcm(1.0), _noise(1.0, 100.0))
+        self.assertGreater(_feed(SpeechDetector(), pcm), 300.0)
+
+    def test_odd_chunk_sizes_keep_frames(self):
+        det = SpeechDetector()
+        _feed(det, b"\x00\x00" * RATE, chunk=333)
+        self.assertEqual(det.frames(), 100)
+
+    def test_pure_python_fallback_agrees(self):
+        pcm = _mix(_speechlike_pcm(0.5), _noise(0.5, 100.0))
+        with mock.patch.object(levels, "np", None):
+            slow = _feed(SpeechDetector(), pcm)
+        self.assertEqual(slow, _feed(SpeechDetector(), pcm))
+
+
+class _Engine:
+    def __init__(self):
+        self.finalized = 0
+        self.closed = 0
+
+    def start_session(self, language="ja", prompt=None):
+        return "s1"
+
+    def push_audio(self, session_id, pcm_bytes):
+        pass
+
+    def finalize(self, session_id, timeout_s=10.0):
+        self.finalized += 1
+        return "text"
+
+    def close_session(self, session_id):
+        self.closed += 1
+
+
+class TestControllerGate(unittest.TestCase):
+    def _session(self, pcm, min_speech_ms=150):
+        eng = _Engine()
+        ctl = Controller(
+            eng,
+            RingBuffer(64),
+            prebuffer_ms=0,
+            min_capture_ms=0,
+            bytes_per_second=RATE * 2,
+            min_speech_ms=min_speech_ms,
+        )
+        ctl.press()
+        for i in range(0, len(pcm), 640):
+            ctl.live_push(pcm[i : i + 640])
+        return ctl, eng, ctl.release()
+
+    def test_noise_skips_decode(self):
+        ctl, eng, text = self._session(_noise(1.0, 500.0))
+        self.assertEqual(text, "")
+        self.assertEqual(eng.finalized, 0)
+        self.assertEqual(eng.closed, 1)
+        self.assertEqual(ctl.decodes_skipped, 1)
+        self.assertEqual(ctl.skip_reason, "no_speech")
+        self.assertFalse(ctl.is_recording())
+
+    def test_speech_is_decoded(self):
+        ctl, eng, text = self._session(_speechlike_pcm(1.0))
+        self.assertEqual(text, "text")
+        self.assertEqual(eng.finalized, 1)
+        self.assertEqual(ctl.decodes_skipped, 0)
+        self.assertIsNone(ctl.skip_reason)
+
+    def test_gate_off_always_decodes(self):
+        ctl, eng, _ = self._session(b"\x00\x00" * RATE, min_speech_ms=0)
+        self.assertEqual(eng.finalized, 1)
+        self.assertIsNone(ctl.speech_ms())
+
+    def test_skips_are_counted_across_sessions(self):
+        eng = _Engine()
+        ctl = Controller(eng, RingBuffer(64), prebuffer_ms=0, min_capture_ms=0)
+        ctl.min_speech_ms = 150
+        for _ in range(3):
+            ctl.press()
+            ctl.live_push(b"\x00\x00" * 1600)
+            ctl.release()
+        self.assertEqual(ctl.decodes_skipped, 3)
+        self.assertEqual(eng.finalized, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
+from presstalk.clock import VirtualClock
 from presstalk.ring_buffer import RingBuffer
 from presstalk.controller import Controller
 from presstalk.capture import PCMCapture
@@ -61,21 +62,31 @@ class TestStatusAndTiming(unittest.TestCase):
     def test_min_capture_enforced(self):
         ring = RingBuffer(8)
         eng = DummyAsrEngine()
+        clock = VirtualClock()
         # require at least 80ms capture
         ctl = Controller(
-            eng, ring, prebuffer_ms=0, min_capture_ms=80, bytes_per_second=32000
+            eng,
+            ring,
+            prebuffer_ms=0,
+            min_capture_ms=80,
+            bytes_per_second=32000,
+            clock=clock,
         )
         # no live audio
         src = DummySource([], delay_s=0.0)
-        cap = PCMCapture(sample_rate=16000, channels=1, chunk_ms=10, source=src)
+        cap = PCMCapture(
+            sample_rate=16000, channels=1, chunk_ms=10, source=src, clock=clock
+        )
         orch = Orchestrator(
             controller=ctl, ring=ring, capture=cap, paste_fn=lambda t: True
         )
         orch.press()
-        t0 = time.time()
+        clock.advance(0.03)
+        t0 = clock.now()
         _ = orch.release()
-        dt = (time.time() - t0) * 1000.0
-        self.assertGreaterEqual(dt, 70.0)  # allow small scheduling jitter
+        dt = (clock.now() - t0) * 1000.0
+        self.assertAlmostEqual(dt, 50.0, places=6)  # topped up to 80 ms held
+        self.assertAlmostEqual(clock.sleeps[-1], 0.05, places=6)
 
 
 if __name__ == "__main__":
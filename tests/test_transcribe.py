@@ -0,0 +1,221 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import wave
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np  # type: ignore
+
+import presstalk.cli as cli  # type: ignore
+from presstalk.batch import summarize, transcribe_files
+from presstalk.capture import PCMCapture
+from presstalk.sources import (
+    FfmpegSource,
+    RawPCMStdinSource,
+    WavFileSource,
+    open_source,
+)
+
+
+def _tone(rate, seconds, channels=1, amp=8000.0):
+    t = np.arange(int(rate * seconds)) / rate
+    x = (amp * np.sin(2 * np.pi * 440.0 * t)).astype("<i2")
+    return np.repeat(x, channels).tobytes()
+
+
+def _write_wav(path, rate, channels, pcm):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm)
+
+
+def _drain(source, chunk_ms=100):
+    out = []
+    cap = PCMCapture(sample_rate=16000, channels=1, chunk_ms=chunk_ms, source=source)
+    cap.start(out.append)
+    cap.wait(5.0)
+    cap.stop()
+    return b"".join(out), cap
+
+
+class _ShortReads(io.BytesIO):
+    """Pipe-like stream returning at most 333 bytes per read."""
+
+    def read(self, n=-1):
+        return super().read(min(n, 333) if n and n > 0 else 333)
+
+
+class _Engine:
+    """Records the audio of every session; text is the byte count."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bufs = {}
+        self._n = 0
+
+    def start_session(self, language="ja", prompt=None):
+        with self._lock:
+            self._n += 1
+            sid = f"s{self._n}"
+            self._bufs[sid] = bytearray()
+        return sid
+
+    def push_audio(self, sid, pcm):
+        self._bufs[sid].extend(pcm)
+
+    def finalize(self, sid, timeout_s=10.0):
+        return f"{len(self._bufs[sid])} bytes"
+
+    def close_session(self, sid):
+        self._bufs.pop(sid, None)
+
+
+class TestSources(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.dir.name, name)
+
+    def test_wav_at_pipeline_format_is_passed_through(self):
+        pcm = _tone(16000, 0.5)
+        _write_wav(self._path("a.wav"), 16000, 1, pcm)
+        out, cap = _drain(WavFileSource(self._path("a.wav")))
+        self.assertEqual(out, pcm)
+        self.assertIsNone(cap.error)
+
+    def test_wav_is_converted(self):
+        _write_wav(self._path("b.wav"), 48000, 2, _tone(48000, 1.0, channels=2))
+        out, _ = _drain(WavFileSource(self._path("b.wav")))
+        self.assertAlmostEqual(len(out) / 2, 16000, delta=200)
+
+    def test_non_16bit_wav_is_rejected(self):
+        with wave.open(self._path("c.wav"), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(1)
+            w.setframerate(8000)
+            w.writeframes(b"\x80" * 800)
+        _, cap = _drain(WavFileSource(self._path("c.wav")))
+        self.assertIn("16-bit", str(cap.error))
+        self.assertIsInstance(open_source(self._path("c.wav")), FfmpegSource)
+
+    def test_raw_stdin_keeps_whole_frames(self):
+        pcm = _tone(8000, 0.25, channels=2)
+        src = RawPCMStdinSource(_ShortReads(pcm), input_rate=8000, input_channels=2)
+        out, _ = _drain(src, chunk_ms=20)
+        self.assertAlmostEqual(len(out) / 2, 4000, delta=100)
+        src = RawPCMStdinSource(_ShortReads(_tone(16000, 0.1) + b"\x01"))
+        out, _ = _drain(src, chunk_ms=20)
+        self.assertEqual(len(out), 3200)
+
+    def test_ffmpeg_pipe(self):
+        pcm = _tone(16000, 0.2)
+        raw = self._path("pcm.raw")
+        with open(raw, "wb") as f:
+            f.write(pcm)
+        fake = self._path("ffmpeg")
+        with open(fake, "w") as f:
+            f.write(
+                f"#!{sys.executable}\n"
+                "import sys\n"
+                "src = sys.argv[sys.argv.index('-i') + 1]\n"
+                "if src.endswith('.bad'):\n"
+                "    sys.stderr.write('Invalid data found'); sys.exit(1)\n"
+                f"sys.stdout.buffer.write(open({raw!r}, 'rb').read())\n"
+            )
+        os.chmod(fake, 0o755)
+        out, cap = _drain(FfmpegSource("talk.mp3", ffmpeg=fake))
+        self.assertEqual(out, pcm)
+        self.assertIsNone(cap.error)
+        _, cap = _drain(FfmpegSource("x.bad", ffmpeg=fake))
+        self.assertIn("Invalid data", str(cap.error))
+        _, cap = _drain(FfmpegSource("talk.mp3", ffmpeg=self._path("missing")))
+        self.assertIn("ffmpeg not found", str(cap.error))
+
+    def test_open_source_dispatch(self):
+        _write_wav(self._path("d.wav"), 16000, 1, _tone(16000, 0.1))
+        self.assertIsInstance(open_source("-"), RawPCMStdinSource)
+        self.assertIsInstance(open_source(self._path("d.wav")), WavFileSource)
+        self.assertIsInstance(open_source("talk.m4a"), FfmpegSource)
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(6):
+            p = os.path.join(self.dir.name, f"{i}.wav")
+            _write_wav(p, 16000, 1, _tone(16000, 0.1 * (i + 1)))
+            self.paths.append(p)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_parallel_files_through_controller(self):
+        missing = os.path.join(self.dir.name, "missing.wav")
+        results = list(
+            transcribe_files(
+                self.paths + [missing],
+                engine=_Engine(),
+                make_source=open_source,
+                jobs=3,
+                chunk_ms=20,
+            )
+        )
+        by_file = {r["file"]: r for r in results}
+        self.assertEqual(set(by_file), set(self.paths + [missing]))
+        for i, p in enumerate(self.paths):
+            self.assertEqual(by_file[p]["text"], f"{3200 * (i + 1)} bytes")
+            self.assertAlmostEqual(by_file[p]["audio_s"], 0.1 * (i + 1), places=3)
+        self.assertIn("error", by_file[missing])
+        s = summarize(results, wall_s=1.0)
+        self.assertEqual((s["files"], s["errors"]), (7, 1))
+        self.assertAlmostEqual(s["audio_s"], 2.1, places=3)
+
+    def test_silent_file_is_skipped(self):
+        p = os.path.join(self.dir.name, "silence.wav")
+        _write_wav(p, 16000, 1, b"\x00\x00" * 16000)
+        (res,) = transcribe_files(
+            [p], engine=_Engine(), make_source=open_source, min_speech_ms=150
+        )
+        self.assertEqual(res["text"], "")
+        self.assertEqual(res["skipped"], "no_speech")
+
+    def test_cli_writes_jsonl(self):
+        # silence then a tone, so the configured speech gate lets it through
+        quiet = b"\x00\x00" * 8000
+        for p in self.paths[:2]:
+            _write_wav(p, 16000, 1, quiet + _tone(16000, 0.5))
+        out = os.path.join(self.dir.name, "out.jsonl")
+        args = cli.build_parser().parse_args(
+            ["transcribe", *self.paths[:2], "-j", "2", "-o", out]
+        )
+        with mock.patch.object(cli, "_build_engine", return_value=_Engine()):
+            with mock.patch.object(
+                cli, "_thread_plan", return_value=SimpleNamespace(num_workers=2)
+            ):
+                self.assertEqual(cli._run_transcribe(args), 0)
+        with open(out, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(sorted(r["file"] for r in rows), sorted(self.paths[:2]))
+        self.assertEqual([r["text"] for r in rows], ["32000 bytes"] * 2)
+
+    def test_cli_rejects_stdin_twice(self):
+        args = cli.build_parser().parse_args(["transcribe", "-", "-"])
+        self.assertEqual(cli._run_transcribe(args), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
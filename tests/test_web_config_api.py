@@ -9,7 +9,10 @@ import tempfile
 import threading
 import time
 import unittest
+import gzip
+import socket
 from http.client import HTTPConnection
+from unittest import mock
 
 from presstalk.web_config import server as web_server  # type: ignore
 from pathlib import Path
@@ -25,7 +28,7 @@ def _start_server(cfg_path: str):
             *args, static_dir=static_dir, cfg_path=cfg_path, **kwargs
         )
 
-    httpd = web_server.HTTPServer(("127.0.0.1", 0), _handler)  # type: ignore[attr-defined]
+    httpd = web_server.ThreadingHTTPServer(("127.0.0.1", 0), _handler)  # type: ignore[attr-defined]
     port = httpd.server_address[1]
     t = threading.Thread(target=httpd.serve_forever, daemon=True)
     t.start()
@@ -59,6 +62,7 @@ class TestWebConfigAPI(unittest.TestCase):
             self.assertEqual(data["model"], "small")
             self.assertEqual(data["hotkey"], "ctrl+space")
             self.assertTrue(bool(data["audio_feedback"]))
+            self.assertEqual(data["decode_profile"], "balanced")
         finally:
             httpd.shutdown()
             httpd.server_close()
@@ -73,6 +77,7 @@ class TestWebConfigAPI(unittest.TestCase):
             payload = {
                 "language": "en",
                 "model": "base",
+                "decode_profile": "accurate",
                 "hotkey": "SHIFT+SPACE",
                 "audio_feedback": False,
             }
@@ -87,6 +92,7 @@ class TestWebConfigAPI(unittest.TestCase):
             text = Path(path).read_text(encoding="utf-8")
             self.assertIn("language: en", text)
             self.assertIn("model: base", text)
+            self.assertIn("decode_profile: accurate", text)
             self.assertIn("hotkey: shift+space  # cmt", text)
             self.assertIn("audio_feedback: false", text)
         finally:
@@ -168,5 +174,69 @@ class TestWebConfigAPI(unittest.TestCase):
             os.remove(path)
 
 
+class TestWebCaching(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".yaml")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("language: ja\nmodel: small\nhotkey: ctrl+space\n")
+        self.httpd, self.port, _t = _start_server(self.path)
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        os.remove(self.path)
+
+    def _get(self, path, headers=None):
+        c = HTTPConnection("127.0.0.1", self.port, timeout=2)
+        c.request("GET", path, headers=headers or {})
+        r = c.getresponse()
+        return r, r.read()
+
+    def test_config_cached_until_file_changes(self):
+        from presstalk.config import Config, clear_config_cache
+
+        clear_config_cache()
+        with mock.patch.object(Config, "_load_yaml", wraps=Config._load_yaml) as m:
+            self._get("/api/config")
+            r, body = self._get("/api/config")
+            self.assertEqual(m.call_count, 1)
+            st = os.stat(self.path)
+            Path(self.path).write_text("language: en\nmodel: small\nhotkey: ctrl+space\n")
+            os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            r, body = self._get("/api/config")
+            self.assertEqual(m.call_count, 2)
+        self.assertEqual(json.loads(body)["language"], "en")
+
+    def test_etag_revalidation(self):
+        r, _ = self._get("/api/config")
+        tag = r.getheader("ETag")
+        self.assertTrue(tag)
+        r, body = self._get("/api/config", {"If-None-Match": tag})
+        self.assertEqual(r.status, 304)
+        self.assertEqual(body, b"")
+
+    def test_static_gzip_and_304(self):
+        r, body = self._get("/script.js", {"Accept-Encoding": "gzip"})
+        self.assertEqual(r.status, 200)
+        self.assertEqual(r.getheader("Content-Encoding"), "gzip")
+        self.assertIn(b"fetchConfig", gzip.decompress(body))
+        r, plain = self._get("/script.js")
+        self.assertIsNone(r.getheader("Content-Encoding"))
+        self.assertEqual(plain, gzip.decompress(body))
+        r, _ = self._get("/", {"If-None-Match": self._get("/")[0].getheader("ETag")})
+        self.assertEqual(r.status, 304)
+        r, _ = self._get("/../server.py")
+        self.assertEqual(r.status, 404)
+
+    def test_slow_client_does_not_block_others(self):
+        s = socket.create_connection(("127.0.0.1", self.port))
+        try:
+            s.sendall(b"GET /api/config HTTP/1.1\r\n")  # never finishes headers
+            r, _ = self._get("/api/status")
+            self.assertEqual(r.status, 200)
+        finally:
+            s.close()
+
+
 if __name__ == "__main__":
     unittest.main()